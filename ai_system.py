@@ -3,10 +3,12 @@
 
 import random
 from components import *
+from event_queues import MoveEvent, AttackEvent
 from core_systems import System
 
 class AISystem(System):
     """Controls the actions of non-player entities."""
+    run_states = ('MONSTER_TURN',)
     
     def update(self, *args, **kwargs):
         game_state = kwargs.get('game_state')
@@ -45,7 +47,7 @@ class AISystem(System):
                 # Check for adjacency
                 if distance == 1:
                     # Attack the player
-                    self.world.add_component(entity_id, WantsToAttackComponent(player_id))
+                    self.world.send_intent(AttackEvent, entity_id, player_id)
                 else:
                     # Move towards the player (simple pathfinding)
                     dx, dy = 0, 0
@@ -81,7 +83,7 @@ class AISystem(System):
                     target_entity = self.world.get_entity_at_position(target_x, target_y)
                     
                     if not target_entity or not self.world.get_component(target_entity, BlocksMovementComponent):
-                        self.world.add_component(entity_id, WantsToMoveComponent(dx, dy))
+                        self.world.send_intent(MoveEvent, entity_id, dx, dy)
             else:
                 # Player not in sight - do nothing or wander randomly
                 pass
\ No newline at end of file
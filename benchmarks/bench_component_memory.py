@@ -0,0 +1,131 @@
+# bench_component_memory.py
+# Measures bytes per entity for the archetypes in archetypes.json and the
+# creatures in creatures.json, comparing slotted components against the old
+# plain __dict__ layout (one attribute per StateComponent flag).
+#
+# Usage: python benchmarks/bench_component_memory.py [--copies N]
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import os
+import sys
+import tracemalloc
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+os.chdir(ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import components
+from main import Game
+
+_legacy_classes = {}
+
+def legacy_fields(component):
+    """Returns the attributes the pre-slots version of a component stored in its __dict__."""
+    fields = {}
+    for cls in type(component).__mro__:
+        for name in getattr(cls, "__slots__", ()):
+            if name == "flags" and isinstance(component, components.StateComponent):
+                for flag in components.StateComponent.FLAGS:
+                    fields[flag] = getattr(component, flag)
+            else:
+                fields[name] = getattr(component, name)
+    return fields
+
+def to_legacy(component):
+    """Copies a component into an equivalent plain (non-slotted) object."""
+    name = type(component).__name__
+    cls = _legacy_classes.get(name)
+    if cls is None:
+        cls = _legacy_classes[name] = type(name, (), {})
+    legacy = cls()
+    for attr, value in legacy_fields(component).items():
+        setattr(legacy, attr, value)
+    return legacy
+
+def build_components(game, component_defs):
+    """Instantiates one entity's components the same way Game.create_entities_from_definitions does."""
+    built = []
+    for comp_name, comp_args in component_defs.items():
+        comp_class = getattr(components, comp_name, None)
+        if comp_class is None:
+            continue
+        comp_args = copy.deepcopy(comp_args)
+        if comp_name == "RenderableComponent" and isinstance(comp_args.get("color"), str):
+            comp_args["color"] = game.COLORS.get(comp_args["color"].upper(), game.COLORS["WHITE"])
+        try:
+            built.append(comp_class(**comp_args))
+        except TypeError:
+            continue  # Abstract archetypes can leave required arguments unset
+    return built
+
+def bytes_per_entity(game, component_defs, copies, legacy):
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    entities = []
+    for _ in range(copies):
+        built = build_components(game, component_defs)
+        if legacy:
+            built = [to_legacy(component) for component in built]
+        entities.append(built)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    # Don't count the per-entity list that only exists to keep the components alive
+    used -= sum(sys.getsizeof(built) for built in entities)
+    return used / copies
+
+def resolve_creature(game, entity_def):
+    """Merges a creatures.json definition with its inherited archetypes."""
+    final_components = {}
+    inherits = entity_def.get("inherits", "Abstract")
+    for archetype_name in inherits if isinstance(inherits, list) else [inherits]:
+        for comp_name, comp_args in game.get_archetype_data(archetype_name).items():
+            final_components.setdefault(comp_name, {}).update(comp_args)
+    for comp_name, comp_args in entity_def.get("components", {}).items():
+        final_components.setdefault(comp_name, {}).update(comp_args)
+    return final_components
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per entity before/after slotted components.")
+    parser.add_argument("--copies", type=int, default=2000, help="entities built per archetype")
+    args = parser.parse_args()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        game = Game()
+    game.world.archetypes = game.load_json_file('archetypes.json') or {}
+    creatures = (game.load_json_file('creatures.json') or {"entities": []})["entities"]
+
+    definitions = [(name, game.get_archetype_data(name)) for name in game.world.archetypes]
+    definitions += [(entity_def["name"], resolve_creature(game, entity_def)) for entity_def in creatures]
+
+    print(f"{'entity':<18}{'components':>11}{'before B':>11}{'after B':>10}{'saved':>8}")
+    total_before = total_after = 0
+    for name, component_defs in definitions:
+        count = len(build_components(game, component_defs))
+        if count == 0:
+            continue
+        before = bytes_per_entity(game, component_defs, args.copies, legacy=True)
+        after = bytes_per_entity(game, component_defs, args.copies, legacy=False)
+        total_before += before
+        total_after += after
+        print(f"{name:<18}{count:>11}{before:>11.0f}{after:>10.0f}{1 - after / before:>8.0%}")
+    print(f"{'total':<18}{'':>11}{total_before:>11.0f}{total_after:>10.0f}{1 - total_after / total_before:>8.0%}")
+
+    # One active status effect: the old dict entry vs a StatusEffect record
+    effect_args = dict(id="poison_sickness", name="Poisoned", type="temporary", effects_data=[], turns_remaining=5)
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    dicts = [dict(effect_args) for _ in range(args.copies)]
+    dict_bytes = (tracemalloc.get_traced_memory()[0] - base) / args.copies
+    base = tracemalloc.get_traced_memory()[0]
+    records = [components.StatusEffect(**effect_args) for _ in range(args.copies)]
+    record_bytes = (tracemalloc.get_traced_memory()[0] - base) / args.copies
+    tracemalloc.stop()
+    print(f"status effect entry: dict {dict_bytes:.0f} B, StatusEffect {record_bytes:.0f} B")
+
+if __name__ == '__main__':
+    main()
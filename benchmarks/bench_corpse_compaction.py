@@ -0,0 +1,102 @@
+# bench_corpse_compaction.py
+# Simulates a long session where waves of monsters close in on the player
+# and are killed, timing one monster turn (AI, an area status effect from
+# the player and the resulting saving throws) after every block of waves.
+# Without compaction every corpse keeps its combat, faction and AI data and
+# is visited again each turn; with CorpseSystem the turn cost should stay
+# flat no matter how many monsters have died.
+#
+# Usage: python benchmarks/bench_corpse_compaction.py [--waves N] [--wave-size M]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import components
+from main import World
+from ai_system import AISystem
+from combat_systems import CombatSystem, SavingThrowSystem
+from corpse_system import CorpseSystem
+from bench_entity_recycling import spawn_monster
+
+MAP_SIZE = 120
+# The player's aura: a range 10 AOE with a saving throw, like a fear or stench ability
+AURA = {"name": "Aura", "range": 10, "status_effect": {"id": "nausea_stench", "name": "Nauseated"}}
+
+class BenchGame:
+    """The bits of Game that the timed systems read."""
+    def __init__(self):
+        self.game_state = 'MONSTER_TURN'
+
+    def add_message(self, text):
+        pass
+
+def create_player(world):
+    player = world.create_entity()
+    world.add_component(player.id, components.PositionComponent(MAP_SIZE // 2, MAP_SIZE // 2))
+    world.add_component(player.id, components.PlayerControllableComponent())
+    world.add_component(player.id, components.CombatComponent(hp=10 ** 9, ac=0, thac0=10))
+    world.add_component(player.id, components.FactionComponent("player"))
+    return player.id
+
+def monster_turn(world, ai, combat, saves, game, player_id):
+    """One monster turn; returns its cost in seconds."""
+    start = time.perf_counter()
+    ai.update(game_state=game)
+    combat.apply_aoe_status_effect(player_id, AURA, game)
+    world.flush_commands()
+    saves.update(game_state=game)
+    world.flush_commands()
+    elapsed = time.perf_counter() - start
+    # Drop the intents so the next turn starts from the same state
+    for intent_type in (components.WantsToMoveComponent, components.WantsToAttackComponent,
+                        components.WantsToApplyStatusComponent):
+        for entity_id in list(world.get_entities_with_components(intent_type)):
+            world.remove_component(entity_id, intent_type)
+    return elapsed
+
+def run(compact, waves, wave_size, report_every, seed):
+    random.seed(seed)
+    world = World()
+    game = BenchGame()
+    player_id = create_player(world)
+    ai, combat, saves = AISystem(world), CombatSystem(world), SavingThrowSystem(world)
+    corpses = CorpseSystem(world, enabled=compact)
+
+    rows = []
+    turn_times = []
+    for wave in range(1, waves + 1):
+        spawned = [spawn_monster(world, random.randrange(MAP_SIZE), random.randrange(MAP_SIZE))
+                   for _ in range(wave_size)]
+        turn_times.append(monster_turn(world, ai, combat, saves, game, player_id))
+        for entity_id in spawned:
+            combat.handle_death(entity_id, None, game)
+        corpses.update(game_state=game)
+        if wave % report_every == 0:
+            turn_times.sort()
+            median = turn_times[len(turn_times) // 2]
+            rows.append((wave, wave * wave_size, len(world.get_entities_with_components(components.CombatComponent)), median))
+            turn_times = []
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Monster turn cost as corpses pile up.")
+    parser.add_argument("--waves", type=int, default=200)
+    parser.add_argument("--wave-size", type=int, default=50)
+    parser.add_argument("--report-every", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    for compact in (False, True):
+        rows = run(compact, args.waves, args.wave_size, args.report_every, args.seed)
+        print("compacted corpses:" if compact else "intact corpses:")
+        print(f"  {'wave':>6}{'killed':>9}{'combatants':>12}{'turn ms (p50)':>15}")
+        for wave, killed, combatants, median in rows:
+            print(f"  {wave:>6}{killed:>9}{combatants:>12}{median * 1000:>15.3f}")
+
+if __name__ == '__main__':
+    main()
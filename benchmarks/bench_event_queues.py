@@ -0,0 +1,80 @@
+# bench_event_queues.py
+# Times a full monster turn (AI, movement, combat, saving throws, status
+# effects) with 1,000 monsters around the player, once with intents passed
+# through the typed event queues and once through Wants* components. Each
+# turn the player also pulses an area effect that makes every monster in
+# range roll a saving throw.
+#
+# Usage: python benchmarks/bench_event_queues.py [--monsters N] [--turns T]
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+import components
+from main import World
+from ai_system import AISystem
+from core_systems import MovementSystem
+from combat_systems import CombatSystem, SavingThrowSystem
+from status_systems import StatusEffectSystem
+from bench_entity_recycling import spawn_monster
+from bench_corpse_compaction import BenchGame, create_player, MAP_SIZE
+
+AURA = {"name": "Aura", "range": 10,
+        "status_effect": {"id": "nausea_stench", "name": "Nauseated", "duration": "1"}}
+
+def build(use_event_queues, n_monsters, seed):
+    random.seed(seed)
+    world = World(use_event_queues=use_event_queues)
+    with open(os.path.join(ROOT, 'status_effects.json')) as f:
+        world.status_effects = json.load(f)
+    player_id = create_player(world)
+    centre = MAP_SIZE // 2
+    for _ in range(n_monsters):
+        spawn_monster(world, centre + random.randint(-10, 10), centre + random.randint(-10, 10))
+    for system_type in (AISystem, MovementSystem, CombatSystem, SavingThrowSystem, StatusEffectSystem):
+        world.add_system(system_type(world))
+    return world, player_id
+
+def run(use_event_queues, n_monsters, turns, seed):
+    world, player_id = build(use_event_queues, n_monsters, seed)
+    game = BenchGame()
+    combat = world.get_system(CombatSystem)
+    times = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(turns):
+            start = time.perf_counter()
+            combat.apply_aoe_status_effect(player_id, AURA, game)
+            world.update(events=[], game_state=game)
+            times.append(time.perf_counter() - start)
+    return world, sorted(times)
+
+def main():
+    parser = argparse.ArgumentParser(description="Monster turn cost: event queues vs Wants* components.")
+    parser.add_argument("--monsters", type=int, default=1000)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    print(f"{args.monsters} monsters, {args.turns} turns")
+    print(f"{'path':<12}{'p50 ms':>9}{'p95 ms':>9}{'intents allocated':>19}")
+    for use_event_queues in (False, True):
+        world, times = run(use_event_queues, args.monsters, args.turns, args.seed)
+        if use_event_queues:
+            allocated = sum(stats["allocated"] for stats in world.events.stats())
+        else:
+            allocated = world.intent_pool.allocated
+        p50 = times[len(times) // 2] * 1000
+        p95 = times[min(len(times) - 1, int(len(times) * 0.95))] * 1000
+        print(f"{'events' if use_event_queues else 'components':<12}{p50:>9.2f}{p95:>9.2f}{allocated:>19}")
+
+if __name__ == '__main__':
+    main()
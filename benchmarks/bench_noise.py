@@ -0,0 +1,110 @@
+# bench_noise.py
+# Times WorldGenerator._generate_noise_map for the three maps generate_world
+# builds (height, humidity, temperature) at 1k, 4k and 8k square sizes,
+# against the old generator that called noise.pnoise2 once per cell. The
+# per-cell loop is only run in full at --check-size; at larger sizes its
+# time is extrapolated from --sample-rows rows.
+#
+# The check compares the two at --check-size: the fraction of cells that
+# match exactly, the mean, spread and percentiles of each map, the
+# Kolmogorov-Smirnov distance between their value distributions, and the
+# share of cells on each side of the thresholds _create_biomes uses.
+# The height map (base = seed) matches cell for cell except where the
+# noise package reads past the end of its 512-entry permutation table;
+# humidity and temperature use base seed + 1000 and seed + 2000, where
+# every noise.pnoise2 lookup is past the end, so only their value ranges
+# are comparable.
+#
+# Usage: python benchmarks/bench_noise.py [--sizes 1000 4000 8000] [--check-size 1000] [--seed 42]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+import noise
+import numpy as np
+from world_generator import WorldGenerator
+
+# (name, scale, octaves, persistence, lacunarity, offset), as generate_world calls them
+MAPS = (
+    ("height", 10.0, 8, 0.5, 2.0, 0),
+    ("humidity", 5.0, 4, 0.6, 2.0, 1000),
+    ("temperature", 7.0, 6, 0.4, 2.0, 2000),
+)
+# Values _create_biomes compares each map against (height before shaping)
+THRESHOLDS = {"height": (-0.5, 0.0, 0.05, 0.4, 0.7), "humidity": (-0.3, 0.3), "temperature": (0.3,)}
+
+def reference_noise_map(generator, scale, octaves, persistence, lacunarity, offset=0, rows=None):
+    """The old _generate_noise_map: one noise.pnoise2 call per cell, for the first rows rows."""
+    rows = generator.width if rows is None else rows
+    world = np.zeros((rows, generator.height))
+    for i in range(rows):
+        for j in range(generator.height):
+            nx = i / generator.width * scale
+            ny = j / generator.height * scale
+            world[i][j] = noise.pnoise2(nx, ny,
+                                         octaves=octaves,
+                                         persistence=persistence,
+                                         lacunarity=lacunarity,
+                                         repeatx=generator.width,
+                                         repeaty=generator.height,
+                                         base=generator.seed + offset)
+    return world
+
+def ks_distance(a, b):
+    """Largest gap between the empirical CDFs of two samples."""
+    a, b = np.sort(a.ravel()), np.sort(b.ravel())
+    values = np.concatenate([a, b])
+    return np.max(np.abs(np.searchsorted(a, values, side='right') / len(a) -
+                         np.searchsorted(b, values, side='right') / len(b)))
+
+def time_sizes(sizes, seed, sample_rows):
+    print(f"{'size':>6}{'map':>13}{'pnoise2 loop s':>16}{'vectorized s':>14}{'speedup':>9}")
+    for size in sizes:
+        generator = WorldGenerator(size, size, seed=seed)
+        for name, scale, octaves, persistence, lacunarity, offset in MAPS:
+            start = time.perf_counter()
+            generator._generate_noise_map(scale, octaves, persistence, lacunarity, offset)
+            vectorized = time.perf_counter() - start
+
+            rows = min(sample_rows, size)
+            start = time.perf_counter()
+            reference_noise_map(generator, scale, octaves, persistence, lacunarity, offset, rows=rows)
+            loop = (time.perf_counter() - start) * size / rows
+            note = "" if rows == size else "*"
+            print(f"{size:>6}{name:>13}{loop:>15.2f}{note:1}{vectorized:>14.3f}{loop / vectorized:>8.0f}x")
+    print("* extrapolated from a sample of rows")
+
+def check_distribution(size, seed):
+    generator = WorldGenerator(size, size, seed=seed)
+    print(f"{size}x{size}, seed {seed}: pnoise2 loop (ref) vs vectorized (new)")
+    for name, scale, octaves, persistence, lacunarity, offset in MAPS:
+        ref = reference_noise_map(generator, scale, octaves, persistence, lacunarity, offset)
+        new = generator._generate_noise_map(scale, octaves, persistence, lacunarity, offset).astype(np.float64)
+        exact = np.mean(np.abs(ref - new) < 1e-6)
+        print(f"  {name} (base {generator.seed + offset}): {exact:.1%} of cells match, "
+              f"max diff {np.max(np.abs(ref - new)):.3f}, KS distance {ks_distance(ref, new):.3f}")
+        for label, values in (("ref", ref), ("new", new)):
+            p1, p50, p99 = np.percentile(values, (1, 50, 99))
+            shares = " ".join(f"<{t:g}:{np.mean(values < t):.3f}" for t in THRESHOLDS[name])
+            print(f"    {label}  mean {values.mean():+.3f}  std {values.std():.3f}  "
+                  f"p1 {p1:+.3f}  p50 {p50:+.3f}  p99 {p99:+.3f}  {shares}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized fBm noise vs the per-cell noise.pnoise2 loop.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 8000])
+    parser.add_argument("--check-size", type=int, default=1000)
+    parser.add_argument("--sample-rows", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    time_sizes(args.sizes, args.seed, args.sample_rows)
+    print()
+    check_distribution(args.check_size, args.seed)
+
+if __name__ == '__main__':
+    main()
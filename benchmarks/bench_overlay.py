@@ -0,0 +1,88 @@
+# bench_overlay.py
+# Times the targeting range highlight at ranges 1, 10 and 40: the old path
+# that draws one pygame.draw.rect per tile in range every frame, against
+# the OverlayLayer, both when it has to recompose its NumPy arrays (the
+# player moved or the range changed) and when it only blits the cached
+# surfaces. A second table adds 500 status tints and fog to the overlay.
+#
+# Usage: python benchmarks/bench_overlay.py [--frames N] [--ranges 1 10 40]
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from overlay import OverlayLayer
+
+WIDTH, HEIGHT, TILE_SIZE = 1280, 720, 24
+EDGE, FILL = (40, 40, 0), (20, 20, 0)
+
+def draw_rects(screen, player_x, player_y, targeting_range):
+    """The per-tile range indicator RenderSystem.draw_targeting_cursor used to draw."""
+    for x in range(max(0, player_x - targeting_range), player_x + targeting_range + 1):
+        for y in range(max(0, player_y - targeting_range), player_y + targeting_range + 1):
+            distance = max(abs(x - player_x), abs(y - player_y))
+            if distance <= targeting_range:
+                bg_rect = pygame.Rect(x * TILE_SIZE, y * TILE_SIZE, TILE_SIZE, TILE_SIZE)
+                pygame.draw.rect(screen, EDGE if distance == targeting_range else FILL, bg_rect)
+
+def time_frames(frames, draw):
+    start = time.perf_counter()
+    for frame in range(frames):
+        draw(frame)
+    return (time.perf_counter() - start) / frames * 1000
+
+def main():
+    parser = argparse.ArgumentParser(description="Targeting range highlight: per-tile rects vs NumPy overlay.")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--ranges", type=int, nargs="+", default=[1, 10, 40])
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.init()
+    screen = pygame.Surface((WIDTH, HEIGHT))
+    view_width, view_height = -(-WIDTH // TILE_SIZE), -(-HEIGHT // TILE_SIZE)
+    player_x, player_y = view_width // 2, view_height // 2
+    overlay = OverlayLayer(TILE_SIZE)
+    blit = screen.blit
+
+    random.seed(args.seed)
+    tints = tuple((random.randrange(view_width), random.randrange(view_height), (32, 0, 32)) for _ in range(500))
+    fog = (player_x, player_y, 8, 8, 0.25)
+
+    print("range only")
+    print(f"{'range':>6}{'rects ms':>10}{'compose ms':>12}{'cached ms':>11}{'speedup':>9}")
+    for targeting_range in args.ranges:
+        ranges = ((player_x, player_y, targeting_range, EDGE, FILL),)
+        rects_ms = time_frames(args.frames, lambda frame: draw_rects(screen, player_x, player_y, targeting_range))
+        compose_ms, cached_ms = time_overlay(overlay, blit, args.frames, targeting_range, view_width, view_height,
+                                             ranges=ranges)
+        print(f"{targeting_range:>6}{rects_ms:>10.3f}{compose_ms:>12.3f}{cached_ms:>11.3f}{rects_ms / cached_ms:>8.1f}x")
+
+    print()
+    print("range + 500 status tints + fog")
+    print(f"{'range':>6}{'compose ms':>12}{'cached ms':>11}")
+    for targeting_range in args.ranges:
+        ranges = ((player_x, player_y, targeting_range, EDGE, FILL),)
+        compose_ms, cached_ms = time_overlay(overlay, blit, args.frames, targeting_range, view_width, view_height,
+                                             ranges=ranges, tints=tints, fog=fog)
+        print(f"{targeting_range:>6}{compose_ms:>12.3f}{cached_ms:>11.3f}")
+
+def time_overlay(overlay, blit, frames, targeting_range, view_width, view_height, **layers):
+    """Returns ms per frame for an overlay recomposed every frame and for one reused from cache."""
+    def compose(frame):
+        overlay.compose((targeting_range, frame), 0, 0, view_width, view_height, **layers)
+        overlay.draw(blit)
+    def cached(frame):
+        overlay.compose((targeting_range,), 0, 0, view_width, view_height, **layers)
+        overlay.draw(blit)
+    return time_frames(frames, compose), time_frames(frames, cached)
+
+if __name__ == '__main__':
+    main()
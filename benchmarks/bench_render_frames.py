@@ -0,0 +1,194 @@
+# bench_render_frames.py
+# Renders scenario files with a headless Game and reports p50/p95/p99 times
+# for RenderSystem.update and each of its draw_* methods, so render
+# regressions can be tracked in CI without a screen.
+#
+# A scenario is a JSON file in benchmarks/scenarios describing what is on
+# screen: "monsters" and "items" to scatter around the player, "player"
+# [x, y], "terrain" (draw world.dat), "status_fraction" of monsters tinted
+# by a status effect, "moves_per_frame" monsters stepping each frame,
+# "messages", "inventory_items", "show_inventory", "show_abilities", "look"
+# and "targeting" {"ability", "range"}. Every frame is a full redraw unless
+# --dirty is given.
+#
+# Usage: python benchmarks/bench_render_frames.py [scenario.json ...] [--frames N] [--dirty] [--json OUT]
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+import components
+from main import Game
+from render_system import RenderSystem
+
+SCENARIO_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "scenarios")
+MONSTER_COLORS = [(0, 255, 0), (255, 0, 0), (200, 150, 50)]
+STATUS_FLAGS = ("paralyzed", "confused", "sickened")
+# RenderSystem methods that are timed; draw_rect and draw_line are drawing
+# primitives called many times per frame, not parts of the frame
+TIMED_METHODS = ("update", "build_map_layer")
+UNTIMED_METHODS = ("draw_rect", "draw_line")
+
+def percentile(sorted_times, p):
+    """Nearest-rank percentile of an already sorted list."""
+    index = min(len(sorted_times) - 1, max(0, int(round(p / 100 * len(sorted_times) + 0.5)) - 1))
+    return sorted_times[index]
+
+class Timings:
+    """Collects per-call durations under a name."""
+    def __init__(self):
+        self.samples = {}
+
+    def wrap(self, name, fn):
+        samples = self.samples.setdefault(name, [])
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = fn(*args, **kwargs)
+            samples.append(time.perf_counter() - start)
+            return result
+        return timed
+
+    def rows(self):
+        """Returns (name, calls, p50, p95, p99) in ms, RenderSystem.update first."""
+        rows = []
+        for name, samples in sorted(self.samples.items(), key=lambda item: (item[0] != "update", item[0])):
+            if not samples:
+                continue
+            ordered = sorted(samples)
+            rows.append((name, len(ordered)) + tuple(percentile(ordered, p) * 1000 for p in (50, 95, 99)))
+        return rows
+
+def instrument(render_system, timings):
+    """Replaces update, build_map_layer and the draw_* methods of a RenderSystem with timed wrappers."""
+    for name in dir(RenderSystem):
+        if name in TIMED_METHODS or (name.startswith("draw_") and name not in UNTIMED_METHODS):
+            setattr(render_system, name, timings.wrap(name, getattr(render_system, name)))
+
+def spawn_monster(world, x, y, color, status=None):
+    monster = world.create_entity()
+    world.add_component(monster.id, components.PositionComponent(x, y))
+    world.add_component(monster.id, components.RenderableComponent('g', color))
+    world.add_component(monster.id, components.DescriptionComponent("A goblin."))
+    world.add_component(monster.id, components.CombatComponent(hp=5, ac=6, thac0=19))
+    world.add_component(monster.id, components.FactionComponent("monsters"))
+    state = components.StateComponent()
+    if status:
+        setattr(state, status, True)
+    world.add_component(monster.id, state)
+    return monster.id
+
+def spawn_item(world, x, y):
+    item = world.create_entity()
+    if x is not None:
+        world.add_component(item.id, components.PositionComponent(x, y))
+    world.add_component(item.id, components.RenderableComponent("'", (255, 255, 0)))
+    world.add_component(item.id, components.DescriptionComponent("A steel key with a long notched bit."))
+    world.add_component(item.id, components.ItemComponent())
+    world.add_component(item.id, components.MaterialComponent("steel"))
+    return item.id
+
+def build(scenario, dirty, seed):
+    """Creates a headless Game laid out as the scenario describes."""
+    random.seed(seed)
+    game = Game(headless=True)
+    game.DIRTY_RECTS = dirty
+    if not scenario.get("terrain", False):
+        game.TERRAIN_FILE = None
+    game.setup()
+    world = game.world
+    render_system = world.get_system(RenderSystem)
+    player_id = world.get_entities_with_components(components.PlayerControllableComponent)[0]
+    if "player" in scenario:
+        world.teleport_entity(player_id, *scenario["player"])
+    render_system.update(game_state=game)  # Place the camera
+
+    # Scatter monsters and items over the visible part of the map
+    view_width, view_height = render_system.view_size()
+    def random_cell():
+        return (render_system.camera_x + random.randrange(view_width),
+                render_system.camera_y + random.randrange(view_height))
+    monsters = []
+    for _ in range(scenario.get("monsters", 0)):
+        status = random.choice(STATUS_FLAGS) if random.random() < scenario.get("status_fraction", 0) else None
+        monsters.append(spawn_monster(world, *random_cell(), random.choice(MONSTER_COLORS), status))
+    for _ in range(scenario.get("items", 0)):
+        spawn_item(world, *random_cell())
+
+    inventory = world.get_component(player_id, components.InventoryComponent)
+    for _ in range(scenario.get("inventory_items", 0)):
+        inventory.items.append(spawn_item(world, None, None))
+    for i in range(scenario.get("messages", 0)):
+        game.add_message(f"The goblin attacks you and rolls a {i % 20 + 1}, but misses!")
+
+    game.show_inventory = scenario.get("show_inventory", False)
+    game.show_abilities = scenario.get("show_abilities", False)
+    if scenario.get("look"):
+        game.toggle_look_mode()
+        if monsters:
+            pos = world.get_component(monsters[0], components.PositionComponent)
+            world.teleport_entity(game.cursor_id, pos.x, pos.y)
+    targeting = scenario.get("targeting")
+    if targeting:
+        ability_id = targeting.get("ability", "player_charm")
+        game.enter_targeting_mode(ability_id, world.abilities.get(ability_id, {}), targeting.get("range", 3))
+    return game, render_system, monsters
+
+def run_scenario(path, frames, dirty, seed):
+    with open(path) as f:
+        scenario = json.load(f)
+    with contextlib.redirect_stdout(io.StringIO()):  # Game prints mode changes
+        game, render_system, monsters = build(scenario, dirty, seed)
+    world = game.world
+    moves = min(scenario.get("moves_per_frame", 0), len(monsters))
+
+    # Let the sidebars finish sliding in before timing
+    for _ in range(40):
+        render_system.update(game_state=game)
+
+    timings = Timings()
+    instrument(render_system, timings)
+    for _ in range(frames):
+        for monster_id in random.sample(monsters, moves):
+            world.move_entity(monster_id, random.choice((-1, 0, 1)), random.choice((-1, 0, 1)))
+        if not dirty:
+            render_system.invalidate()
+        render_system.update(game_state=game)
+    return scenario, timings.rows()
+
+def main():
+    parser = argparse.ArgumentParser(description="Render frame times for scenario files, headless.")
+    parser.add_argument("scenarios", nargs="*", help="scenario files (default: benchmarks/scenarios/*.json)")
+    parser.add_argument("--frames", type=int, default=200)
+    parser.add_argument("--dirty", action="store_true", help="time dirty-rect frames instead of full redraws")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    paths = args.scenarios or sorted(glob.glob(os.path.join(SCENARIO_DIR, "*.json")))
+    results = {}
+    for path in paths:
+        name = os.path.splitext(os.path.basename(path))[0]
+        scenario, rows = run_scenario(path, args.frames, args.dirty, args.seed)
+        results[name] = [dict(zip(("name", "calls", "p50_ms", "p95_ms", "p99_ms"), row)) for row in rows]
+
+        print(f"{name}: {scenario.get('description', '')}")
+        print(f"  {'method':<28}{'calls':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for method, calls, p50, p95, p99 in rows:
+            print(f"  {method:<28}{calls:>7}{p50:>9.3f}{p95:>9.3f}{p99:>9.3f}")
+        print()
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"frames": args.frames, "dirty": args.dirty, "scenarios": results}, f, indent=2)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,98 @@
+# bench_tile_atlas.py
+# Draws a 200x120 tile map offscreen three ways and reports the time per
+# frame: one font.render and blit per tile (the original map layer), one
+# GlyphCache lookup and blit per tile, and the GlyphAtlas path that draws
+# the whole map with a single Surface.blits call.
+#
+# Usage: python benchmarks/bench_tile_atlas.py [--width W] [--height H] [--frames N]
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from biomes import BIOMES
+from glyph_atlas import GlyphAtlas, collect_glyphs
+from glyph_cache import GlyphCache
+from render_system import RenderSystem
+
+COLORS = {"BLACK": (0, 0, 0), "WHITE": (255, 255, 255), "GREEN": (0, 255, 0), "YELLOW": (255, 255, 0)}
+
+def load(name):
+    """Loads a data file the way Game.load_json_file does, treating unparsable files as empty."""
+    try:
+        with open(os.path.join(ROOT, name)) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def build_map(glyphs, width, height, seed):
+    """A random map: mostly terrain, with entity glyphs sprinkled on top."""
+    random.seed(seed)
+    terrain = [(tile['char'], tile['color']) for tile in BIOMES.values()]
+    tiles = []
+    for y in range(height):
+        for x in range(width):
+            char, color = random.choice(glyphs) if random.random() < 0.1 else random.choice(terrain)
+            tiles.append((x, y, char, color))
+    return tiles
+
+def draw_render(target, font, tiles, tile_size, cache, atlas):
+    for x, y, char, color in tiles:
+        target.blit(font.render(char, True, color), (x * tile_size, y * tile_size))
+
+def draw_cached(target, font, tiles, tile_size, cache, atlas):
+    for x, y, char, color in tiles:
+        target.blit(cache.render(font, char, color), (x * tile_size, y * tile_size))
+
+def draw_atlas(target, font, tiles, tile_size, cache, atlas):
+    surface = atlas.surface
+    target.blits([(surface, (x * tile_size, y * tile_size), atlas.area(char, color))
+                  for x, y, char, color in tiles], doreturn=False)
+
+def main():
+    parser = argparse.ArgumentParser(description="Map layer draw time: per-glyph blits vs glyph atlas.")
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--height", type=int, default=120)
+    parser.add_argument("--tile-size", type=int, default=16)
+    parser.add_argument("--frames", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    pygame.init()
+    font = pygame.font.Font(os.path.join(ROOT, 'JetBrainsMonoNL-Regular.ttf'), args.tile_size)
+    definitions = [load('archetypes.json'), load('creatures.json'), load('items.json')]
+    glyphs = collect_glyphs(definitions, COLORS, extra_colors=RenderSystem.STATUS_COLORS)
+
+    start = time.perf_counter()
+    atlas = GlyphAtlas(font, glyphs + [(tile['char'], tile['color']) for tile in BIOMES.values()])
+    build_ms = (time.perf_counter() - start) * 1000
+    cache = GlyphCache()
+    tiles = build_map(glyphs, args.width, args.height, args.seed)
+    target = pygame.Surface((args.width * args.tile_size, args.height * args.tile_size))
+
+    print(f"{args.width}x{args.height} tiles, {len(atlas)} glyphs in atlas (built in {build_ms:.1f} ms)")
+    print(f"{'path':<14}{'ms/frame':>10}{'speedup':>9}")
+    baseline = None
+    frames = {}
+    for name, draw in (("font.render", draw_render), ("glyph cache", draw_cached), ("atlas", draw_atlas)):
+        draw(target, font, tiles, args.tile_size, cache, atlas)  # Warm up caches
+        start = time.perf_counter()
+        for _ in range(args.frames):
+            target.fill((0, 0, 0))
+            draw(target, font, tiles, args.tile_size, cache, atlas)
+        per_frame = (time.perf_counter() - start) / args.frames * 1000
+        frames[name] = pygame.image.tostring(target, "RGB")
+        baseline = baseline or per_frame
+        print(f"{name:<14}{per_frame:>10.2f}{baseline / per_frame:>8.1f}x")
+    print(f"atlas frame identical to font.render frame: {frames['atlas'] == frames['font.render']}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+# bench_world_queries.py
+# Compares World component storage modes on the queries the systems run every turn.
+#
+# Usage: python benchmarks/bench_world_queries.py [--monsters N] [--items M] [--repeat R]
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import components
+from main import World
+
+# The component combinations the systems query each frame
+QUERIES = [
+    (components.PlayerControllableComponent,),
+    (components.PositionComponent, components.RenderableComponent),
+    (components.FactionComponent, components.PositionComponent, components.CombatComponent),
+    (components.PositionComponent, components.CombatComponent),
+    (components.PositionComponent, components.ItemComponent),
+    (components.PositionComponent, components.WantsToMoveComponent),
+    (components.WantsToAttackComponent,),
+    (components.StatusEffectsComponent,),
+]
+
+def populate(world, num_monsters, num_items):
+    """Fills a world with a player, monsters and floor items."""
+    player = world.create_entity()
+    world.add_component(player.id, components.PositionComponent(5, 5))
+    world.add_component(player.id, components.RenderableComponent('@', (255, 255, 255)))
+    world.add_component(player.id, components.PlayerControllableComponent())
+    world.add_component(player.id, components.CombatComponent(hp=8, ac=7, thac0=19))
+    world.add_component(player.id, components.FactionComponent("player"))
+    world.add_component(player.id, components.StateComponent())
+
+    for i in range(num_monsters):
+        monster = world.create_entity()
+        world.add_component(monster.id, components.PositionComponent(i % 200, i // 200))
+        world.add_component(monster.id, components.RenderableComponent('g', (0, 255, 0)))
+        world.add_component(monster.id, components.DescriptionComponent("goblin"))
+        world.add_component(monster.id, components.CombatComponent(hp=5, ac=6, thac0=19))
+        world.add_component(monster.id, components.FactionComponent("monsters"))
+        world.add_component(monster.id, components.StateComponent())
+        world.add_component(monster.id, components.StatsComponent(10, 10, 10, 10, 10, 10))
+
+    for i in range(num_items):
+        item = world.create_entity()
+        world.add_component(item.id, components.PositionComponent(i % 200, 100 + i // 200))
+        world.add_component(item.id, components.RenderableComponent("'", (255, 255, 0)))
+        world.add_component(item.id, components.DescriptionComponent("key"))
+        world.add_component(item.id, components.ItemComponent())
+        world.add_component(item.id, components.MaterialComponent("steel"))
+
+def time_queries(query_fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in QUERIES:
+            query_fn(query)
+    return (time.perf_counter() - start) / repeat
+
+def time_churn(world, repeat, movers=100):
+    """Runs frames where some monsters gain and lose a movement intent, as on a monster turn."""
+    monsters = world.get_entities_with_components(components.FactionComponent, components.CombatComponent)[:movers]
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for entity_id in monsters:
+            world.add_component(entity_id, components.WantsToMoveComponent(1, 0))
+        for query in QUERIES:
+            world.get_entities_with_components(*query)
+        for entity_id in world.get_entities_with_components(components.PositionComponent, components.WantsToMoveComponent):
+            world.remove_component(entity_id, components.WantsToMoveComponent)
+    return (time.perf_counter() - start) / repeat
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare World storage modes on per-frame queries.")
+    parser.add_argument("--monsters", type=int, default=5000)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{args.monsters} monsters, {args.items} items, {len(QUERIES)} queries per frame")
+    results = {}
+    for mode in ("sparse", "archetype"):
+        world = World(storage_mode=mode)
+        populate(world, args.monsters, args.items)
+        uncached = time_queries(lambda query: world.storage.entities_with(query), args.repeat)
+        cached = time_queries(lambda query: world.get_entities_with_components(*query), args.repeat)
+        churn = time_churn(world, args.repeat)
+        results[mode] = uncached
+        print(f"  {mode:<10} uncached {uncached * 1000:8.3f} ms | cached {cached * 1000:8.3f} ms | "
+              f"cached with 100 movers {churn * 1000:8.3f} ms per frame")
+    print(f"  archetype vs sparse (uncached): {results['sparse'] / results['archetype']:.2f}x")
+
+    print("Query churn (archetype world):")
+    for stats in world.get_query_stats():
+        print(f"  {stats['query']:<62} size {stats['size']:>6}  hits {stats['hits']:>6}  "
+              f"rebuilds {stats['rebuilds']:>5}  invalidations {stats['invalidations']:>5}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,116 @@
+# bench_worldgen.py
+# Times the continent mask and biome classification of
+# WorldGenerator.generate_world at 1k, 4k and 8k square sizes: the old
+# per-cell loops (np.sqrt per cell, an if-chain storing a biome dict per
+# cell in an object array) against the whole-array versions, and reports
+# the memory each biome map takes. The old loops are only run in full at
+# --check-size, where both versions are also checked to produce the same
+# map; at larger sizes their time is extrapolated from --sample-rows rows.
+#
+# Usage: python benchmarks/bench_worldgen.py [--sizes 1000 4000 8000] [--check-size 1000]
+
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+sys.path.insert(0, ROOT)
+
+import numpy as np
+from biomes import BIOMES, biome_tiles
+from world_generator import WorldGenerator
+
+def reference_radial_grad(generator, rows):
+    """The old continent mask loop, for the first rows rows."""
+    center_x, center_y = generator.width / 2, generator.height / 2
+    radial_grad = np.zeros((rows, generator.height))
+    for x in range(rows):
+        for y in range(generator.height):
+            dist_x = abs(x - center_x)
+            dist_y = abs(y - center_y)
+            dist = np.sqrt(dist_x**2 + dist_y**2)
+            radial_grad[x, y] = 1.0 - (dist / (generator.width / 2))
+            radial_grad[x, y] = max(0, radial_grad[x, y])
+    return radial_grad
+
+def reference_biomes(height_map, humidity_map, temperature_map):
+    """The old _create_biomes if-chain, storing a BIOMES dict per cell."""
+    world_map = np.empty(height_map.shape, dtype=object)
+    for i in range(height_map.shape[0]):
+        for j in range(height_map.shape[1]):
+            elevation = height_map[i][j]
+            humidity = humidity_map[i][j]
+            temperature = temperature_map[i][j]
+            if elevation < -0.5:
+                world_map[i][j] = BIOMES['deep_ocean']
+            elif elevation < 0.0:
+                world_map[i][j] = BIOMES['ocean']
+            elif elevation < 0.05:
+                world_map[i][j] = BIOMES['beach']
+            elif elevation < 0.4:
+                if humidity < -0.3 and temperature > 0.3:
+                    world_map[i][j] = BIOMES['desert']
+                elif humidity > 0.3:
+                    world_map[i][j] = BIOMES['swamp']
+                else:
+                    world_map[i][j] = BIOMES['plains']
+            elif elevation < 0.7:
+                world_map[i][j] = BIOMES['forest']
+            else:
+                world_map[i][j] = BIOMES['mountain']
+    return world_map
+
+def random_maps(size, rows, rng):
+    """Height, humidity and temperature maps spread over every biome threshold."""
+    return (rng.uniform(-1, 1, (rows, size)).astype(np.float32),
+            rng.uniform(-0.6, 0.6, (rows, size)).astype(np.float32),
+            rng.uniform(-0.6, 0.6, (rows, size)).astype(np.float32))
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description="Continent mask and biome classification: per-cell loops vs NumPy.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 4000, 8000])
+    parser.add_argument("--check-size", type=int, default=1000)
+    parser.add_argument("--sample-rows", type=int, default=16)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    rng = np.random.default_rng(args.seed)
+
+    # Both versions must agree before their times mean anything
+    generator = WorldGenerator(args.check_size, args.check_size, seed=args.seed)
+    maps = random_maps(args.check_size, args.check_size, rng)
+    grad_error = np.max(np.abs(reference_radial_grad(generator, args.check_size) - generator._radial_gradient()))
+    same_biomes = np.array_equal(biome_tiles(generator._create_biomes(*maps)), reference_biomes(*maps))
+    print(f"{args.check_size}x{args.check_size}: radial gradient max difference {grad_error:.1e} (float32), "
+          f"biome map matches: {same_biomes}")
+    print()
+
+    print(f"{'size':>6}{'step':>10}{'loop s':>10}{'numpy s':>10}{'speedup':>9}{'loop MB':>10}{'numpy MB':>10}")
+    for size in args.sizes:
+        generator = WorldGenerator(size, size, seed=args.seed)
+        rows = size if size <= args.check_size else min(args.sample_rows, size)
+        note = "" if rows == size else "*"
+
+        mask, grad_time = timed(generator._radial_gradient)
+        _, grad_loop = timed(reference_radial_grad, generator, rows)
+        grad_loop *= size / rows
+        print(f"{size:>6}{'mask':>10}{grad_loop:>9.2f}{note:1}{grad_time:>10.3f}{grad_loop / grad_time:>8.0f}x"
+              f"{size * size * 8 / 1e6:>10.0f}{mask.nbytes / 1e6:>10.0f}")
+
+        maps = random_maps(size, size, rng)
+        ids, biome_time = timed(generator._create_biomes, *maps)
+        tiles, biome_loop = timed(reference_biomes, *(m[:rows] for m in maps))
+        biome_loop *= size / rows
+        loop_mb = tiles.nbytes * size / rows / 1e6  # One pointer per cell; the dicts are shared
+        print(f"{size:>6}{'biomes':>10}{biome_loop:>9.2f}{note:1}{biome_time:>10.3f}{biome_loop / biome_time:>8.0f}x"
+              f"{loop_mb:>10.0f}{ids.nbytes / 1e6:>10.0f}")
+        del mask, maps, ids, tiles
+    print("* extrapolated from a sample of rows")
+
+if __name__ == '__main__':
+    main()
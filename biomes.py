@@ -0,0 +1,28 @@
+# biomes.py
+# The biome table shared by the world generator, the world viewer and the renderer.
+
+import numpy as np
+
+# Biome name -> the tile stored in the world map for it
+BIOMES = {
+    'deep_ocean': {'char': '≈', 'color': (0, 0, 128)},
+    'ocean': {'char': '~', 'color': (0, 0, 255)},
+    'beach': {'char': '.', 'color': (210, 180, 140)},
+    'plains': {'char': '.', 'color': (0, 128, 0)},
+    'forest': {'char': '♣', 'color': (0, 100, 0)},
+    'mountain': {'char': '^', 'color': (128, 128, 128)},
+    'desert': {'char': '.', 'color': (210, 180, 140)},
+    'swamp': {'char': ';', 'color': (128, 0, 128)},
+    'river': {'char': '~', 'color': (0, 0, 255)}
+}
+
+# Biome ids, as stored in a generated uint8 map: the position in BIOMES
+BIOME_NAMES = list(BIOMES)
+BIOME_IDS = {name: i for i, name in enumerate(BIOME_NAMES)}
+
+def biome_tiles(grid):
+    """Turns a grid of biome ids into a grid of the BIOMES dicts, the
+    layout world.dat used before maps were saved as ids."""
+    tiles = np.empty(len(BIOMES), dtype=object)
+    tiles[:] = list(BIOMES.values())
+    return tiles[grid]
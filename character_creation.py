@@ -187,12 +187,7 @@ class CharacterCreationSystem:
         # Remove any existing player entity
         player_entities = self.world.get_entities_with_components(PlayerControllableComponent)
         for entity_id in player_entities:
-            # Remove the entity properly
-            for comp_type in list(self.world.components.keys()):
-                if entity_id in self.world.components[comp_type]:
-                    del self.world.components[comp_type][entity_id]
-            if entity_id in self.world.entities:
-                del self.world.entities[entity_id]
+            self.world.destroy_entity(entity_id)
         
         # Create new player entity
         entity = self.world.create_entity()
@@ -4,73 +4,85 @@
 import random
 import re
 from components import *
+from event_queues import AttackEvent, SavingThrowEvent, ApplyStatusEvent
 from core_systems import System
 
+CORPSE_GLYPH = ('%', (100, 100, 100))  # What a dead creature is drawn as
+
 class SavingThrowSystem(System):
     """Handles saving throws against various effects."""
+    reads = (WantsToMakeSavingThrowComponent,)
+    reads_events = (SavingThrowEvent,)
     
     def update(self, *args, **kwargs):
         game_state = kwargs.get('game_state')
-        
+
+        for event in self.world.events.drain(SavingThrowEvent):
+            self.make_save(event.entity_id, event, game_state)
+
+        # Compatibility path: intents sent as components
         for entity_id in self.world.get_entities_with_components(WantsToMakeSavingThrowComponent):
             save_intent = self.world.get_component(entity_id, WantsToMakeSavingThrowComponent)
-            stats = self.world.get_component(entity_id, StatsComponent)
-            state = self.world.get_component(entity_id, StateComponent)
-            
-            if not stats:
-                # Can't make saves without stats
-                self.world.remove_component(entity_id, WantsToMakeSavingThrowComponent)
-                continue
-            
-            # Get the appropriate save value
-            save_value = 20  # Default
-            if save_intent.save_type == "death":
-                save_value = stats.save_death
-            elif save_intent.save_type == "wands":
-                save_value = stats.save_wands
-            elif save_intent.save_type == "paralysis":
-                save_value = stats.save_paralysis
-            elif save_intent.save_type == "breath":
-                save_value = stats.save_breath
-            elif save_intent.save_type == "spells":
-                save_value = stats.save_spells
-            
-            # Apply save penalty from status effects
-            if state:
-                save_value += state.save_penalty
-            
-            # Roll the save
-            save_roll = random.randint(1, 20)
-            save_successful = save_roll >= save_value
-            
-            # Generate message
-            entity_name = "You" if self.world.get_component(entity_id, PlayerControllableComponent) else None
-            if not entity_name:
-                desc = self.world.get_component(entity_id, DescriptionComponent)
-                entity_name = f"The {desc.text}" if desc else "The creature"
-            
-            if save_successful:
-                if entity_name == "You":
-                    game_state.add_message(f"You resist the effect! (rolled {save_roll}, needed {save_value})")
-                else:
-                    game_state.add_message(f"{entity_name} resists the effect!")
+            self.make_save(entity_id, save_intent, game_state)
+            self.world.commands.remove_component(entity_id, WantsToMakeSavingThrowComponent)
+
+    def make_save(self, entity_id, save_intent, game_state):
+        """Rolls a saving throw; save_intent is a SavingThrowEvent or WantsToMakeSavingThrowComponent."""
+        stats = self.world.get_component(entity_id, StatsComponent)
+        state = self.world.get_component(entity_id, StateComponent)
+        
+        if not stats:
+            # Can't make saves without stats
+            return
+        
+        # Get the appropriate save value
+        save_value = 20  # Default
+        if save_intent.save_type == "death":
+            save_value = stats.save_death
+        elif save_intent.save_type == "wands":
+            save_value = stats.save_wands
+        elif save_intent.save_type == "paralysis":
+            save_value = stats.save_paralysis
+        elif save_intent.save_type == "breath":
+            save_value = stats.save_breath
+        elif save_intent.save_type == "spells":
+            save_value = stats.save_spells
+        
+        # Apply save penalty from status effects
+        if state:
+            save_value += state.save_penalty
+        
+        # Roll the save
+        save_roll = random.randint(1, 20)
+        save_successful = save_roll >= save_value
+        
+        # Generate message
+        entity_name = "You" if self.world.get_component(entity_id, PlayerControllableComponent) else None
+        if not entity_name:
+            desc = self.world.get_component(entity_id, DescriptionComponent)
+            entity_name = f"The {desc.text}" if desc else "The creature"
+        
+        if save_successful:
+            if entity_name == "You":
+                game_state.add_message(f"You resist the effect! (rolled {save_roll}, needed {save_value})")
             else:
-                if entity_name == "You":
-                    game_state.add_message(f"You fail to resist! (rolled {save_roll}, needed {save_value})")
-                else:
-                    game_state.add_message(f"{entity_name} fails to resist!")
-                
-                # Apply the effect if save failed
-                if save_intent.effect_data:
-                    self.world.add_component(entity_id, WantsToApplyStatusComponent(
-                        status_effect_data=save_intent.effect_data,
-                        source_entity_id=save_intent.source_entity_id
-                    ))
+                game_state.add_message(f"{entity_name} resists the effect!")
+        else:
+            if entity_name == "You":
+                game_state.add_message(f"You fail to resist! (rolled {save_roll}, needed {save_value})")
+            else:
+                game_state.add_message(f"{entity_name} fails to resist!")
             
-            self.world.remove_component(entity_id, WantsToMakeSavingThrowComponent)
+            # Apply the effect if save failed
+            if save_intent.effect_data:
+                self.world.send_intent(ApplyStatusEvent, entity_id,
+                    status_effect_data=save_intent.effect_data,
+                    source_entity_id=save_intent.source_entity_id
+                )
 
 class AbilitySystem(System):
     """Handles WantsToUseAbility intents created by the new UI."""
+    reads = (WantsToUseAbilityComponent,)
     
     def update(self, *args, **kwargs):
         game_state = kwargs.get('game_state')
@@ -83,7 +95,7 @@ class AbilitySystem(System):
             
             if ability_id not in self.world.abilities:
                 print(f"Warning: Ability '{ability_id}' not found")
-                self.world.remove_component(entity_id, WantsToUseAbilityComponent)
+                self.world.commands.remove_component(entity_id, WantsToUseAbilityComponent)
                 continue
             
             ability_data = self.world.abilities[ability_id]
@@ -114,7 +126,7 @@ class AbilitySystem(System):
                 ability_name = ability_data.get("name", ability_id.replace('_', ' '))
                 game_state.add_message(f"{user_name} {'try' if user_name == 'You' else 'tries'} to use {ability_name} but {'fail' if user_name == 'You' else 'fails'}!")
             
-            self.world.remove_component(entity_id, WantsToUseAbilityComponent)
+            self.world.commands.remove_component(entity_id, WantsToUseAbilityComponent)
     
     def parse_dice_damage(self, damage_str):
         """Parse damage strings like '1d8+1', '6d6', or plain numbers."""
@@ -211,22 +223,18 @@ class AbilitySystem(System):
         damage_amount = self.parse_dice_damage(ability_data.get("damage", "1d6"))
         
         affected_entities = []
-        for entity_id in self.world.get_entities_with_components(PositionComponent, CombatComponent):
-            entity_pos = self.world.get_component(entity_id, PositionComponent)
-            distance = max(abs(entity_pos.x - target_x), abs(entity_pos.y - target_y))
+        for entity_id in self.world.spatial_index.entities_in_range(target_x, target_y, aoe_radius, layer="creatures"):
+            # Apply damage
+            combat = self.world.get_component(entity_id, CombatComponent)
+            combat.hp -= damage_amount
+            affected_entities.append(entity_id)
             
-            if distance <= aoe_radius:
-                # Apply damage
-                combat = self.world.get_component(entity_id, CombatComponent)
-                combat.hp -= damage_amount
-                affected_entities.append(entity_id)
-                
-                # Check for death
-                if combat.hp <= 0:
-                    from combat_systems import CombatSystem
-                    combat_system = self.world.get_system(CombatSystem)
-                    if combat_system:
-                        combat_system.handle_death(entity_id, caster_id, game_state)
+            # Check for death
+            if combat.hp <= 0:
+                from combat_systems import CombatSystem
+                combat_system = self.world.get_system(CombatSystem)
+                if combat_system:
+                    combat_system.handle_death(entity_id, caster_id, game_state)
         
         # Generate message
         caster_name = "You" if self.world.get_component(caster_id, PlayerControllableComponent) else "The creature"
@@ -287,18 +295,18 @@ class AbilitySystem(System):
         save_type = self.get_save_type_for_effect(status_effect.get("id"))
         if save_type:
             # Create saving throw intent
-            self.world.add_component(target_id, WantsToMakeSavingThrowComponent(
+            self.world.send_intent(SavingThrowEvent, target_id,
                 save_type=save_type,
                 dc=15,
                 effect_data=status_effect,
                 source_entity_id=caster_id
-            ))
+            )
         else:
             # No save allowed, apply directly
-            self.world.add_component(target_id, WantsToApplyStatusComponent(
+            self.world.send_intent(ApplyStatusEvent, target_id,
                 status_effect_data=status_effect,
                 source_entity_id=caster_id
-            ))
+            )
     
     def apply_aoe_status_effect(self, caster_id, ability_data, game_state):
         """Apply area of effect status effects around the caster."""
@@ -313,35 +321,27 @@ class AbilitySystem(System):
         # Get AOE range (default to 1 tile radius)
         aoe_range = ability_data.get("range", 1)
         
-        # Find all entities within range
-        affected_entities = []
-        for entity_id in self.world.get_entities_with_components(PositionComponent):
-            if entity_id == caster_id:
-                continue  # Don't affect self unless specified
-                
-            entity_pos = self.world.get_component(entity_id, PositionComponent)
-            distance = max(abs(entity_pos.x - caster_pos.x), abs(entity_pos.y - caster_pos.y))
-            
-            if distance <= aoe_range:
-                # Check if this entity can be affected (has combat component)
-                if self.world.get_component(entity_id, CombatComponent):
-                    affected_entities.append(entity_id)
+        # Find all entities within range that can be affected (have a combat component)
+        affected_entities = [
+            entity_id for entity_id in self.world.spatial_index.entities_in_range(caster_pos.x, caster_pos.y, aoe_range, layer="creatures")
+            if entity_id != caster_id  # Don't affect self unless specified
+        ]
         
         # Apply status effect to all affected entities
         for target_id in affected_entities:
             save_type = self.get_save_type_for_effect(status_effect.get("id"))
             if save_type:
-                self.world.add_component(target_id, WantsToMakeSavingThrowComponent(
+                self.world.send_intent(SavingThrowEvent, target_id,
                     save_type=save_type,
                     dc=15,
                     effect_data=status_effect,
                     source_entity_id=caster_id
-                ))
+                )
             else:
-                self.world.add_component(target_id, WantsToApplyStatusComponent(
+                self.world.send_intent(ApplyStatusEvent, target_id,
                     status_effect_data=status_effect,
                     source_entity_id=caster_id
-                ))
+                )
         
         # Message about AOE effect
         caster_name = "You" if self.world.get_component(caster_id, PlayerControllableComponent) else "The creature"
@@ -367,8 +367,8 @@ class AbilitySystem(System):
         effects_to_remove = []
         
         for i, effect in enumerate(status_effects_comp.effects):
-            if effect["id"] in cures:
-                cured_effects.append(effect["name"])
+            if effect.id in cures:
+                cured_effects.append(effect.name)
                 effects_to_remove.append(i)
                 
                 # Remove the effect's mechanical changes
@@ -420,6 +420,8 @@ class AbilitySystem(System):
 
 class CombatSystem(System):
     """Handles combat between entities and ability processing."""
+    reads = (WantsToTriggerAbilityComponent, WantsToAttackComponent)
+    reads_events = (AttackEvent,)
     
     def update(self, *args, **kwargs):
         game_state = kwargs.get('game_state')
@@ -439,7 +441,7 @@ class CombatSystem(System):
             
             if ability_id not in self.world.abilities:
                 print(f"Warning: Ability '{ability_id}' not found")
-                self.world.remove_component(entity_id, WantsToTriggerAbilityComponent)
+                self.world.commands.remove_component(entity_id, WantsToTriggerAbilityComponent)
                 continue
             
             ability_data = self.world.abilities[ability_id]
@@ -456,18 +458,18 @@ class CombatSystem(System):
                             save_type = self.get_save_type_for_effect(status_effect.get("id"))
                             if save_type:
                                 # Create saving throw intent
-                                self.world.add_component(target_id, WantsToMakeSavingThrowComponent(
+                                self.world.send_intent(SavingThrowEvent, target_id,
                                     save_type=save_type,
                                     dc=15,
                                     effect_data=status_effect,
                                     source_entity_id=entity_id
-                                ))
+                                )
                             else:
                                 # No save allowed, apply directly
-                                self.world.add_component(target_id, WantsToApplyStatusComponent(
+                                self.world.send_intent(ApplyStatusEvent, target_id,
                                     status_effect_data=status_effect,
                                     source_entity_id=entity_id
-                                ))
+                                )
                     else:
                         game_state.add_message("No valid target for ability!")
                         
@@ -482,7 +484,7 @@ class CombatSystem(System):
                 user_name = "You" if self.world.get_component(entity_id, PlayerControllableComponent) else "The creature"
                 game_state.add_message(f"{user_name} {'try' if user_name == 'You' else 'tries'} to use {ability_id.replace('_', ' ')} but {'fail' if user_name == 'You' else 'fails'}!")
             
-            self.world.remove_component(entity_id, WantsToTriggerAbilityComponent)
+            self.world.commands.remove_component(entity_id, WantsToTriggerAbilityComponent)
 
     def apply_aoe_status_effect(self, caster_id, ability_data, game_state):
         """Apply area of effect status effects around the caster."""
@@ -497,35 +499,27 @@ class CombatSystem(System):
         # Get AOE range (default to 1 tile radius)
         aoe_range = ability_data.get("range", 1)
         
-        # Find all entities within range
-        affected_entities = []
-        for entity_id in self.world.get_entities_with_components(PositionComponent):
-            if entity_id == caster_id:
-                continue  # Don't affect self unless specified
-                
-            entity_pos = self.world.get_component(entity_id, PositionComponent)
-            distance = max(abs(entity_pos.x - caster_pos.x), abs(entity_pos.y - caster_pos.y))
-            
-            if distance <= aoe_range:
-                # Check if this entity can be affected (has combat component)
-                if self.world.get_component(entity_id, CombatComponent):
-                    affected_entities.append(entity_id)
+        # Find all entities within range that can be affected (have a combat component)
+        affected_entities = [
+            entity_id for entity_id in self.world.spatial_index.entities_in_range(caster_pos.x, caster_pos.y, aoe_range, layer="creatures")
+            if entity_id != caster_id  # Don't affect self unless specified
+        ]
         
         # Apply status effect to all affected entities
         for target_id in affected_entities:
             save_type = self.get_save_type_for_effect(status_effect.get("id"))
             if save_type:
-                self.world.add_component(target_id, WantsToMakeSavingThrowComponent(
+                self.world.send_intent(SavingThrowEvent, target_id,
                     save_type=save_type,
                     dc=15,
                     effect_data=status_effect,
                     source_entity_id=caster_id
-                ))
+                )
             else:
-                self.world.add_component(target_id, WantsToApplyStatusComponent(
+                self.world.send_intent(ApplyStatusEvent, target_id,
                     status_effect_data=status_effect,
                     source_entity_id=caster_id
-                ))
+                )
         
         # Message about AOE effect
         caster_name = "You" if self.world.get_component(caster_id, PlayerControllableComponent) else "The creature"
@@ -534,94 +528,101 @@ class CombatSystem(System):
 
     def process_attacks(self, game_state):
         """Process regular attack intents."""
+        for event in self.world.events.drain(AttackEvent):
+            self.resolve_attack(event.entity_id, event.target_id, game_state)
+
+        # Compatibility path: intents sent as components
         for attacker_id in self.world.get_entities_with_components(WantsToAttackComponent):
             intent = self.world.get_component(attacker_id, WantsToAttackComponent)
-            target_id = intent.target_id
+            self.resolve_attack(attacker_id, intent.target_id, game_state)
+            self.world.commands.remove_component(attacker_id, WantsToAttackComponent)
 
-            # Get components for attacker and defender
-            attacker_desc = self.world.get_component(attacker_id, DescriptionComponent)
-            defender_desc = self.world.get_component(target_id, DescriptionComponent)
-            attacker_combat = self.world.get_component(attacker_id, CombatComponent)
-            defender_combat = self.world.get_component(target_id, CombatComponent)
+    def resolve_attack(self, attacker_id, target_id, game_state):
+        """Rolls one attack and applies its damage and on-attack abilities."""
+        # The target may have been destroyed since the intent was made
+        if not self.world.is_alive(target_id):
+            return
 
-            if not all([attacker_desc, defender_desc, attacker_combat, defender_combat]):
-                self.world.remove_component(attacker_id, WantsToAttackComponent)
-                continue
+        # Get components for attacker and defender
+        attacker_desc = self.world.get_component(attacker_id, DescriptionComponent)
+        defender_desc = self.world.get_component(target_id, DescriptionComponent)
+        attacker_combat = self.world.get_component(attacker_id, CombatComponent)
+        defender_combat = self.world.get_component(target_id, CombatComponent)
 
-            # Skip if target is already dead
-            target_state = self.world.get_component(target_id, StateComponent)
-            if target_state and target_state.dead:
-                self.world.remove_component(attacker_id, WantsToAttackComponent)
-                continue
+        if not all([attacker_desc, defender_desc, attacker_combat, defender_combat]):
+            return
 
-            # Get state components for status effect modifiers
-            attacker_state = self.world.get_component(attacker_id, StateComponent)
-            defender_state = self.world.get_component(target_id, StateComponent)
+        # Skip if target is already dead
+        target_state = self.world.get_component(target_id, StateComponent)
+        if target_state and target_state.dead:
+            return
 
-            # Determine names for messaging
-            attacker_name = "You" if self.world.get_component(attacker_id, PlayerControllableComponent) else attacker_desc.text
-            defender_name = "you" if self.world.get_component(target_id, PlayerControllableComponent) else f"the {defender_desc.text}"
+        # Get state components for status effect modifiers
+        attacker_state = self.world.get_component(attacker_id, StateComponent)
+        defender_state = self.world.get_component(target_id, StateComponent)
 
-            # Calculate attack modifiers from status effects
-            attack_thac0 = attacker_combat.thac0
-            if attacker_state:
-                attack_thac0 += attacker_state.thac0_modifier
+        # Determine names for messaging
+        attacker_name = "You" if self.world.get_component(attacker_id, PlayerControllableComponent) else attacker_desc.text
+        defender_name = "you" if self.world.get_component(target_id, PlayerControllableComponent) else f"the {defender_desc.text}"
 
-            # Resolve attack using OSE rules (THAC0 system)
-            attack_roll = random.randint(1, 20)
-            hit_ac = attack_thac0 - attack_roll
+        # Calculate attack modifiers from status effects
+        attack_thac0 = attacker_combat.thac0
+        if attacker_state:
+            attack_thac0 += attacker_state.thac0_modifier
+
+        # Resolve attack using OSE rules (THAC0 system)
+        attack_roll = random.randint(1, 20)
+        hit_ac = attack_thac0 - attack_roll
+        
+        # Enhanced combat messaging
+        if hit_ac <= defender_combat.ac:
+            # Calculate damage with modifiers
+            base_damage = random.randint(1, 6)  # 1d6 damage for now
+            final_damage = base_damage
+            if attacker_state:
+                final_damage += attacker_state.damage_modifier
+            final_damage = max(1, final_damage)  # Minimum 1 damage
             
-            # Enhanced combat messaging
-            if hit_ac <= defender_combat.ac:
-                # Calculate damage with modifiers
-                base_damage = random.randint(1, 6)  # 1d6 damage for now
-                final_damage = base_damage
-                if attacker_state:
-                    final_damage += attacker_state.damage_modifier
-                final_damage = max(1, final_damage)  # Minimum 1 damage
-                
-                defender_combat.hp -= final_damage
-                
-                # Enhanced hit message
-                game_state.add_message(f"{attacker_name} attack{'' if attacker_name == 'You' else 's'} {defender_name} and roll{'' if attacker_name == 'You' else 's'} a {attack_roll}, hitting for {final_damage} damage!")
+            defender_combat.hp -= final_damage
+            
+            # Enhanced hit message
+            game_state.add_message(f"{attacker_name} attack{'' if attacker_name == 'You' else 's'} {defender_name} and roll{'' if attacker_name == 'You' else 's'} a {attack_roll}, hitting for {final_damage} damage!")
 
-                if defender_combat.hp <= 0:
-                    # Handle death
-                    self.handle_death(target_id, attacker_id, game_state)
-                else:
-                    # Check for and trigger abilities after successful attack
-                    abilities_comp = self.world.get_component(attacker_id, AbilitiesComponent)
-                    if abilities_comp:
-                        for ability_id in abilities_comp.abilities:
-                            if ability_id in self.world.abilities:
-                                ability_data = self.world.abilities[ability_id]
-                                if ability_data.get("type") == "on_attack":
-                                    # Roll for chance
-                                    chance = ability_data.get("chance", 0.0)
-                                    if random.random() <= chance:
-                                        # Check if the effect allows a saving throw
-                                        status_effect = ability_data.get("status_effect")
-                                        if status_effect:
-                                            save_type = self.get_save_type_for_effect(status_effect.get("id"))
-                                            if save_type:
-                                                # Create saving throw intent
-                                                self.world.add_component(target_id, WantsToMakeSavingThrowComponent(
-                                                    save_type=save_type,
-                                                    dc=15,  # Default DC, could be customized
-                                                    effect_data=status_effect,
-                                                    source_entity_id=attacker_id
-                                                ))
-                                            else:
-                                                # No save allowed, apply directly
-                                                self.world.add_component(target_id, WantsToApplyStatusComponent(
-                                                    status_effect_data=status_effect,
-                                                    source_entity_id=attacker_id
-                                                ))
+            if defender_combat.hp <= 0:
+                # Handle death
+                self.handle_death(target_id, attacker_id, game_state)
             else:
-                # Enhanced miss message
-                game_state.add_message(f"{attacker_name} attack{'' if attacker_name == 'You' else 's'} {defender_name} and roll{'' if attacker_name == 'You' else 's'} a {attack_roll}, but miss{'!' if attacker_name == 'You' else 'es!'}")
-
-            self.world.remove_component(attacker_id, WantsToAttackComponent)
+                # Check for and trigger abilities after successful attack
+                abilities_comp = self.world.get_component(attacker_id, AbilitiesComponent)
+                if abilities_comp:
+                    for ability_id in abilities_comp.abilities:
+                        if ability_id in self.world.abilities:
+                            ability_data = self.world.abilities[ability_id]
+                            if ability_data.get("type") == "on_attack":
+                                # Roll for chance
+                                chance = ability_data.get("chance", 0.0)
+                                if random.random() <= chance:
+                                    # Check if the effect allows a saving throw
+                                    status_effect = ability_data.get("status_effect")
+                                    if status_effect:
+                                        save_type = self.get_save_type_for_effect(status_effect.get("id"))
+                                        if save_type:
+                                            # Create saving throw intent
+                                            self.world.send_intent(SavingThrowEvent, target_id,
+                                                save_type=save_type,
+                                                dc=15,  # Default DC, could be customized
+                                                effect_data=status_effect,
+                                                source_entity_id=attacker_id
+                                            )
+                                        else:
+                                            # No save allowed, apply directly
+                                            self.world.send_intent(ApplyStatusEvent, target_id,
+                                                status_effect_data=status_effect,
+                                                source_entity_id=attacker_id
+                                            )
+        else:
+            # Enhanced miss message
+            game_state.add_message(f"{attacker_name} attack{'' if attacker_name == 'You' else 's'} {defender_name} and roll{'' if attacker_name == 'You' else 's'} a {attack_roll}, but miss{'!' if attacker_name == 'You' else 'es!'}")
 
     def get_save_type_for_effect(self, effect_id):
         """Determine the appropriate saving throw type for an effect."""
@@ -688,8 +689,7 @@ class CombatSystem(System):
         # Change appearance to corpse
         renderable = self.world.get_component(dead_entity_id, RenderableComponent)
         if renderable:
-            renderable.char = '%'
-            renderable.color = (100, 100, 100)  # Gray corpse
+            renderable.char, renderable.color = CORPSE_GLYPH  # Gray corpse
 
     def handle_level_up(self, entity_id, xp_comp, game_state):
         """Handle leveling up."""
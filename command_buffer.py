@@ -0,0 +1,97 @@
+# command_buffer.py
+# Deferred structural changes and pooled intent components.
+
+from components import IntentComponent
+
+ADD, REMOVE, DESTROY = 0, 1, 2
+
+class CommandBuffer:
+    """Records component adds/removes and entity destruction to apply later.
+
+    Systems write to the World's buffer while they iterate query results; the
+    World flushes it at the sync point after each system, so a system never
+    changes the queries it is iterating and the next system sees all of its
+    changes. Commands are applied in the order they were recorded.
+    """
+    def __init__(self):
+        self.commands = []  # (op, entity_id, component or component type)
+        self.applied = 0
+
+    def __len__(self):
+        return len(self.commands)
+
+    def add_component(self, entity_id, component):
+        self.commands.append((ADD, entity_id, component))
+        return component
+
+    def remove_component(self, entity_id, component_type):
+        self.commands.append((REMOVE, entity_id, component_type))
+
+    def destroy_entity(self, entity_id):
+        self.commands.append((DESTROY, entity_id, None))
+
+    def flush(self, world):
+        """Applies the recorded commands to the world. Returns how many were applied.
+
+        Commands for entities destroyed in the meantime are dropped. Intents
+        removed here go back to the world's intent pool.
+        """
+        commands = self.commands
+        if not commands:
+            return 0
+        self.commands = []
+        pool = world.intent_pool
+        for op, entity_id, arg in commands:
+            if not world.is_alive(entity_id):
+                if op == ADD:
+                    pool.release(arg)
+                continue
+            if op == ADD:
+                world.add_component(entity_id, arg)
+            elif op == REMOVE:
+                removed = world.remove_component(entity_id, arg)
+                if removed is not None:
+                    pool.release(removed)
+            else:
+                world.destroy_entity(entity_id)
+        self.applied += len(commands)
+        return len(commands)
+
+class ComponentPool:
+    """Free lists of intent components, reused instead of allocating new ones.
+
+    Only components released after the World is done with them (intents
+    removed through the command buffer) are recycled. acquire() re-runs
+    __init__ on a recycled instance, so every intent's __init__ must set all
+    of its slots.
+    """
+    def __init__(self, max_per_type=256):
+        self.max_per_type = max_per_type
+        self.free = {}  # component type -> list of spare instances
+        self.allocated = 0
+        self.reused = 0
+
+    def acquire(self, component_type, *args, **kwargs):
+        spare = self.free.get(component_type)
+        if spare:
+            component = spare.pop()
+            component.__init__(*args, **kwargs)
+            self.reused += 1
+            return component
+        self.allocated += 1
+        return component_type(*args, **kwargs)
+
+    def release(self, component):
+        if not isinstance(component, IntentComponent):
+            return
+        spare = self.free.setdefault(type(component), [])
+        if len(spare) < self.max_per_type:
+            spare.append(component)
+
+    def stats(self):
+        """Returns allocation counters and the number of spare instances per type."""
+        return {
+            "allocated": self.allocated,
+            "reused": self.reused,
+            "spare": {component_type.__name__: len(spare) for component_type, spare in self.free.items()},
+        }
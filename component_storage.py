@@ -0,0 +1,217 @@
+# component_storage.py
+# Component storage backends used by the ECS World.
+
+class SparseComponentStorage:
+    """Stores components as one dict per component type, keyed by entity ID."""
+    def __init__(self):
+        self.components = {}
+        self.entity_types = {}  # entity_id -> set of component types
+
+    def add(self, entity_id, component):
+        """Stores a component. Returns True if the entity did not have this component type yet."""
+        component_type = type(component)
+        if component_type not in self.components:
+            self.components[component_type] = {}
+        self.components[component_type][entity_id] = component
+        types = self.entity_types.setdefault(entity_id, set())
+        if component_type in types:
+            return False
+        types.add(component_type)
+        return True
+
+    def get(self, entity_id, component_type):
+        return self.components.get(component_type, {}).get(entity_id)
+
+    def remove(self, entity_id, component_type):
+        """Removes a component and returns it, or None if the entity didn't have it."""
+        by_entity = self.components.get(component_type)
+        if by_entity is None or entity_id not in by_entity:
+            return None
+        self.entity_types[entity_id].discard(component_type)
+        return by_entity.pop(entity_id)
+
+    def component_types(self, entity_id):
+        return list(self.entity_types.get(entity_id, ()))
+
+    def has_all(self, entity_id, signature):
+        """Checks whether an entity has every component type in a frozenset."""
+        return signature <= self.entity_types.get(entity_id, frozenset())
+
+    def entities_with(self, component_types):
+        if not component_types: return []
+        try:
+            entity_ids = set(self.components[component_types[0]].keys())
+        except KeyError:
+            return []
+        for component_type in component_types[1:]:
+            try:
+                entity_ids.intersection_update(self.components[component_type].keys())
+            except KeyError:
+                return []
+        return list(entity_ids)
+
+
+class Archetype:
+    """A table of entities that share exactly the same set of component types.
+
+    Each component type gets a dense column; an entity's components all live
+    at the same row index across the columns.
+    """
+    def __init__(self, component_types):
+        self.signature = frozenset(component_types)
+        self.entity_ids = []
+        self.rows = {}  # entity_id -> row index
+        self.columns = {component_type: [] for component_type in self.signature}
+        # Cached transitions to neighbouring archetypes
+        self.add_edges = {}
+        self.remove_edges = {}
+
+    def __len__(self):
+        return len(self.entity_ids)
+
+    def append(self, entity_id, components_by_type):
+        self.rows[entity_id] = len(self.entity_ids)
+        self.entity_ids.append(entity_id)
+        for component_type, column in self.columns.items():
+            column.append(components_by_type[component_type])
+
+    def pop_row(self, entity_id):
+        """Removes an entity's row (swapping the last row into its place) and returns its components."""
+        row = self.rows.pop(entity_id)
+        last = len(self.entity_ids) - 1
+        removed = {}
+        for component_type, column in self.columns.items():
+            removed[component_type] = column[row]
+            if row != last:
+                column[row] = column[last]
+            column.pop()
+        if row != last:
+            moved_id = self.entity_ids[last]
+            self.entity_ids[row] = moved_id
+            self.rows[moved_id] = row
+        self.entity_ids.pop()
+        return removed
+
+
+class ArchetypeComponentStorage:
+    """Stores components in archetype tables, one table per component signature.
+
+    Multi-component queries only visit the tables whose signature contains
+    every requested type, instead of intersecting per-type key sets.
+    """
+    def __init__(self):
+        self.archetypes = {}  # frozenset of types -> Archetype
+        self.archetypes_by_type = {}  # component type -> list of Archetypes containing it
+        self.entity_archetype = {}  # entity_id -> Archetype
+        self._matching = {}  # frozenset of query types -> list of matching Archetypes
+
+    def _get_archetype(self, signature):
+        archetype = self.archetypes.get(signature)
+        if archetype is None:
+            archetype = Archetype(signature)
+            self.archetypes[signature] = archetype
+            for component_type in signature:
+                self.archetypes_by_type.setdefault(component_type, []).append(archetype)
+            for query_types, matches in self._matching.items():
+                if query_types <= signature:
+                    matches.append(archetype)
+        return archetype
+
+    def _move(self, entity_id, source, target, components_by_type):
+        if source is not None:
+            source.pop_row(entity_id)
+        if target is None:
+            del self.entity_archetype[entity_id]
+        else:
+            target.append(entity_id, components_by_type)
+            self.entity_archetype[entity_id] = target
+
+    def add(self, entity_id, component):
+        """Stores a component. Returns True if the entity did not have this component type yet."""
+        component_type = type(component)
+        source = self.entity_archetype.get(entity_id)
+        if source is not None and component_type in source.columns:
+            source.columns[component_type][source.rows[entity_id]] = component
+            return False
+
+        if source is None:
+            target = self._get_archetype(frozenset((component_type,)))
+            values = {}
+        else:
+            target = source.add_edges.get(component_type)
+            if target is None:
+                target = self._get_archetype(source.signature | {component_type})
+                source.add_edges[component_type] = target
+            row = source.rows[entity_id]
+            values = {t: column[row] for t, column in source.columns.items()}
+        values[component_type] = component
+        self._move(entity_id, source, target, values)
+        return True
+
+    def get(self, entity_id, component_type):
+        archetype = self.entity_archetype.get(entity_id)
+        if archetype is None:
+            return None
+        column = archetype.columns.get(component_type)
+        if column is None:
+            return None
+        return column[archetype.rows[entity_id]]
+
+    def remove(self, entity_id, component_type):
+        """Removes a component and returns it, or None if the entity didn't have it."""
+        source = self.entity_archetype.get(entity_id)
+        if source is None or component_type not in source.columns:
+            return None
+
+        row = source.rows[entity_id]
+        values = {t: column[row] for t, column in source.columns.items()}
+        component = values.pop(component_type)
+        if len(source.signature) == 1:
+            target = None
+        else:
+            target = source.remove_edges.get(component_type)
+            if target is None:
+                target = self._get_archetype(source.signature - {component_type})
+                source.remove_edges[component_type] = target
+        self._move(entity_id, source, target, values)
+        return component
+
+    def component_types(self, entity_id):
+        archetype = self.entity_archetype.get(entity_id)
+        return list(archetype.signature) if archetype else []
+
+    def has_all(self, entity_id, signature):
+        """Checks whether an entity has every component type in a frozenset."""
+        archetype = self.entity_archetype.get(entity_id)
+        return archetype is not None and signature <= archetype.signature
+
+    def matching_archetypes(self, component_types):
+        """Returns the (cached) list of archetypes whose signature contains all the given types."""
+        query_types = frozenset(component_types)
+        matches = self._matching.get(query_types)
+        if matches is None:
+            # Start from the rarest type to keep the initial scan short
+            candidates = min((self.archetypes_by_type.get(t, ()) for t in query_types), key=len)
+            matches = [archetype for archetype in candidates if query_types <= archetype.signature]
+            self._matching[query_types] = matches
+        return matches
+
+    def entities_with(self, component_types):
+        if not component_types: return []
+        entity_ids = []
+        for archetype in self.matching_archetypes(component_types):
+            entity_ids.extend(archetype.entity_ids)
+        return entity_ids
+
+
+STORAGE_BACKENDS = {
+    "sparse": SparseComponentStorage,
+    "archetype": ArchetypeComponentStorage,
+}
+
+def create_storage(mode):
+    """Creates a component storage backend by name ('archetype' or 'sparse')."""
+    try:
+        return STORAGE_BACKENDS[mode]()
+    except KeyError:
+        raise ValueError(f"Unknown component storage mode '{mode}'. Choose from: {', '.join(STORAGE_BACKENDS)}")
@@ -2,17 +2,49 @@
 # Defines all the data components for the ECS.
 
 class Component:
-    """A base class for components. Components hold data."""
-    pass
+    """A base class for components. Components hold data.
+
+    Every component declares __slots__ so instances carry no per-object
+    __dict__; with tens of thousands of entities this is most of their size.
+    """
+    __slots__ = ()
+
+class IntentComponent(Component):
+    """A base class for transient intents (Wants* components).
+
+    Intents are created with World.new_intent and added/removed through
+    World.commands, which recycles them once they have been handled.
+    __init__ must set every slot, since pooled instances are re-initialised.
+    """
+    __slots__ = ()
 
 class PositionComponent(Component):
-    """Stores the (x, y) grid coordinates of an entity."""
+    """Stores the (x, y) grid coordinates of an entity.
+
+    Move entities through World.move_entity/teleport_entity/remove_from_map
+    rather than assigning x and y directly, so position listeners and the
+    spatial index see the change.
+    """
+    __slots__ = ("x", "y")
     def __init__(self, x, y):
         self.x = x
         self.y = y
 
+class GuardedPositionComponent(PositionComponent):
+    """Debug stand-in for PositionComponent that refuses raw writes.
+
+    In position debug mode the World switches every PositionComponent to this
+    class, so code that assigns x/y directly fails at the offending line.
+    """
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Raw write to PositionComponent.{name}; "
+                             "use World.move_entity, teleport_entity or remove_from_map instead")
+
 class RenderableComponent(Component):
     """Stores the visual representation of an entity: a character and its color."""
+    __slots__ = ("char", "color", "open_char", "closed_char")
     def __init__(self, char, color, open_char=None, closed_char=None):
         self.char = char
         self.color = color
@@ -21,25 +53,44 @@ class RenderableComponent(Component):
 
 class PlayerControllableComponent(Component):
     """A tag component to identify the entity controlled by the player."""
-    pass
+    __slots__ = ()
 
-class WantsToMoveComponent(Component):
+class WantsToMoveComponent(IntentComponent):
     """Stores the intended movement direction (dx, dy) for an entity."""
+    __slots__ = ("dx", "dy")
     def __init__(self, dx, dy):
         self.dx = dx
         self.dy = dy
 
 class DescriptionComponent(Component):
     """Stores the descriptive text for an entity."""
+    __slots__ = ("text",)
     def __init__(self, text):
         self.text = text
 
 class CursorComponent(Component):
     """A tag component to identify the look cursor."""
-    pass
+    __slots__ = ()
+
+class CameraComponent(Component):
+    """Makes the view follow this entity.
+
+    x and y are the map cell shown in the top-left corner of the screen;
+    the RenderSystem recenters them on the entity every frame. The view
+    never scrolls past the top or left edge of the map, nor past the right
+    or bottom edge when bounds_width/bounds_height are known.
+    """
+    __slots__ = ("x", "y", "bounds_width", "bounds_height")
+    def __init__(self, bounds_width=None, bounds_height=None):
+        self.x = 0
+        self.y = 0
+        self.bounds_width = bounds_width
+        self.bounds_height = bounds_height
 
 class StatsComponent(Component):
     """Stores the core ability scores of an entity."""
+    __slots__ = ("strength", "intelligence", "wisdom", "dexterity", "constitution", "charisma",
+                 "save_death", "save_wands", "save_paralysis", "save_breath", "save_spells")
     def __init__(self, strength, intelligence, wisdom, dexterity, constitution, charisma, 
                  save_death=16, save_wands=16, save_paralysis=16, save_breath=16, save_spells=16):
         self.strength = strength
@@ -57,6 +108,7 @@ class StatsComponent(Component):
 
 class CombatComponent(Component):
     """Stores combat-related stats for an entity."""
+    __slots__ = ("hp", "max_hp", "ac", "thac0", "xp_value")
     def __init__(self, hp, ac, thac0, max_hp=None, xp_value=0):
         self.hp = hp
         self.max_hp = max_hp if max_hp is not None else hp
@@ -66,50 +118,58 @@ class CombatComponent(Component):
 
 class CanEquipComponent(Component):
     """A tag component for entities that can equip items."""
-    pass
+    __slots__ = ()
 
 class EquippableComponent(Component):
     """A component for items that can be equipped."""
+    __slots__ = ("slot",)
     def __init__(self, slot):
         self.slot = slot # e.g., "weapon", "armor", "amulet"
 
 class EquipmentComponent(Component):
     """A component to track an entity's equipped items."""
+    __slots__ = ("slots",)
     def __init__(self):
         self.slots = {"weapon": None, "armor": None, "amulet": None}
 
 class MaterialComponent(Component):
     """Defines the material an entity is made of."""
+    __slots__ = ("name",)
     def __init__(self, name):
         self.name = name
 
 class ItemComponent(Component):
     """A tag component for items that can be picked up."""
-    pass
+    __slots__ = ()
 
 class FactionComponent(Component):
     """A component to define an entity's faction."""
+    __slots__ = ("name",)
     def __init__(self, name):
         self.name = name
 
 class ContainerComponent(Component):
     """A component for entities that can hold other items."""
+    __slots__ = ("contents",)
     def __init__(self, contents=None):
         self.contents = contents if contents is not None else []
 
 class LockableComponent(Component):
     """A component for entities that can have a lock attached."""
+    __slots__ = ("is_locked", "key_id")
     def __init__(self, is_locked=True, key_id=None):
         self.is_locked = is_locked
         self.key_id = key_id
 
 class KeyComponent(Component):
     """A component for key items."""
+    __slots__ = ("key_id",)
     def __init__(self, key_id=None):
         self.key_id = key_id
 
 class PadlockComponent(Component):
     """A component for lock items."""
+    __slots__ = ("is_locked", "key_id", "attached_to")
     def __init__(self, is_locked=True, key_id=None, attached_to=None):
         self.is_locked = is_locked
         self.key_id = key_id
@@ -117,30 +177,35 @@ class PadlockComponent(Component):
 
 class OpenableComponent(Component):
     """A component for things that can be opened and closed."""
+    __slots__ = ("is_open",)
     def __init__(self, is_open=False):
         self.is_open = is_open
 
 class BlocksMovementComponent(Component):
     """A tag component for entities that block movement."""
-    pass
+    __slots__ = ()
 
 class InventoryComponent(Component):
     """Holds a list of entity IDs that an entity is carrying."""
+    __slots__ = ("items",)
     def __init__(self, items=None):
         self.items = items if items is not None else []
 
-class WantsToPickupItemComponent(Component):
+class WantsToPickupItemComponent(IntentComponent):
     """Intent to pick up an item."""
+    __slots__ = ("item_id",)
     def __init__(self, item_id):
         self.item_id = item_id
 
-class WantsToOpenComponent(Component):
+class WantsToOpenComponent(IntentComponent):
     """Intent to open a container or door."""
+    __slots__ = ("target_id",)
     def __init__(self, target_id):
         self.target_id = target_id
 
-class WantsToAttackComponent(Component):
+class WantsToAttackComponent(IntentComponent):
     """Intent to attack another entity."""
+    __slots__ = ("target_id",)
     def __init__(self, target_id):
         self.target_id = target_id
 
@@ -148,38 +213,49 @@ class WantsToAttackComponent(Component):
 
 class AbilitiesComponent(Component):
     """Stores a list of ability IDs that an entity possesses."""
+    __slots__ = ("abilities",)
     def __init__(self, abilities=None):
         self.abilities = abilities if abilities is not None else []
 
+class StatusEffect:
+    """One active status effect on an entity.
+
+    effects_data is shared with the status effect definition loaded from
+    status_effects.json, not copied, and must be treated as read-only.
+    """
+    __slots__ = ("id", "name", "type", "effects_data", "turns_remaining")
+    def __init__(self, id, name, type, effects_data, turns_remaining):
+        self.id = id
+        self.name = name
+        self.type = type  # "temporary" or "permanent"
+        self.effects_data = effects_data
+        self.turns_remaining = turns_remaining
+
 class StatusEffectsComponent(Component):
     """Stores active status effects on an entity."""
+    __slots__ = ("effects",)
     def __init__(self, effects=None):
-        self.effects = effects if effects is not None else []
-        # Each effect is a dict with: id, name, duration, type, effects_data, turns_remaining
+        self.effects = effects if effects is not None else []  # list of StatusEffect
 
 class StateComponent(Component):
-    """Stores state flags and temporary modifiers for an entity."""
+    """Stores state flags and temporary modifiers for an entity.
+
+    The boolean state flags are packed into the single integer `flags`; each
+    flag name in FLAGS is still readable and writable as a normal attribute
+    (state.dead = True), and FLAG_BITS gives the bit for mask tests.
+    """
+    FLAGS = (
+        "dead", "paralyzed", "blinded", "charmed", "confused", "deafened",
+        "fascinated", "feebleminded", "petrified", "slowed", "stunned",
+        "unconscious", "cursed_stat_reduction", "mummy_rot", "diseased",
+        "lethally_poisoned", "sickened", "possessed", "swallowed_whole",
+    )
+    FLAG_BITS = {name: 1 << bit for bit, name in enumerate(FLAGS)}
+    __slots__ = ("flags", "energy_drained", "thac0_modifier", "ac_modifier", "damage_modifier", "save_penalty")
+
     def __init__(self):
-        # State flags
-        self.dead = False
-        self.paralyzed = False
-        self.blinded = False
-        self.charmed = False
-        self.confused = False
-        self.deafened = False
-        self.fascinated = False
-        self.feebleminded = False
-        self.petrified = False
-        self.slowed = False
-        self.stunned = False
-        self.unconscious = False
-        self.cursed_stat_reduction = False
-        self.mummy_rot = False
-        self.diseased = False
-        self.lethally_poisoned = False
-        self.sickened = False
-        self.possessed = False
-        self.swallowed_whole = False
+        # State flags, all initially False
+        self.flags = 0
         
         # Numerical modifiers
         self.energy_drained = 0  # Energy drain levels
@@ -190,21 +266,37 @@ class StateComponent(Component):
         self.damage_modifier = 0
         self.save_penalty = 0
 
-class WantsToApplyStatusComponent(Component):
+def _state_flag(bit):
+    def get_flag(self):
+        return bool(self.flags & bit)
+    def set_flag(self, value):
+        if value:
+            self.flags |= bit
+        else:
+            self.flags &= ~bit
+    return property(get_flag, set_flag)
+
+for _name, _bit in StateComponent.FLAG_BITS.items():
+    setattr(StateComponent, _name, _state_flag(_bit))
+
+class WantsToApplyStatusComponent(IntentComponent):
     """Intent to apply a status effect to an entity."""
+    __slots__ = ("status_effect_data", "source_entity_id")
     def __init__(self, status_effect_data, source_entity_id=None):
         self.status_effect_data = status_effect_data
         self.source_entity_id = source_entity_id
 
-class WantsToTriggerAbilityComponent(Component):
+class WantsToTriggerAbilityComponent(IntentComponent):
     """Intent to trigger an ability."""
+    __slots__ = ("ability_id", "target_id", "trigger_type")
     def __init__(self, ability_id, target_id=None, trigger_type="on_attack"):
         self.ability_id = ability_id
         self.target_id = target_id
         self.trigger_type = trigger_type
 
-class WantsToMakeSavingThrowComponent(Component):
+class WantsToMakeSavingThrowComponent(IntentComponent):
     """Intent for an entity to make a saving throw against an effect."""
+    __slots__ = ("save_type", "dc", "effect_data", "source_entity_id")
     def __init__(self, save_type, dc, effect_data, source_entity_id):
         self.save_type = save_type
         self.dc = dc
@@ -213,18 +305,20 @@ class WantsToMakeSavingThrowComponent(Component):
 
 class DeadComponent(Component):
     """A tag component for dead entities, to prevent them from being targeted."""
-    pass
+    __slots__ = ()
 
 class ExperienceComponent(Component):
     """Stores experience and level information for an entity."""
+    __slots__ = ("current_xp", "level", "xp_to_next_level")
     def __init__(self, current_xp=0, level=1):
         self.current_xp = current_xp
         self.level = level
         self.xp_to_next_level = 0  # Will be set by character creation/leveling system
 
 # Phase 1 Addition: New component for ability usage
-class WantsToUseAbilityComponent(Component):
+class WantsToUseAbilityComponent(IntentComponent):
     """Intent to use an ability with optional targeting."""
+    __slots__ = ("ability_id", "target_id", "target_position")
     def __init__(self, ability_id, target_id=None, target_position=None):
         self.ability_id = ability_id
         self.target_id = target_id
@@ -233,11 +327,13 @@ class WantsToUseAbilityComponent(Component):
 # Phase 3 Additions: Character creation and progression components
 class ClassComponent(Component):
     """Tracks the character's class."""
+    __slots__ = ("class_name",)
     def __init__(self, class_name):
         self.class_name = class_name
 
 class SpellSlotsComponent(Component):
     """Tracks spell slots for spellcasting characters."""
+    __slots__ = ("slots", "slots_used")
     def __init__(self):
         self.slots = {}  # {spell_level: max_slots}
         self.slots_used = {}  # {spell_level: used_slots}
@@ -4,17 +4,48 @@
 import pygame
 import random
 from components import *
+from event_queues import MoveEvent, PickupEvent, OpenEvent, AttackEvent
 
 class System:
-    """A base class for systems. Systems contain logic that operates on entities with specific components."""
+    """A base class for systems. Systems contain logic that operates on entities with specific components.
+
+    Intents are added and removed through world.commands; the World applies
+    them after the system's update returns.
+
+    The class attributes below tell the Scheduler when the system has work.
+    A system that declares no reads at all runs every frame of its states.
+    """
+    run_states = None  # Game states the system runs in; None means all of them
+    reads = ()  # Component types: run while any entity has one of them
+    reads_events = ()  # Event types: run while any of them is pending
+    reads_input = False  # Run when the frame has input events
+    scheduled = True  # False: World.update never runs it; its owner calls update itself
+
     def __init__(self, world):
         self.world = world
 
+    def has_work(self, events=()):
+        """Returns True if the system has something to do this frame."""
+        if not (self.reads or self.reads_events or self.reads_input):
+            return True
+        if self.reads_input and events:
+            return True
+        for event_type in self.reads_events:
+            if self.world.events.pending(event_type):
+                return True
+        for component_type in self.reads:
+            if self.world.get_entities_with_components(component_type):
+                return True
+        return False
+
     def update(self, *args, **kwargs):
         pass
 
 class InputSystem(System):
     """Handles player input and translates it into intents."""
+    run_states = ('PLAYER_TURN',)
+    reads_input = True
+
     def update(self, *args, **kwargs):
         events = kwargs.get('events', [])
         game_state = kwargs.get('game_state')
@@ -61,7 +92,7 @@ class InputSystem(System):
                             # Confused movement is random
                             if random.random() < 0.5:  # 50% chance to move in random direction
                                 dx, dy = random.choice([(0, 1), (0, -1), (1, 0), (-1, 0)])
-                                self.world.add_component(player_id, WantsToMoveComponent(dx, dy))
+                                self.world.send_intent(MoveEvent, player_id, dx, dy)
                                 game_state.player_acted = True
                                 game_state.add_message("You stumble around confused!")
                                 return
@@ -96,7 +127,7 @@ class InputSystem(System):
         
         if effect_type == "apply_status_aoe":
             # AOE abilities don't need targeting, apply immediately
-            self.world.add_component(player_id, WantsToUseAbilityComponent(
+            self.world.commands.add_component(player_id, self.world.new_intent(WantsToUseAbilityComponent,
                 ability_id=ability_id,
                 target_id=player_id
             ))
@@ -111,7 +142,7 @@ class InputSystem(System):
         
         else:
             # Self-target or immediate effect
-            self.world.add_component(player_id, WantsToUseAbilityComponent(
+            self.world.commands.add_component(player_id, self.world.new_intent(WantsToUseAbilityComponent,
                 ability_id=ability_id,
                 target_id=player_id
             ))
@@ -132,7 +163,7 @@ class InputSystem(System):
             elif event.key == pygame.K_LEFT: dx = -1
             elif event.key == pygame.K_RIGHT: dx = 1
             
-            self.world.add_component(cursor_id, WantsToMoveComponent(dx, dy))
+            self.world.send_intent(MoveEvent, cursor_id, dx, dy)
             
         elif event.key == pygame.K_RETURN or event.key == pygame.K_SPACE:
             # Confirm target
@@ -145,7 +176,7 @@ class InputSystem(System):
                 player_id = player_entities[0]
                 
                 # Create ability use intent with target
-                self.world.add_component(player_id, WantsToUseAbilityComponent(
+                self.world.commands.add_component(player_id, self.world.new_intent(WantsToUseAbilityComponent,
                     ability_id=game_state.targeting_ability_id,
                     target_id=target_id,
                     target_position=(cursor_pos.x, cursor_pos.y)
@@ -167,7 +198,7 @@ class InputSystem(System):
         elif event.key == pygame.K_RIGHT: dx = 1
 
         if dx != 0 or dy != 0:
-            self.world.add_component(player_id, WantsToMoveComponent(dx, dy))
+            self.world.send_intent(MoveEvent, player_id, dx, dy)
             game_state.player_acted = True  # Movement ends turn
 
     def handle_look_input(self, event, game_state):
@@ -181,130 +212,142 @@ class InputSystem(System):
         elif event.key == pygame.K_RIGHT: dx = 1
 
         if dx != 0 or dy != 0:
-            self.world.add_component(cursor_id, WantsToMoveComponent(dx, dy))
+            self.world.send_intent(MoveEvent, cursor_id, dx, dy)
 
     def handle_pickup(self, player_id, game_state):
         player_pos = self.world.get_component(player_id, PositionComponent)
         item_id = self.world.get_item_at_position(player_pos.x, player_pos.y)
         if item_id and self.world.get_component(item_id, ItemComponent):
-            self.world.add_component(player_id, WantsToPickupItemComponent(item_id))
+            self.world.send_intent(PickupEvent, player_id, item_id)
             game_state.player_acted = True  # Pickup ends turn
 
 class MovementSystem(System):
     """Processes movement requests, handling collisions and interactions."""
+    reads = (WantsToMoveComponent,)
+    reads_events = (MoveEvent,)
+
     def update(self, *args, **kwargs):
         game_state = kwargs.get('game_state')
-        entities_to_move = self.world.get_entities_with_components(PositionComponent, WantsToMoveComponent)
 
-        for entity_id in entities_to_move:
-            pos = self.world.get_component(entity_id, PositionComponent)
+        for event in self.world.events.drain(MoveEvent):
+            self.move(event.entity_id, event.dx, event.dy, game_state)
+
+        # Compatibility path: intents sent as components
+        for entity_id in self.world.get_entities_with_components(PositionComponent, WantsToMoveComponent):
             movement = self.world.get_component(entity_id, WantsToMoveComponent)
+            self.move(entity_id, movement.dx, movement.dy, game_state)
+            self.world.commands.remove_component(entity_id, WantsToMoveComponent)
 
-            target_x = pos.x + movement.dx
-            target_y = pos.y + movement.dy
+    def move(self, entity_id, dx, dy, game_state):
+        """Moves an entity by (dx, dy), or turns the move into an attack or open intent."""
+        pos = self.world.get_component(entity_id, PositionComponent)
+        if pos is None:
+            return
 
-            # If the moving entity is the cursor, it's not bound by collisions
-            # and can move freely around the map.
-            if self.world.get_component(entity_id, CursorComponent):
-                # In targeting mode, constrain cursor movement by range
-                if hasattr(game_state, 'targeting_mode') and game_state.targeting_mode:
-                    player_entities = self.world.get_entities_with_components(PlayerControllableComponent)
-                    if player_entities:
-                        player_pos = self.world.get_component(player_entities[0], PositionComponent)
-                        distance = max(abs(target_x - player_pos.x), abs(target_y - player_pos.y))
-                        if distance <= game_state.targeting_range:
-                            pos.x = target_x
-                            pos.y = target_y
-                else:
-                    pos.x = target_x
-                    pos.y = target_y
-                self.world.remove_component(entity_id, WantsToMoveComponent)
-                continue
-
-            target_id = self.world.get_entity_at_position(target_x, target_y)
-
-            # Check if this is a player trying to move into a monster (bump-to-attack)
-            if (self.world.get_component(entity_id, PlayerControllableComponent) and 
-                target_id):
-                
-                target_faction = self.world.get_component(target_id, FactionComponent)
-                target_state = self.world.get_component(target_id, StateComponent)
-                
-                # Don't attack dead entities
-                if target_state and target_state.dead:
-                    pass  # Continue with normal movement logic
-                elif target_faction and target_faction.name == "monsters":
-                    # Create attack intent instead of trying to open
-                    self.world.add_component(entity_id, WantsToAttackComponent(target_id))
-                    self.world.remove_component(entity_id, WantsToMoveComponent)
-                    continue
-                elif self.world.get_component(target_id, BlocksMovementComponent):
-                    # If it's not a monster but blocks movement, try to open it
-                    self.world.add_component(entity_id, WantsToOpenComponent(target_id))
-                    self.world.remove_component(entity_id, WantsToMoveComponent)
-                    continue
-            elif target_id and self.world.get_component(target_id, BlocksMovementComponent):
-                # If it's the player bumping into something, create an "open" intent
-                if self.world.get_component(entity_id, PlayerControllableComponent):
-                    self.world.add_component(entity_id, WantsToOpenComponent(target_id))
+        target_x = pos.x + dx
+        target_y = pos.y + dy
+
+        # If the moving entity is the cursor, it's not bound by collisions
+        # and can move freely around the map.
+        if self.world.get_component(entity_id, CursorComponent):
+            # In targeting mode, constrain cursor movement by range
+            if hasattr(game_state, 'targeting_mode') and game_state.targeting_mode:
+                player_entities = self.world.get_entities_with_components(PlayerControllableComponent)
+                if player_entities:
+                    player_pos = self.world.get_component(player_entities[0], PositionComponent)
+                    distance = max(abs(target_x - player_pos.x), abs(target_y - player_pos.y))
+                    if distance <= game_state.targeting_range:
+                        self.world.teleport_entity(entity_id, target_x, target_y)
             else:
-                # Move the entity
-                
-                # Check if the moving entity is a monster, and if the target is the player
-                moving_faction = self.world.get_component(entity_id, FactionComponent)
-                target_faction = self.world.get_component(target_id, FactionComponent) if target_id else None
-                
-                if (moving_faction and moving_faction.name == "monsters" and
-                    target_faction and target_faction.name == "player"):
-                    # Monster can't move through the player, so skip this move.
-                    pass
-                else:
-                    # Either the player is moving (and can move through monsters), or it's a 
-                    # monster moving to an empty space or another monster (which is allowed now).
-                    pos.x = target_x
-                    pos.y = target_y
+                self.world.teleport_entity(entity_id, target_x, target_y)
+            return
+
+        target_id = self.world.get_entity_at_position(target_x, target_y)
+
+        # Check if this is a player trying to move into a monster (bump-to-attack)
+        if (self.world.get_component(entity_id, PlayerControllableComponent) and 
+            target_id):
             
-            # In either case (move or blocked), we remove the movement intent
-            # because the movement has been handled in this turn.
-            self.world.remove_component(entity_id, WantsToMoveComponent)
+            target_faction = self.world.get_component(target_id, FactionComponent)
+            target_state = self.world.get_component(target_id, StateComponent)
+            
+            # Don't attack dead entities
+            if target_state and target_state.dead:
+                pass  # Continue with normal movement logic
+            elif target_faction and target_faction.name == "monsters":
+                # Create attack intent instead of trying to open
+                self.world.send_intent(AttackEvent, entity_id, target_id)
+                return
+            elif self.world.get_component(target_id, BlocksMovementComponent):
+                # If it's not a monster but blocks movement, try to open it
+                self.world.send_intent(OpenEvent, entity_id, target_id)
+                return
+        elif target_id and self.world.get_component(target_id, BlocksMovementComponent):
+            # If it's the player bumping into something, create an "open" intent
+            if self.world.get_component(entity_id, PlayerControllableComponent):
+                self.world.send_intent(OpenEvent, entity_id, target_id)
+        else:
+            # Move the entity
+            
+            # Check if the moving entity is a monster, and if the target is the player
+            moving_faction = self.world.get_component(entity_id, FactionComponent)
+            target_faction = self.world.get_component(target_id, FactionComponent) if target_id else None
+            
+            if (moving_faction and moving_faction.name == "monsters" and
+                target_faction and target_faction.name == "player"):
+                # Monster can't move through the player, so skip this move.
+                pass
+            else:
+                # Either the player is moving (and can move through monsters), or it's a 
+                # monster moving to an empty space or another monster (which is allowed now).
+                self.world.move_entity(entity_id, dx, dy)
+
 
 class ActionSystem(System):
     """Processes complex actions like picking up items and unlocking things."""
+    reads = (WantsToPickupItemComponent, WantsToOpenComponent)
+    reads_events = (PickupEvent, OpenEvent)
+
     def update(self, *args, **kwargs):
         game_state = kwargs.get('game_state')
 
         # Process pickup intents
+        for event in self.world.events.drain(PickupEvent):
+            self.pick_up(event.entity_id, event.item_id, game_state)
         for entity_id in self.world.get_entities_with_components(WantsToPickupItemComponent, InventoryComponent):
-            pickup_intent = self.world.get_component(entity_id, WantsToPickupItemComponent)
-            inventory = self.world.get_component(entity_id, InventoryComponent)
-
-            item_id = pickup_intent.item_id
-            item_pos = self.world.get_component(item_id, PositionComponent)
-
-            # Remove item from the map by moving it off-screen
-            item_pos.x, item_pos.y = -1, -1
-            inventory.items.append(item_id)
-
-            item_desc = self.world.get_component(item_id, DescriptionComponent)
-            if item_desc:
-                game_state.add_message(f"You pick up the {item_desc.text}.")
-
-            self.world.remove_component(entity_id, WantsToPickupItemComponent)
+            self.pick_up(entity_id, self.world.get_component(entity_id, WantsToPickupItemComponent).item_id, game_state)
+            self.world.commands.remove_component(entity_id, WantsToPickupItemComponent)
 
         # Process open intents
+        for event in self.world.events.drain(OpenEvent):
+            self.open(event.entity_id, event.target_id, game_state)
         for entity_id in self.world.get_entities_with_components(WantsToOpenComponent):
-            open_intent = self.world.get_component(entity_id, WantsToOpenComponent)
-            target_id = open_intent.target_id
+            self.open(entity_id, self.world.get_component(entity_id, WantsToOpenComponent).target_id, game_state)
+            self.world.commands.remove_component(entity_id, WantsToOpenComponent)
 
-            lockable = self.world.get_component(target_id, LockableComponent)
-            openable = self.world.get_component(target_id, OpenableComponent)
+    def pick_up(self, entity_id, item_id, game_state):
+        """Moves an item from the map into an entity's inventory."""
+        inventory = self.world.get_component(entity_id, InventoryComponent)
+        if not inventory or not self.world.is_alive(item_id):
+            return
 
-            if lockable and lockable.is_locked:
-                self.try_unlock(entity_id, target_id, lockable, game_state)
-            elif openable:
-                self.open_target(target_id, openable, game_state)
+        # Remove item from the map
+        self.world.remove_from_map(item_id)
+        inventory.items.append(item_id)
+
+        item_desc = self.world.get_component(item_id, DescriptionComponent)
+        if item_desc:
+            game_state.add_message(f"You pick up the {item_desc.text}.")
+
+    def open(self, entity_id, target_id, game_state):
+        """Unlocks or opens a target."""
+        lockable = self.world.get_component(target_id, LockableComponent)
+        openable = self.world.get_component(target_id, OpenableComponent)
 
-            self.world.remove_component(entity_id, WantsToOpenComponent)
+        if lockable and lockable.is_locked:
+            self.try_unlock(entity_id, target_id, lockable, game_state)
+        elif openable:
+            self.open_target(target_id, openable, game_state)
 
     def try_unlock(self, actor_id, target_id, lockable, game_state):
         """Logic for an actor trying to unlock a target."""
@@ -313,6 +356,8 @@ class ActionSystem(System):
 
         has_key = False
         for item_id in inventory.items:
+            if not self.world.is_alive(item_id):
+                continue  # Stale handle to a destroyed item
             key = self.world.get_component(item_id, KeyComponent)
             if key and key.key_id == lockable.key_id:
                 has_key = True
@@ -0,0 +1,63 @@
+# corpse_system.py
+# Compacts dead creatures into lightweight corpse entities
+
+from components import *
+from core_systems import System
+
+class CorpseSystem(System):
+    """Strips dead creatures down to what a corpse needs to be seen and looked at.
+
+    CombatSystem.handle_death only marks a creature dead; it keeps its combat,
+    faction, AI and status components, so every AOE and AI pass keeps finding
+    and filtering it. This system removes everything except the components in
+    keep_components, taking the corpse out of those queries for good.
+    """
+    DEFAULT_KEEP = (PositionComponent, RenderableComponent, DescriptionComponent, DeadComponent)
+
+    def __init__(self, world, enabled=True, delay_turns=0, drop_inventory=True, keep_components=DEFAULT_KEEP):
+        super().__init__(world)
+        self.enabled = enabled
+        self.delay_turns = delay_turns  # Monster turns a body stays intact before it is compacted
+        self.drop_inventory = drop_inventory  # Leave carried items on the corpse's tile
+        self.keep_components = frozenset(keep_components)
+        # Dead but not yet compacted: compacted corpses no longer have a CombatComponent
+        self.pending_query = world.register_query(DeadComponent, CombatComponent)
+        self.turns_dead = {}  # entity_id -> monster turns since death
+        self.compacted = 0
+
+    def has_work(self, events=()):
+        return self.enabled and len(self.pending_query) > 0
+
+    def update(self, *args, **kwargs):
+        if not self.enabled:
+            return
+        game_state = kwargs.get('game_state')
+        new_turn = game_state is not None and game_state.game_state == 'MONSTER_TURN'
+
+        for entity_id in self.pending_query.entities():
+            # The player's body stays intact for the game over screen
+            if self.world.get_component(entity_id, PlayerControllableComponent):
+                continue
+            turns = self.turns_dead.get(entity_id, 0)
+            if turns < self.delay_turns:
+                if new_turn:
+                    self.turns_dead[entity_id] = turns + 1
+                continue
+            self.compact(entity_id)
+
+    def compact(self, entity_id):
+        """Turns a dead creature into a corpse entity."""
+        self.turns_dead.pop(entity_id, None)
+
+        if self.drop_inventory:
+            inventory = self.world.get_component(entity_id, InventoryComponent)
+            pos = self.world.get_component(entity_id, PositionComponent)
+            if inventory and pos:
+                for item_id in inventory.items:
+                    if self.world.is_alive(item_id):
+                        self.world.teleport_entity(item_id, pos.x, pos.y)
+
+        for component_type in self.world.get_component_types(entity_id):
+            if component_type not in self.keep_components:
+                self.world.remove_component(entity_id, component_type)
+        self.compacted += 1
@@ -0,0 +1,157 @@
+# event_queues.py
+# Typed, array-backed event queues for one-shot intents passed between systems.
+
+from components import (WantsToMoveComponent, WantsToPickupItemComponent, WantsToOpenComponent,
+                        WantsToAttackComponent, WantsToMakeSavingThrowComponent,
+                        WantsToApplyStatusComponent)
+
+class Event:
+    """A base class for events. Events are reused by their queue, so consumers
+    must copy out anything they want to keep past the current tick.
+
+    INTENT is the Wants* component carrying the same request on the
+    component path; its __init__ takes the event's fields after entity_id.
+    """
+    __slots__ = ("entity_id",)
+    INTENT = None
+
+class MoveEvent(Event):
+    """An entity wants to move by (dx, dy)."""
+    __slots__ = ("dx", "dy")
+    INTENT = WantsToMoveComponent
+    def __init__(self, entity_id, dx, dy):
+        self.entity_id = entity_id
+        self.dx = dx
+        self.dy = dy
+
+class PickupEvent(Event):
+    """An entity wants to pick up an item."""
+    __slots__ = ("item_id",)
+    INTENT = WantsToPickupItemComponent
+    def __init__(self, entity_id, item_id):
+        self.entity_id = entity_id
+        self.item_id = item_id
+
+class OpenEvent(Event):
+    """An entity wants to open (or unlock) a container or door."""
+    __slots__ = ("target_id",)
+    INTENT = WantsToOpenComponent
+    def __init__(self, entity_id, target_id):
+        self.entity_id = entity_id
+        self.target_id = target_id
+
+class AttackEvent(Event):
+    """An entity wants to attack another entity."""
+    __slots__ = ("target_id",)
+    INTENT = WantsToAttackComponent
+    def __init__(self, entity_id, target_id):
+        self.entity_id = entity_id
+        self.target_id = target_id
+
+class SavingThrowEvent(Event):
+    """An entity has to make a saving throw against an effect."""
+    __slots__ = ("save_type", "dc", "effect_data", "source_entity_id")
+    INTENT = WantsToMakeSavingThrowComponent
+    def __init__(self, entity_id, save_type, dc, effect_data, source_entity_id):
+        self.entity_id = entity_id
+        self.save_type = save_type
+        self.dc = dc
+        self.effect_data = effect_data
+        self.source_entity_id = source_entity_id
+
+class ApplyStatusEvent(Event):
+    """A status effect is to be applied to an entity."""
+    __slots__ = ("status_effect_data", "source_entity_id")
+    INTENT = WantsToApplyStatusComponent
+    def __init__(self, entity_id, status_effect_data, source_entity_id=None):
+        self.entity_id = entity_id
+        self.status_effect_data = status_effect_data
+        self.source_entity_id = source_entity_id
+
+class EventQueue:
+    """Pending events of one type, stored in reusable arrays.
+
+    Publishing fills the next preallocated event in place instead of
+    allocating; the consumer takes all pending events at once with drain(),
+    which empties the queue. Two buffers alternate so events handed out by
+    drain() stay intact while the consumer publishes new ones.
+    """
+    def __init__(self, event_type):
+        self.event_type = event_type
+        self._buffers = ([], [])
+        self._active = 0
+        self.count = 0
+
+        # Counters
+        self.published = 0
+        self.allocated = 0
+        self.drains = 0
+
+    def __len__(self):
+        return self.count
+
+    def publish(self, *args, **kwargs):
+        buffer = self._buffers[self._active]
+        if self.count < len(buffer):
+            event = buffer[self.count]
+            event.__init__(*args, **kwargs)
+        else:
+            event = self.event_type(*args, **kwargs)
+            buffer.append(event)
+            self.allocated += 1
+        self.count += 1
+        self.published += 1
+        return event
+
+    def drain(self):
+        """Returns the pending events, oldest first, and empties the queue."""
+        if not self.count:
+            return ()
+        events = self._buffers[self._active][:self.count]
+        self._active ^= 1
+        self.count = 0
+        self.drains += 1
+        return events
+
+    def clear(self):
+        self.count = 0
+
+    def stats(self):
+        return {
+            "event": self.event_type.__name__,
+            "pending": self.count,
+            "published": self.published,
+            "allocated": self.allocated,
+            "drains": self.drains,
+        }
+
+class EventBus:
+    """One EventQueue per event type, created on first use."""
+    def __init__(self):
+        self.queues = {}  # event type -> EventQueue
+
+    def queue(self, event_type):
+        queue = self.queues.get(event_type)
+        if queue is None:
+            queue = self.queues[event_type] = EventQueue(event_type)
+        return queue
+
+    def publish(self, event_type, *args, **kwargs):
+        return self.queue(event_type).publish(*args, **kwargs)
+
+    def drain(self, event_type):
+        """Returns and clears the pending events of one type."""
+        queue = self.queues.get(event_type)
+        return queue.drain() if queue is not None else ()
+
+    def pending(self, event_type):
+        queue = self.queues.get(event_type)
+        return queue.count if queue is not None else 0
+
+    def clear(self):
+        """Drops every pending event, e.g. when the game state is reset."""
+        for queue in self.queues.values():
+            queue.clear()
+
+    def stats(self):
+        return [queue.stats() for queue in self.queues.values()]
@@ -0,0 +1,102 @@
+# glyph_atlas.py
+# Map glyphs pre-rendered into a single surface for batched drawing.
+
+import pygame
+
+class GlyphAtlas:
+    """Every (char, color) the map layer draws, rendered once into one surface.
+
+    Drawing the map is then a single Surface.blits call with (atlas surface,
+    destination, area) entries instead of a font.render and blit per tile.
+    Glyphs that weren't known at startup are added on first use while there
+    is spare room; after that area() returns None and the caller falls back
+    to rendering the glyph itself.
+    """
+    def __init__(self, font, glyphs, columns=32, spare=128):
+        self.font = font
+        self.columns = columns
+        self.areas = {}  # (char, color) -> Rect of the glyph in self.surface
+
+        rendered = {}
+        for char, color in glyphs:
+            key = (char, tuple(color))
+            if key not in rendered:
+                rendered[key] = font.render(char, True, key[1])
+        self.cell_width = max([glyph.get_width() for glyph in rendered.values()] + [font.size('@')[0]])
+        self.cell_height = max([glyph.get_height() for glyph in rendered.values()] + [font.get_linesize()])
+
+        self.capacity = len(rendered) + spare
+        rows = -(-self.capacity // columns)
+        self.surface = pygame.Surface((columns * self.cell_width, rows * self.cell_height), pygame.SRCALPHA)
+        for key, glyph in rendered.items():
+            self._place(key, glyph)
+
+        # Counters
+        self.added = 0  # glyphs added after startup
+        self.overflows = 0  # lookups that found no room left
+
+    def __len__(self):
+        return len(self.areas)
+
+    def _place(self, key, glyph):
+        index = len(self.areas)
+        if index >= self.capacity:
+            return None
+        x = (index % self.columns) * self.cell_width
+        y = (index // self.columns) * self.cell_height
+        # MAX onto the transparent atlas copies the glyph's pixels and alpha unchanged
+        self.surface.blit(glyph, (x, y), special_flags=pygame.BLEND_RGBA_MAX)
+        area = pygame.Rect(x, y, glyph.get_width(), glyph.get_height())
+        self.areas[key] = area
+        return area
+
+    def area(self, char, color):
+        """Returns the glyph's Rect in self.surface, or None if the atlas is full."""
+        key = (char, color)
+        area = self.areas.get(key)
+        if area is not None:
+            return area
+        if type(color) is not tuple:
+            return self.area(char, tuple(color))
+        area = self._place(key, self.font.render(char, True, color))
+        if area is None:
+            self.overflows += 1
+        else:
+            self.added += 1
+        return area
+
+def collect_glyphs(definitions, named_colors, extra_colors=(), extra_glyphs=()):
+    """Returns the (char, color) pairs used by RenderableComponents in entity definitions.
+
+    definitions are loaded JSON documents (archetypes, creatures, items);
+    any RenderableComponent found in them is used, with string colors
+    looked up in named_colors. Each char is also paired with every color in
+    extra_colors (e.g. status effect tints).
+    """
+    glyphs = list(extra_glyphs)
+    chars = set(char for char, _ in extra_glyphs)
+
+    def visit(node):
+        if isinstance(node, dict):
+            renderable = node.get("RenderableComponent")
+            if isinstance(renderable, dict):
+                color = renderable.get("color", named_colors["WHITE"])
+                if isinstance(color, str):
+                    color = named_colors.get(color.upper(), named_colors["WHITE"])
+                for field in ("char", "open_char", "closed_char"):
+                    char = renderable.get(field)
+                    if char:
+                        glyphs.append((char, tuple(color)))
+                        chars.add(char)
+            for value in node.values():
+                visit(value)
+        elif isinstance(node, list):
+            for value in node:
+                visit(value)
+
+    for definition in definitions:
+        visit(definition)
+    for char in chars:
+        for color in extra_colors:
+            glyphs.append((char, tuple(color)))
+    return glyphs
@@ -0,0 +1,59 @@
+# glyph_cache.py
+# An LRU cache of rendered text surfaces.
+
+from collections import OrderedDict
+
+class GlyphCache:
+    """Caches font.render results keyed by (text, color, font).
+
+    Rasterizing text is the most expensive part of drawing a frame, and
+    nearly every string drawn (map glyphs, HP lines, menu entries) is the
+    same from one frame to the next. The cache holds at most max_entries
+    surfaces and evicts the least recently used one when full. Returned
+    surfaces are shared and must not be drawn on.
+    """
+    def __init__(self, max_entries=2048):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()  # (text, color, font, antialias) -> Surface
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.surfaces)
+
+    def render(self, font, text, color, antialias=True):
+        """Returns font.render(text, antialias, color), rendering it only on a cache miss."""
+        if type(color) is not tuple:
+            color = tuple(color)  # Lists (from JSON) and pygame.Color aren't usable as keys
+        key = (text, color, font, antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+    def stats(self):
+        """Returns the cache's counters and hit rate as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.surfaces),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -168,6 +168,7 @@ class LevelingSystem(System):
 
 class SpellSlotsComponent(Component):
     """Tracks spell slots for spellcasting characters."""
+    __slots__ = ("slots", "slots_used")
     def __init__(self):
         self.slots = {}  # {spell_level: max_slots}
         self.slots_used = {}  # {spell_level: used_slots}
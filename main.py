@@ -7,66 +7,246 @@ import os
 import json
 import copy
 import random
+from collections import deque
 import components
 import factory # Make sure factory is imported
 from core_systems import InputSystem, MovementSystem, ActionSystem
-from combat_systems import SavingThrowSystem, AbilitySystem, CombatSystem
+from combat_systems import SavingThrowSystem, AbilitySystem, CombatSystem, CORPSE_GLYPH
 from status_systems import StatusEffectSystem
 from ai_system import AISystem  # Import the AISystem
+from corpse_system import CorpseSystem
 from render_system import RenderSystem
+from glyph_atlas import GlyphAtlas, collect_glyphs
+from terrain import load_terrain
+from message_log import MessageLog
+from biomes import BIOMES
+from component_storage import create_storage
+from command_buffer import CommandBuffer, ComponentPool
+from event_queues import EventBus
+from queries import Query
+from spatial_index import SpatialIndex
+from scheduler import Scheduler
 
 # --- Core ECS Classes ---
 class Entity:
-    """A container for components. It's just an ID."""
-    def __init__(self):
-        if not hasattr(Entity, "next_id"):
-            Entity.next_id = 0
-        self.id = Entity.next_id
-        Entity.next_id += 1
+    """A handle to an entity. It's just an ID.
+
+    The ID packs a slot index (low INDEX_BITS bits) and a generation counter.
+    Slots are recycled when entities are destroyed and the generation is
+    bumped, so an old ID held somewhere (a target, an inventory entry) never
+    refers to the new occupant of its slot.
+    """
+    __slots__ = ("id",)
+    INDEX_BITS = 24
+    INDEX_MASK = (1 << INDEX_BITS) - 1
+
+    def __init__(self, entity_id):
+        self.id = entity_id
+
+    @staticmethod
+    def index_of(entity_id):
+        return entity_id & Entity.INDEX_MASK
+
+    @staticmethod
+    def generation_of(entity_id):
+        return entity_id >> Entity.INDEX_BITS
 
 # --- Game World ---
 class World:
     """The central hub of the ECS."""
-    def __init__(self):
-        self.entities = {}
-        self.components = {}
+    OFF_MAP = (-1, -1)  # Position used for entities that exist but aren't on the map (e.g. carried items)
+
+    def __init__(self, storage_mode="archetype", debug_positions=False, use_event_queues=True):
+        self.entities = set()  # IDs of live entities
+        self._generations = []  # slot index -> generation of its current (or next) occupant
+        self._free_slots = deque()  # slot indices of destroyed entities, reused oldest first
+        self.storage = create_storage(storage_mode)  # 'archetype' (tables) or 'sparse' (dict per type)
+        self.queries = {}  # frozenset of component types -> Query
+        self.queries_by_type = {}  # component type -> Queries that include it
+        self._query_lookup = {}  # component type tuple, as passed by callers -> Query
+        self.spatial_index = SpatialIndex(self)
+        self.position_listeners = []  # callables(entity_id, old_pos, new_pos); positions are (x, y) or None
+        self.debug_positions = debug_positions  # Raise on raw writes to PositionComponent.x/y
+        self.commands = CommandBuffer()  # Deferred changes, applied between systems
+        self.intent_pool = ComponentPool()
+        self.events = EventBus()  # Typed queues for one-shot intents
+        self.use_event_queues = use_event_queues  # False: send intents as Wants* components instead
         self.systems = []
+        self.scheduler = Scheduler(self)
         self.archetypes = {}
         self.materials = {}
         self.abilities = {}
         self.status_effects = {}
 
     def create_entity(self):
-        entity = Entity()
-        self.entities[entity.id] = entity
+        if self._free_slots:
+            index = self._free_slots.popleft()
+        else:
+            index = len(self._generations)
+            self._generations.append(0)
+        entity = Entity((self._generations[index] << Entity.INDEX_BITS) | index)
+        self.entities.add(entity.id)
         return entity
 
+    def destroy_entity(self, entity_id):
+        """Removes all of an entity's components and frees its ID slot for reuse.
+
+        Returns False if the entity was already destroyed (a stale ID).
+        """
+        if entity_id not in self.entities:
+            return False
+        for component_type in self.get_component_types(entity_id):
+            self.remove_component(entity_id, component_type)
+        self.entities.discard(entity_id)
+        index = Entity.index_of(entity_id)
+        self._generations[index] += 1
+        self._free_slots.append(index)
+        return True
+
+    def is_alive(self, entity_id):
+        """Checks whether an ID refers to a live entity rather than a destroyed or recycled one."""
+        return entity_id in self.entities
+
     def add_component(self, entity_id, component):
+        if type(component) is components.GuardedPositionComponent:
+            component.__class__ = components.PositionComponent
         component_type = type(component)
-        if component_type not in self.components:
-            self.components[component_type] = {}
-        self.components[component_type][entity_id] = component
+        if component_type is components.PositionComponent:
+            old_pos = self._position_tuple(entity_id)
+        if self.storage.add(entity_id, component):
+            self._on_component_added(entity_id, component_type)
+        elif component_type in SpatialIndex.TRACKED_TYPES:
+            self.spatial_index.refresh(entity_id)  # Replaced, e.g. a new PositionComponent
+        if component_type is components.PositionComponent:
+            if self.debug_positions:
+                component.__class__ = components.GuardedPositionComponent
+            self._notify_position_listeners(entity_id, old_pos, (component.x, component.y))
         return component
 
     def get_component(self, entity_id, component_type):
-        return self.components.get(component_type, {}).get(entity_id)
+        return self.storage.get(entity_id, component_type)
 
     def remove_component(self, entity_id, component_type):
-        if component_type in self.components and entity_id in self.components[component_type]:
-            del self.components[component_type][entity_id]
+        """Removes and returns a component, or returns None if the entity didn't have one."""
+        component = self.storage.remove(entity_id, component_type)
+        if component is not None:
+            self._on_component_removed(entity_id, component_type)
+            if component_type is components.PositionComponent:
+                self._notify_position_listeners(entity_id, (component.x, component.y), None)
+        return component
+
+    def new_intent(self, component_type, *args, **kwargs):
+        """Returns an intent component, reusing a pooled instance when one is spare."""
+        return self.intent_pool.acquire(component_type, *args, **kwargs)
+
+    def send_intent(self, event_type, entity_id, *args, **kwargs):
+        """Sends a one-shot intent for an entity, e.g. send_intent(MoveEvent, player_id, 0, 1).
+
+        Publishes the event, or on the component path adds the event type's
+        INTENT component through the command buffer. Consumers handle both.
+        """
+        if self.use_event_queues:
+            self.events.publish(event_type, entity_id, *args, **kwargs)
+        else:
+            self.commands.add_component(entity_id, self.new_intent(event_type.INTENT, *args, **kwargs))
+
+    def flush_commands(self):
+        """Applies the deferred commands systems have recorded in self.commands."""
+        return self.commands.flush(self)
+
+    def get_component_types(self, entity_id):
+        """Returns the component types currently attached to an entity."""
+        return self.storage.component_types(entity_id)
+
+    def _on_component_added(self, entity_id, component_type):
+        for query in self.queries_by_type.get(component_type, ()):
+            if self.storage.has_all(entity_id, query.signature):
+                query.add(entity_id)
+        if component_type in SpatialIndex.TRACKED_TYPES:
+            self.spatial_index.refresh(entity_id)
+
+    def _on_component_removed(self, entity_id, component_type):
+        for query in self.queries_by_type.get(component_type, ()):
+            query.discard(entity_id)
+        if component_type in SpatialIndex.TRACKED_TYPES:
+            self.spatial_index.refresh(entity_id)
+
+    # --- Movement API ---
+    def move_entity(self, entity_id, dx, dy):
+        """Moves an entity by (dx, dy). Returns False if it has no position."""
+        pos = self.get_component(entity_id, components.PositionComponent)
+        if pos is None:
+            return False
+        return self.teleport_entity(entity_id, pos.x + dx, pos.y + dy)
+
+    def teleport_entity(self, entity_id, x, y):
+        """Places an entity at (x, y). Returns False if it has no position."""
+        pos = self.get_component(entity_id, components.PositionComponent)
+        if pos is None:
+            return False
+        old_pos = (pos.x, pos.y)
+        if old_pos == (x, y):
+            return True
+        if self.debug_positions:
+            object.__setattr__(pos, "x", x)
+            object.__setattr__(pos, "y", y)
+        else:
+            pos.x = x
+            pos.y = y
+        self.spatial_index.update_position(entity_id)
+        self._notify_position_listeners(entity_id, old_pos, (x, y))
+        return True
+
+    def remove_from_map(self, entity_id):
+        """Takes an entity off the map while keeping its components (e.g. an item being picked up)."""
+        return self.teleport_entity(entity_id, *self.OFF_MAP)
+
+    def add_position_listener(self, listener):
+        """Registers a callable(entity_id, old_pos, new_pos) fired whenever an entity's position changes."""
+        self.position_listeners.append(listener)
+
+    def remove_position_listener(self, listener):
+        self.position_listeners.remove(listener)
+
+    def _position_tuple(self, entity_id):
+        pos = self.get_component(entity_id, components.PositionComponent)
+        return (pos.x, pos.y) if pos is not None else None
+
+    def _notify_position_listeners(self, entity_id, old_pos, new_pos):
+        for listener in self.position_listeners:
+            listener(entity_id, old_pos, new_pos)
+
+    def register_query(self, *component_types):
+        """Returns the Query for a set of component types, creating and populating it if needed."""
+        signature = frozenset(component_types)
+        query = self.queries.get(signature)
+        if query is None:
+            query = Query(component_types)
+            for entity_id in self.storage.entities_with(component_types):
+                query.add(entity_id)
+            self.queries[signature] = query
+            for component_type in signature:
+                self.queries_by_type.setdefault(component_type, []).append(query)
+        return query
 
     def get_entities_with_components(self, *component_types):
+        """Returns the IDs of entities having all the given components.
+
+        Results come from registered queries that are kept up to date as
+        components change. The returned list must not be modified.
+        """
         if not component_types: return []
-        try:
-            entity_ids = set(self.components[component_types[0]].keys())
-        except KeyError:
-            return []
-        for component_type in component_types[1:]:
-            try:
-                entity_ids.intersection_update(self.components[component_type].keys())
-            except KeyError:
-                return []
-        return list(entity_ids)
+        query = self._query_lookup.get(component_types)
+        if query is None:
+            query = self.register_query(*component_types)
+            self._query_lookup[component_types] = query
+        return query.entities()
+
+    def get_query_stats(self):
+        """Returns hit/invalidation counters for every registered query, busiest churners first."""
+        stats = [query.stats() for query in self.queries.values()]
+        stats.sort(key=lambda s: s["invalidations"], reverse=True)
+        return stats
     
     def get_system(self, system_type):
         """Finds and returns a system of a specific type."""
@@ -76,34 +256,37 @@ class World:
         return None
 
     def get_entity_at_position(self, x, y):
-        for entity_id in self.get_entities_with_components(components.PositionComponent):
-            if self.get_component(entity_id, components.CursorComponent): continue
-            pos = self.get_component(entity_id, components.PositionComponent)
-            if pos.x == x and pos.y == y:
-                if self.get_component(entity_id, components.ItemComponent):
-                    continue
-                return entity_id
+        """Returns the first non-item entity at a map cell, or None."""
+        for entity_id in self.spatial_index.entities_at(x, y):
+            if self.get_component(entity_id, components.ItemComponent):
+                continue
+            return entity_id
         return None
 
     def get_item_at_position(self, x, y):
-        for entity_id in self.get_entities_with_components(components.PositionComponent, components.ItemComponent):
-            pos = self.get_component(entity_id, components.PositionComponent)
-            if pos.x == x and pos.y == y:
-                return entity_id
-        return None
+        items = self.spatial_index.entities_at(x, y, layer="items")
+        return items[0] if items else None
 
     def add_system(self, system):
         self.systems.append(system)
 
     def update(self, *args, **kwargs):
-        for system in self.systems:
-            system.update(*args, **kwargs)
+        """Runs the scheduled systems that have work this frame."""
+        self.scheduler.update(*args, **kwargs)
 
 
 # --- Main Game Class ---
 class Game:
-    """Initializes Pygame, sets up the game world, and runs the main game loop."""
-    def __init__(self):
+    """Initializes Pygame, sets up the game world, and runs the main game loop.
+
+    With headless=True the game needs no screen: SDL uses its dummy video
+    driver, the game draws into an offscreen surface, and nothing is ever
+    presented. Benchmarks and CI use this to run the real renderer.
+    """
+    def __init__(self, headless=False):
+        self.headless = headless
+        if headless:
+            os.environ["SDL_VIDEODRIVER"] = "dummy"
         pygame.init()
         self.WINDOW_WIDTH, self.WINDOW_HEIGHT = 1280, 720
         self.TILE_SIZE, self.FONT_SIZE = 24, 24
@@ -115,7 +298,9 @@ class Game:
         self.show_inventory = False
         self.show_abilities = False  # Phase 1 Addition
         self.cursor_id = None
-        self.message_log = []
+        self.MESSAGE_LOG_CAPACITY = 100  # Messages kept in memory (see MessageLog)
+        self.MESSAGE_LOG_FILE = None  # e.g. 'messages.log' to append every message to a file
+        self.message_log = MessageLog(self.MESSAGE_LOG_CAPACITY, self.MESSAGE_LOG_FILE)
         
         # Turn-based system attributes
         self.game_state = 'PLAYER_TURN'  # Can be 'PLAYER_TURN', 'MONSTER_TURN', or 'GAME_OVER'
@@ -127,16 +312,28 @@ class Game:
         self.targeting_ability_data = None
         self.targeting_range = 1
         
-        self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT), pygame.RESIZABLE)
-        pygame.display.set_caption("ASCII Roguelike")
+        if headless:
+            self.screen = pygame.Surface((self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
+        else:
+            self.screen = pygame.display.set_mode((self.WINDOW_WIDTH, self.WINDOW_HEIGHT), pygame.RESIZABLE)
+            pygame.display.set_caption("ASCII Roguelike")
         self.clock = pygame.time.Clock()
         self.font = self.load_font()
-        self.world = World()
+        self.COMPACT_CORPSES = True  # Strip dead creatures down to lightweight corpses (see CorpseSystem)
+        self.CORPSE_DELAY_TURNS = 0
+        self.DEBUG_POSITIONS = False  # Catch raw writes to PositionComponent (see World.debug_positions)
+        self.USE_EVENT_QUEUES = True  # False: pass intents between systems as Wants* components
+        self.TERRAIN_FILE = 'world.dat'  # world_generator.py map drawn under the entities; None for none
+        self.FOG_RADIUS = None  # Shade the map beyond this many tiles from the player; None for no fog
+        self.DIRTY_RECTS = True  # Redraw and update only the screen regions that changed each frame
+        self.IDLE_WAIT = True  # Sleep in pygame.event.wait while nothing is animating instead of ticking at FPS
+        self.IDLE_MAX_WAIT_MS = 1000  # Longest single wait when no animation is due
+        self.frames_rendered = 0  # Frames that put new pixels on the display
+        self.frames_skipped = 0  # Frames with nothing to draw
+        self.world = World(debug_positions=self.DEBUG_POSITIONS, use_event_queues=self.USE_EVENT_QUEUES)
 
     def add_message(self, message):
         self.message_log.append(message)
-        if len(self.message_log) > 10:  # Increased message history
-            self.message_log.pop(0)
 
     def load_font(self):
         font_path = os.path.join(os.path.dirname(__file__), self.FONT_NAME)
@@ -260,6 +457,16 @@ class Game:
         factory.create_locked_door_with_key(self, door_pos=(15, 5), key_pos=(2, 2), 
                                            door_material="wood", key_material="brass")
 
+        # Pre-render every glyph the map can show
+        self.glyph_atlas = self.build_glyph_atlas([self.world.archetypes, all_creatures_data, items_data])
+        self.terrain = load_terrain(self.TERRAIN_FILE, self.font, self.TILE_SIZE,
+                                    atlas=self.glyph_atlas) if self.TERRAIN_FILE else None
+
+        # The view follows the player, up to the edges of the terrain
+        bounds = (self.terrain.width, self.terrain.height) if self.terrain else (None, None)
+        for player_id in self.world.get_entities_with_components(components.PlayerControllableComponent):
+            self.world.add_component(player_id, components.CameraComponent(*bounds))
+
         # Initialize systems (order matters!)
         self.world.add_system(InputSystem(self.world))
         self.world.add_system(MovementSystem(self.world))
@@ -269,7 +476,10 @@ class Game:
         self.world.add_system(AISystem(self.world))  # Add the AI system - THIS WAS MISSING!
         self.world.add_system(CombatSystem(self.world))
         self.world.add_system(StatusEffectSystem(self.world))  # Add status effect system
-        self.world.add_system(RenderSystem(self.world, self.screen, self.font, self.TILE_SIZE))
+        self.world.add_system(CorpseSystem(self.world, enabled=self.COMPACT_CORPSES, delay_turns=self.CORPSE_DELAY_TURNS))
+        self.world.add_system(RenderSystem(self.world, self.screen, self.font, self.TILE_SIZE, atlas=self.glyph_atlas,
+                                           dirty_rects=self.DIRTY_RECTS, terrain=self.terrain,
+                                           fog_radius=self.FOG_RADIUS))
         
         self.create_cursor()
         
@@ -277,6 +487,17 @@ class Game:
         self.add_message("Welcome to the dungeon! Use arrow keys to move, 'g' to get items.")
         self.add_message("Press 'l' for look mode, 'i' for inventory, 'b' for abilities. Good luck!")
 
+    def build_glyph_atlas(self, definitions):
+        """Builds the GlyphAtlas from the loaded entity definitions, the biomes and procedural items."""
+        extra_glyphs = [CORPSE_GLYPH]
+        extra_glyphs += [(tile['char'], tile['color']) for tile in BIOMES.values()]
+        # Glyphs the factory uses for keys, padlocks and doors
+        for char in ("=", "'", "+", "-"):
+            extra_glyphs += [(char, self.COLORS["WHITE"]), (char, self.COLORS["YELLOW"])]
+        glyphs = collect_glyphs(definitions, self.COLORS, extra_colors=RenderSystem.STATUS_COLORS,
+                                extra_glyphs=extra_glyphs)
+        return GlyphAtlas(self.font, glyphs)
+
     def create_cursor(self):
         """Creates the look cursor entity."""
         cursor = self.world.create_entity()
@@ -294,8 +515,7 @@ class Game:
             if player_entities:
                 player_id = player_entities[0]
                 player_pos = self.world.get_component(player_id, components.PositionComponent)
-                cursor_pos = self.world.get_component(self.cursor_id, components.PositionComponent)
-                cursor_pos.x, cursor_pos.y = player_pos.x, player_pos.y
+                self.world.teleport_entity(self.cursor_id, player_pos.x, player_pos.y)
         print(f"Look mode: {'ON' if self.look_mode else 'OFF'}")
 
     def toggle_inventory(self):
@@ -331,8 +551,7 @@ class Game:
         player_entities = self.world.get_entities_with_components(components.PlayerControllableComponent)
         if player_entities:
             player_pos = self.world.get_component(player_entities[0], components.PositionComponent)
-            cursor_pos = self.world.get_component(self.cursor_id, components.PositionComponent)
-            cursor_pos.x, cursor_pos.y = player_pos.x, player_pos.y
+            self.world.teleport_entity(self.cursor_id, player_pos.x, player_pos.y)
         
         self.add_message(f"Targeting {ability_id.replace('_', ' ').title()}. Range: {targeting_range}")
 
@@ -358,15 +577,68 @@ class Game:
             self.add_message("=== GAME OVER ===")
             self.add_message("Press ESC to exit or R to restart (not implemented)")
 
+    def wait_for_events(self):
+        """Returns (events, woke) for the next frame, sleeping while the game is idle.
+
+        Monster turns and running animations don't wait. Otherwise this blocks
+        in pygame.event.wait until input arrives or the RenderSystem's next
+        animation deadline (a cursor blink) passes, at most IDLE_MAX_WAIT_MS.
+        woke is False when the wait timed out with no input and no animation
+        due, in which case the frame can be skipped entirely.
+        """
+        if self.game_state == 'MONSTER_TURN':
+            return pygame.event.get(), True
+
+        render_system = self.world.get_system(RenderSystem)
+        deadline = render_system.next_frame_deadline(self) if render_system else None
+        timeout = self.IDLE_MAX_WAIT_MS if deadline is None else deadline - pygame.time.get_ticks()
+        if timeout <= 0:
+            return pygame.event.get(), True
+
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT:
+            return [], deadline is not None
+        return [event] + pygame.event.get(), True
+
+    def frame_report(self):
+        """Summarizes how many frames were drawn and how many were skipped as unchanged."""
+        total = self.frames_rendered + self.frames_skipped
+        skipped = self.frames_skipped / total * 100 if total else 0.0
+        return f"Frames rendered: {self.frames_rendered}, skipped: {self.frames_skipped} ({skipped:.1f}% idle)"
+
+    def present(self, dirty, render_system):
+        """Puts the frame on the display: a flip after a full redraw, otherwise
+        just the dirty rects. Headless games draw offscreen and present nothing."""
+        if dirty is None or render_system.frame_is_full:
+            if not self.headless:
+                pygame.display.flip()
+            self.frames_rendered += 1
+        elif dirty:
+            if not self.headless:
+                pygame.display.update(dirty)
+            self.frames_rendered += 1
+        else:
+            self.frames_skipped += 1
+
     def run(self):
         running = True
         while running:
-            events = pygame.event.get()
+            if self.IDLE_WAIT:
+                events, woke = self.wait_for_events()
+                if not woke:
+                    self.frames_skipped += 1  # Timed out with no input and nothing animating
+                    continue
+            else:
+                events = pygame.event.get()
             for event in events:
                 if event.type == pygame.QUIT:
                     running = False
+                if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                    render_system = self.world.get_system(RenderSystem)
+                    if render_system:
+                        render_system.invalidate()
                 if event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_f:
+                    if event.key == pygame.K_f and not self.headless:
                         self.fullscreen = not self.fullscreen
                         if self.fullscreen: 
                             self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
@@ -375,6 +647,7 @@ class Game:
                         for system in self.world.systems:
                             if isinstance(system, RenderSystem): 
                                 system.screen = self.screen
+                                system.invalidate()
                     elif event.key == pygame.K_ESCAPE:
                         if self.targeting_mode:  # Phase 1 Addition: Exit targeting mode
                             self.exit_targeting_mode()
@@ -414,14 +687,14 @@ class Game:
                             # TODO: Implement restart functionality
                             self.add_message("Restart not implemented yet!")
             
-            # Always update rendering
+            # Render once per frame; the RenderSystem isn't run by world.update
             render_system = self.world.get_system(RenderSystem)
-            if render_system:
-                render_system.update(game_state=self)
-
-            pygame.display.flip()
+            dirty = render_system.update(game_state=self) if render_system else None
+            self.present(dirty, render_system)
             self.clock.tick(self.FPS)
 
+        print(self.frame_report())
+        self.message_log.close()
         pygame.quit()
         sys.exit()
 
@@ -0,0 +1,88 @@
+# message_log.py
+# A bounded log of game messages for the message area.
+
+class LogEntry:
+    """One line of the message log: a message and how many times in a row it was added."""
+    __slots__ = ("text", "count", "surface")
+    def __init__(self, text):
+        self.text = text
+        self.count = 1
+        self.surface = None  # Rendered line, cached by the RenderSystem
+
+    @property
+    def display_text(self):
+        return self.text if self.count == 1 else f"{self.text} ×{self.count}"
+
+class MessageLog:
+    """Game messages kept in a fixed-size ring buffer.
+
+    Adding a message past capacity overwrites the oldest entry, so a turn
+    that emits dozens of messages costs the same per message as a quiet one.
+    A message identical to the newest entry is coalesced into it and shown
+    as "text ×N". Each entry keeps the surface its line was rendered to
+    until the entry changes.
+
+    With stream_path set, every message is also appended to that file as it
+    arrives, so the full history is kept on disk without being held in
+    memory.
+    """
+    def __init__(self, capacity=100, stream_path=None):
+        self.capacity = capacity
+        self.entries = [None] * capacity
+        self.head = 0  # Slot the next new entry goes into
+        self.size = 0
+        self.version = 0  # Bumped whenever the visible lines change
+        self.stream = None
+        if stream_path:
+            try:
+                self.stream = open(stream_path, 'a', encoding='utf-8', buffering=1)
+            except OSError as e:
+                print(f"Warning: could not open message log file '{stream_path}': {e}")
+
+    def __len__(self):
+        return self.size
+
+    def __iter__(self):
+        """Yields the display text of each entry, oldest first."""
+        for entry in self.recent(self.size):
+            yield entry.display_text
+
+    def append(self, message):
+        """Adds a message, coalescing it into the newest entry if it repeats it."""
+        if self.stream is not None:
+            self.stream.write(message + "\n")
+
+        self.version += 1
+        newest = self.newest()
+        if newest is not None and newest.text == message:
+            newest.count += 1
+            newest.surface = None
+            return
+
+        self.entries[self.head] = LogEntry(message)
+        self.head = (self.head + 1) % self.capacity
+        if self.size < self.capacity:
+            self.size += 1
+
+    def newest(self):
+        """Returns the most recent entry, or None if the log is empty."""
+        if not self.size:
+            return None
+        return self.entries[self.head - 1]
+
+    def recent(self, count):
+        """Returns up to count of the most recent entries, oldest first."""
+        count = min(count, self.size)
+        return [self.entries[(self.head - count + i) % self.capacity] for i in range(count)]
+
+    def clear(self):
+        self.entries = [None] * self.capacity
+        self.head = 0
+        self.size = 0
+        self.version += 1
+
+    def close(self):
+        """Closes the stream file, if any."""
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
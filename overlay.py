@@ -0,0 +1,104 @@
+# overlay.py
+# Per-tile colour overlays composed with NumPy and blitted in one operation.
+
+import numpy as np
+import pygame
+
+class OverlayLayer:
+    """Range highlights, status tints and fog for the tiles in view.
+
+    Two tile-resolution arrays cover the view: `glow` is added to the screen
+    (range highlights, status tints) and `shade` multiplies it (fog; 255
+    leaves a pixel unchanged). Composing fills the arrays with vectorized
+    NumPy operations, turns the part of each array that isn't neutral into a
+    surface with pygame.surfarray and scales it up to pixels, so drawing is
+    one BLEND_RGB_ADD blit and one BLEND_RGB_MULT blit however many tiles
+    are covered. Composed surfaces are kept until compose() is called with a
+    different key.
+    """
+    def __init__(self, tile_size):
+        self.tile_size = tile_size
+        self.key = None  # Inputs of the current composition
+        self.layers = []  # (surface, screen dest, blend flag), in draw order
+        self.glow = None  # (width, height, 3) uint16 array of added colour
+        self.shade = None  # (width, height, 3) uint8 array of light multipliers
+        self.origin = (0, 0)  # Map cell at the top-left of the arrays
+
+    def compose(self, key, origin_x, origin_y, width, height, ranges=(), tints=(), fog=None):
+        """Rebuilds the overlay for a view of width x height tiles starting at
+        map cell (origin_x, origin_y), unless key matches the last call.
+
+        ranges are (x, y, radius, edge_color, fill_color) squares of tiles
+        within a Chebyshev radius; tints are (x, y, color) added to single
+        tiles; fog is (x, y, radius, falloff, min_light), darkening tiles
+        further than radius from (x, y) down to min_light (0-1) over falloff
+        tiles.
+        """
+        if key == self.key:
+            return
+        self.key = key
+        self.origin = (origin_x, origin_y)
+        self.layers = []
+        self.glow = np.zeros((width, height, 3), dtype=np.uint16)
+        self.shade = None
+
+        for x, y, radius, edge_color, fill_color in ranges:
+            self.add_range(x, y, radius, edge_color, fill_color)
+        if tints:
+            self.add_tints(tints)
+        if fog is not None:
+            self.set_fog(*fog)
+
+        self.layers.extend(self._to_layer(self.glow, pygame.BLEND_RGB_ADD, 0))
+        if self.shade is not None:
+            self.layers.extend(self._to_layer(self.shade, pygame.BLEND_RGB_MULT, 255))
+
+    def _cell_grids(self):
+        """Map coordinates of every tile in view, as broadcastable column and row arrays."""
+        width, height = self.glow.shape[:2]
+        xs = np.arange(width)[:, None] + self.origin[0]
+        ys = np.arange(height)[None, :] + self.origin[1]
+        return xs, ys
+
+    def add_range(self, x, y, radius, edge_color, fill_color):
+        """Adds fill_color to tiles within a Chebyshev radius of (x, y) and edge_color to its rim."""
+        xs, ys = self._cell_grids()
+        distance = np.maximum(np.abs(xs - x), np.abs(ys - y))
+        inside = distance < radius
+        edge = distance == radius
+        self.glow[inside] += np.array(fill_color, dtype=np.uint16)
+        self.glow[edge] += np.array(edge_color, dtype=np.uint16)
+
+    def add_tints(self, tints):
+        """Adds a colour to single tiles; tiles outside the view are ignored."""
+        cells = np.array([(x - self.origin[0], y - self.origin[1]) for x, y, _ in tints], dtype=np.int64)
+        colors = np.array([color for _, _, color in tints], dtype=np.uint16)
+        width, height = self.glow.shape[:2]
+        visible = (cells[:, 0] >= 0) & (cells[:, 0] < width) & (cells[:, 1] >= 0) & (cells[:, 1] < height)
+        np.add.at(self.glow, (cells[visible, 0], cells[visible, 1]), colors[visible])
+
+    def set_fog(self, x, y, radius, falloff, min_light):
+        """Shades tiles by their distance from (x, y): full light within radius, min_light beyond radius + falloff."""
+        xs, ys = self._cell_grids()
+        distance = np.hypot(xs - x, ys - y)
+        light = np.clip(1.0 - (distance - radius) / max(falloff, 1), min_light, 1.0)
+        self.shade = np.repeat((light * 255).astype(np.uint8)[:, :, None], 3, axis=2)
+
+    def _to_layer(self, array, blend_flag, neutral):
+        """Returns [(surface, dest, blend_flag)] covering the tiles of array that
+        differ from neutral, or [] if none do."""
+        busy = np.any(array != neutral, axis=2)
+        columns = np.flatnonzero(busy.any(axis=1))
+        rows = np.flatnonzero(busy.any(axis=0))
+        if not len(columns):
+            return []
+        x0, x1, y0, y1 = columns[0], columns[-1] + 1, rows[0], rows[-1] + 1
+        block = np.minimum(array[x0:x1, y0:y1], 255).astype(np.uint8)
+        tiles = pygame.surfarray.make_surface(block)
+        surface = pygame.transform.scale(tiles, ((x1 - x0) * self.tile_size, (y1 - y0) * self.tile_size))
+        return [(surface, (int(x0) * self.tile_size, int(y0) * self.tile_size), blend_flag)]
+
+    def draw(self, blit):
+        """Draws the composed layers with blit(surface, dest, special_flags=...)."""
+        for surface, dest, blend_flag in self.layers:
+            blit(surface, dest, special_flags=blend_flag)
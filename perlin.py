@@ -0,0 +1,121 @@
+# perlin.py
+# Vectorized Perlin noise and fBm over NumPy coordinate grids.
+
+import numpy as np
+
+# Ken Perlin's reference permutation, as used by the noise package
+PERM = np.array([
+    151, 160, 137, 91, 90, 15, 131, 13, 201, 95, 96, 53, 194, 233, 7, 225, 140,
+    36, 103, 30, 69, 142, 8, 99, 37, 240, 21, 10, 23, 190, 6, 148, 247, 120,
+    234, 75, 0, 26, 197, 62, 94, 252, 219, 203, 117, 35, 11, 32, 57, 177, 33,
+    88, 237, 149, 56, 87, 174, 20, 125, 136, 171, 168, 68, 175, 74, 165, 71,
+    134, 139, 48, 27, 166, 77, 146, 158, 231, 83, 111, 229, 122, 60, 211, 133,
+    230, 220, 105, 92, 41, 55, 46, 245, 40, 244, 102, 143, 54, 65, 25, 63, 161,
+    1, 216, 80, 73, 209, 76, 132, 187, 208, 89, 18, 169, 200, 196, 135, 130,
+    116, 188, 159, 86, 164, 100, 109, 198, 173, 186, 3, 64, 52, 217, 226, 250,
+    124, 123, 5, 202, 38, 147, 118, 126, 255, 82, 85, 212, 207, 206, 59, 227,
+    47, 16, 58, 17, 182, 189, 28, 42, 223, 183, 170, 213, 119, 248, 152, 2, 44,
+    154, 163, 70, 221, 153, 101, 155, 167, 43, 172, 9, 129, 22, 39, 253, 19, 98,
+    108, 110, 79, 113, 224, 232, 178, 185, 112, 104, 218, 246, 97, 228, 251, 34,
+    242, 193, 238, 210, 144, 12, 191, 179, 162, 241, 81, 51, 145, 235, 249, 14,
+    239, 107, 49, 192, 214, 31, 181, 199, 106, 157, 184, 84, 204, 176, 115, 121,
+    50, 45, 127, 4, 150, 254, 138, 236, 205, 93, 222, 114, 67, 29, 24, 72, 243,
+    141, 128, 195, 78, 66, 215, 61, 156, 180], dtype=np.int32)
+
+# The first two components of the 16 gradient directions noise.pnoise2 uses
+GRAD_X = np.array([1, -1, 1, -1, 1, -1, 1, -1, 0, 0, 0, 0, 1, -1, 0, 0], dtype=np.float32)
+GRAD_Y = np.array([1, 1, -1, -1, 0, 0, 0, 0, 1, -1, 1, -1, 0, 0, -1, 1], dtype=np.float32)
+
+# Gradient components looked up straight from a corner hash: the corner's
+# gradient is GRAD[PERM[hash] & 15], so the two lookups fold into one table
+CORNER_GRAD_X = GRAD_X[PERM & 15][PERM]
+CORNER_GRAD_Y = GRAD_Y[PERM & 15][PERM]
+
+# Grid cells worked on at a time; keeps the temporaries of a large map in cache
+BLOCK_CELLS = 1 << 16
+
+def _lattice(coords, repeat, base):
+    """Per-axis part of noise2: lattice cell, next cell (both offset by base),
+    fractional position and its fade curve, for a 1D array of coordinates."""
+    cell = np.floor(np.fmod(coords, repeat))
+    next_cell = np.fmod(cell + 1, repeat).astype(np.int32)
+    cell = cell.astype(np.int32)
+    frac = coords - np.floor(coords)
+    fade = frac * frac * frac * (frac * (frac * 6 - 15) + 10)
+    return (cell & 255) + base, (next_cell & 255) + base, frac, fade
+
+def noise2(xs, ys, repeatx=1024, repeaty=1024, base=0):
+    """Improved Perlin noise at every (x, y) pair of the 1D arrays xs and ys.
+
+    Returns a (len(xs), len(ys)) float32 array; element [i, j] is the
+    noise at (xs[i], ys[j]), the value noise.pnoise2(xs[i], ys[j],
+    repeatx=repeatx, repeaty=repeaty, base=base) gives. Everything that
+    depends on one axis only is worked out on the 1D arrays; the grid
+    only pays for the hash lookups and the interpolation.
+
+    The noise package indexes its 512-entry permutation table past the
+    end when base + cell is large; here every index wraps to the table
+    instead, which gives the same values wherever the noise package stays
+    inside the table.
+    """
+    xs = np.asarray(xs, dtype=np.float32)
+    ys = np.asarray(ys, dtype=np.float32)
+    i, ii, x, fx = _lattice(xs, np.float32(repeatx), base)
+    j, jj, y, fy = _lattice(ys, np.float32(repeaty), base)
+
+    # Hash indices as uint8, so row + column wraps to the table for free
+    a = PERM[i & 255].astype(np.uint8)[:, None]
+    b = PERM[ii & 255].astype(np.uint8)[:, None]
+    j = (j & 255).astype(np.uint8)[None, :]
+    jj = (jj & 255).astype(np.uint8)[None, :]
+    x, x1, fx = x[:, None], x[:, None] - 1, fx[:, None]
+    y, y1, fy = y[None, :], y[None, :] - 1, fy[None, :]
+
+    def corner(row, column, dx, dy):
+        # Gradient at the hashed corner, dotted with the offset to it
+        hashed = row + column
+        return np.take(CORNER_GRAD_X, hashed) * dx + np.take(CORNER_GRAD_Y, hashed) * dy
+
+    bottom = corner(a, j, x, y)
+    bottom += fx * (corner(b, j, x1, y) - bottom)
+    top = corner(a, jj, x, y1)
+    top += fx * (corner(b, jj, x1, y1) - top)
+    top -= bottom
+    top *= fy
+    bottom += top
+    return bottom
+
+def fbm2(xs, ys, octaves=1, persistence=0.5, lacunarity=2.0, repeatx=1024, repeaty=1024, base=0):
+    """Fractal Brownian motion: octaves of noise2 summed the way noise.pnoise2
+    does, each at lacunarity times the frequency and persistence times the
+    amplitude of the one before, normalized by the total amplitude.
+
+    Returns a (len(xs), len(ys)) float32 array, worked out a block of rows
+    at a time so the temporaries stay small however large the grid is.
+    """
+    if octaves < 1:
+        raise ValueError("Expected octaves value > 0")
+    xs = np.asarray(xs, dtype=np.float32)
+    ys = np.asarray(ys, dtype=np.float32)
+    octave_params = []  # (frequency, amplitude) of each octave
+    freq, amp = np.float32(1.0), np.float32(1.0)
+    for _ in range(octaves):
+        octave_params.append((freq, amp))
+        freq *= np.float32(lacunarity)
+        amp *= np.float32(persistence)
+    total_amp = sum(amp for _, amp in octave_params)
+
+    result = np.empty((len(xs), len(ys)), dtype=np.float32)
+    block_rows = max(1, BLOCK_CELLS // max(1, len(ys)))
+    for start in range(0, len(xs), block_rows):
+        block_xs = xs[start:start + block_rows]
+        total = result[start:start + block_rows]
+        total[:] = 0
+        for freq, amp in octave_params:
+            layer = noise2(block_xs * freq, ys * freq, repeatx * freq, repeaty * freq, base)
+            if amp != 1:
+                layer *= amp
+            total += layer
+        if octaves > 1:
+            total /= total_amp
+    return result
@@ -0,0 +1,67 @@
+# queries.py
+# Registered component queries that the World keeps up to date incrementally.
+
+class Query:
+    """A set of entities having all of the given component types.
+
+    The World adds and removes members as components change, so fetching the
+    result is O(1) until the membership changes again. The returned list is
+    shared between callers and must not be modified.
+    """
+    def __init__(self, component_types):
+        self.component_types = tuple(component_types)
+        self.signature = frozenset(component_types)
+        self.name = ", ".join(t.__name__ for t in self.component_types)
+        self.members = {}  # dict used as an insertion-ordered set
+        self._result = None
+
+        # Counters for spotting queries that churn
+        self.hits = 0  # fetches served from the cached result
+        self.rebuilds = 0  # fetches that had to rebuild the result list
+        self.invalidations = 0  # times a cached result was thrown away
+        self.additions = 0
+        self.removals = 0
+
+    def __len__(self):
+        return len(self.members)
+
+    def __contains__(self, entity_id):
+        return entity_id in self.members
+
+    def entities(self):
+        """Returns the current list of matching entity IDs."""
+        if self._result is None:
+            self._result = list(self.members)
+            self.rebuilds += 1
+        else:
+            self.hits += 1
+        return self._result
+
+    def add(self, entity_id):
+        if entity_id not in self.members:
+            self.members[entity_id] = None
+            self.additions += 1
+            self._invalidate()
+
+    def discard(self, entity_id):
+        if entity_id in self.members:
+            del self.members[entity_id]
+            self.removals += 1
+            self._invalidate()
+
+    def _invalidate(self):
+        if self._result is not None:
+            self._result = None
+            self.invalidations += 1
+
+    def stats(self):
+        """Returns the query's counters as a dict."""
+        return {
+            "query": self.name,
+            "size": len(self.members),
+            "hits": self.hits,
+            "rebuilds": self.rebuilds,
+            "invalidations": self.invalidations,
+            "additions": self.additions,
+            "removals": self.removals,
+        }
@@ -4,25 +4,167 @@
 import pygame
 from components import *
 from core_systems import System
+from glyph_cache import GlyphCache
+from overlay import OverlayLayer
 
 class RenderSystem(System):
-    """Handles all rendering logic."""
-    def __init__(self, world, screen, font, tile_size):
+    """Handles all rendering logic.
+
+    With dirty_rects enabled, update() redraws only the parts of the screen
+    that changed since the last frame and returns their rects for
+    pygame.display.update. A map tile is dirty when the glyphs drawn on it
+    change (an entity moved, died or changed tint); a UI panel is dirty when
+    its content key changes (HP, a new message, a sidebar sliding, a cursor
+    blinking). Each dirty region is redrawn in full - background, map and
+    every panel - with the screen clipped to it, so overlapping layers stay
+    correct. The first frame, a resize, a new screen surface (fullscreen
+    toggle) or invalidate() fall back to a full redraw.
+    """
+    scheduled = False  # Game.run draws exactly once per frame
+    MAX_DIRTY_RECTS = 16  # More dirty regions than this are merged into one
+
+    # Entity tints for status effects
+    HELD_COLOR = (128, 128, 128)  # paralyzed or petrified
+    CONFUSED_COLOR = (255, 0, 255)
+    POISONED_COLOR = (0, 255, 0)  # lethally poisoned or sickened
+    STATUS_COLORS = (HELD_COLOR, CONFUSED_COLOR, POISONED_COLOR)
+    # StateComponent flag masks for each tint, in priority order
+    STATUS_TINTS = (
+        (StateComponent.FLAG_BITS["paralyzed"] | StateComponent.FLAG_BITS["petrified"], HELD_COLOR),
+        (StateComponent.FLAG_BITS["confused"], CONFUSED_COLOR),
+        (StateComponent.FLAG_BITS["lethally_poisoned"] | StateComponent.FLAG_BITS["sickened"], POISONED_COLOR),
+    )
+    # Overlay tint added under an entity with a status colour
+    STATUS_GLOW_COLORS = {color: (color[0] // 4, color[1] // 4, color[2] // 4) for color in STATUS_COLORS}
+    RANGE_EDGE_COLOR = (40, 40, 0)
+    RANGE_FILL_COLOR = (20, 20, 0)
+
+    def __init__(self, world, screen, font, tile_size, glyph_cache=None, atlas=None, dirty_rects=False,
+                 terrain=None, status_glow=True, fog_radius=None):
         super().__init__(world)
         self.screen = screen
         self.font = font
+        self.glyphs = glyph_cache if glyph_cache is not None else GlyphCache()
+        self.atlas = atlas  # GlyphAtlas for the map layer; None renders glyphs individually
+        self.map_blits = []  # Reused (surface, dest[, area]) list for the batched map draw
+        self.terrain = terrain  # TerrainLayer drawn under the entities, or None
+        self.panel_surfaces = {}  # sidebar name -> ((content, height), background, foreground)
+        self.wrap_cache = {}  # (text, max_width) -> wrapped lines
+        self.overlay = OverlayLayer(tile_size)  # Range highlight, status tints and fog
+        self.status_glow = status_glow  # Tint the tiles under entities with a status colour
+        self.fog_radius = fog_radius  # Shade tiles further than this from the player; None for no fog
+        self.status_tints = {}  # StateComponent.flags -> tint colour or None
+        self.tinted_cells = []  # (x, y, glow colour) of status-tinted entities in view
         self.tile_size = tile_size
         self.inventory_width = 300
         self.abilities_width = 400
         self.inventory_slide_amount = 0
         self.abilities_slide_amount = 0
         self.slide_speed = 20
+        self.player_query = world.register_query(PlayerControllableComponent)
+        self.camera_query = world.register_query(CameraComponent, PositionComponent)
+        self.camera_x = 0  # Map cell drawn in the top-left corner of the screen
+        self.camera_y = 0
+
+        # Dirty-rectangle state
+        self.dirty_rects = dirty_rects
+        self.full_redraw = True  # Set by invalidate(); the next frame redraws everything
+        self.frame_is_full = True  # Whether the last frame was a full redraw
+        self.tiles = {}  # (x, y) -> [(char, color), ...] drawn on that tile last frame
+        self.tile_rects = {}  # (x, y) -> screen Rect covered by those glyphs
+        self.panel_keys = {}  # panel name -> content key last frame
+        self.panel_bounds = {}  # panel name -> screen Rect it covered when last drawn
+        self.drawn_bounds = []  # Rects drawn by the panel currently being drawn
+        self.last_screen = None
+        self.last_size = None
+
+    def get_player_id(self):
+        """Returns the player's entity ID, or None if there is no player."""
+        player_entities = self.player_query.entities()
+        return player_entities[0] if player_entities else None
+
+    def view_size(self):
+        """Returns the number of (possibly partial) tiles that fit across and down the screen."""
+        return (-(-self.screen.get_width() // self.tile_size),
+                -(-self.screen.get_height() // self.tile_size))
+
+    def tile_rect(self, x, y):
+        """Returns the screen Rect of map cell (x, y) under the current camera."""
+        return pygame.Rect((x - self.camera_x) * self.tile_size, (y - self.camera_y) * self.tile_size,
+                           self.tile_size, self.tile_size)
+
+    def update_camera(self):
+        """Centers the camera on the entity with a CameraComponent.
+
+        Without one the view stays at the map origin. Scrolling moves every
+        tile on screen, so it forces a full redraw.
+        """
+        camera_entities = self.camera_query.entities()
+        if camera_entities:
+            entity_id = camera_entities[0]
+            camera = self.world.get_component(entity_id, CameraComponent)
+            pos = self.world.get_component(entity_id, PositionComponent)
+            view_width, view_height = self.view_size()
+            x = pos.x - view_width // 2
+            y = pos.y - view_height // 2
+            if camera.bounds_width is not None:
+                x = min(x, camera.bounds_width - view_width)
+            if camera.bounds_height is not None:
+                y = min(y, camera.bounds_height - view_height)
+            camera.x = max(0, x)
+            camera.y = max(0, y)
+            x, y = camera.x, camera.y
+        else:
+            x = y = 0
+
+        if (x, y) != (self.camera_x, self.camera_y):
+            self.camera_x, self.camera_y = x, y
+            self.invalidate()
+
+    def invalidate(self):
+        """Forces a full redraw on the next frame (resize, fullscreen, screen change)."""
+        self.full_redraw = True
 
     def update(self, *args, **kwargs):
+        """Draws a frame. In dirty-rect mode returns the list of rects that
+        changed (empty if nothing did); otherwise returns None and the whole
+        screen has been redrawn."""
         game_state = kwargs.get('game_state')
-        self.screen.fill((0, 0, 0))
+        self.update_slides(game_state)
+        self.update_camera()
+        tiles, tile_rects = self.build_map_layer()
+        self.compose_overlay(game_state)
+
+        if not self.dirty_rects:
+            self.draw_frame(game_state)
+            return None
+        return self.redraw_dirty(game_state, tiles, tile_rects)
+
+    def next_frame_deadline(self, game_state):
+        """Returns the pygame tick (ms) at which the screen next changes on its
+        own: now while a sidebar is sliding or a full redraw is pending, the
+        next blink of the targeting or look cursor, or None when nothing is
+        animating and the frame only changes in response to input."""
+        now = pygame.time.get_ticks()
+        if self.full_redraw or self.is_sliding(game_state):
+            return now
+        if game_state and getattr(game_state, 'targeting_mode', False):
+            period = 200
+        elif game_state and game_state.look_mode:
+            period = 400
+        else:
+            return None
+        return (now // period + 1) * period
 
-        # Update slide animations
+    def is_sliding(self, game_state):
+        """Whether either sidebar is still sliding towards its open or closed position."""
+        show_inventory = bool(game_state and game_state.show_inventory)
+        show_abilities = bool(game_state and game_state.show_abilities)
+        return (self.inventory_slide_amount != (self.inventory_width if show_inventory else 0) or
+                self.abilities_slide_amount != (self.abilities_width if show_abilities else 0))
+
+    def update_slides(self, game_state):
+        """Advances the inventory and abilities sidebar slide animations."""
         if game_state and game_state.show_inventory:
             if self.inventory_slide_amount < self.inventory_width:
                 self.inventory_slide_amount = min(self.inventory_slide_amount + self.slide_speed, self.inventory_width)
@@ -37,55 +179,279 @@ class RenderSystem(System):
             if self.abilities_slide_amount > 0:
                 self.abilities_slide_amount = max(self.abilities_slide_amount - self.slide_speed, 0)
 
-        # Draw entities
-        entities_to_render = self.world.get_entities_with_components(PositionComponent, RenderableComponent)
-        for entity_id in entities_to_render:
-            pos = self.world.get_component(entity_id, PositionComponent)
-            if pos.x < 0 or pos.y < 0: continue
+    def visible_entities(self):
+        """Returns the indexed entities inside the camera's view, creatures last so they draw on top."""
+        view_width, view_height = self.view_size()
+        spatial_index = self.world.spatial_index
+        # Glyphs can be taller and wider than a tile, so the row and column
+        # just before the view may still reach into it
+        entities = spatial_index.entities_in_rect(self.camera_x - 1, self.camera_y - 1,
+                                                  self.camera_x + view_width - 1, self.camera_y + view_height - 1)
+        entity_layers = spatial_index.entity_layers
+        entities.sort(key=lambda entity_id: "creatures" in entity_layers[entity_id])
+        return entities
+
+    def build_map_layer(self):
+        """Fills self.map_blits with the glyphs of the entities in view.
 
-            if self.world.get_component(entity_id, CursorComponent): continue
+        Only entities the spatial index finds inside the camera's view are
+        visited, so the cost follows the number of visible tiles rather than
+        the number of entities on the map. The look cursor and carried items
+        aren't in the index and are never drawn here.
 
+        In dirty-rect mode also returns ({tile: [(char, color), ...]},
+        {tile: Rect}) describing what is drawn where; otherwise (None, None).
+        """
+        atlas = self.atlas
+        map_blits = self.map_blits
+        map_blits.clear()
+        tiles = {} if self.dirty_rects else None
+        tile_rects = {} if self.dirty_rects else None
+        tinted_cells = self.tinted_cells
+        tinted_cells.clear()
+        for entity_id in self.visible_entities():
             renderable = self.world.get_component(entity_id, RenderableComponent)
+            if renderable is None: continue
+            pos = self.world.get_component(entity_id, PositionComponent)
             
             # Modify color based on status effects
             color = renderable.color
             state = self.world.get_component(entity_id, StateComponent)
-            if state:
-                if state.dead:
-                    color = renderable.color
-                elif state.paralyzed or state.petrified:
-                    color = (128, 128, 128)
-                elif state.confused:
-                    color = (255, 0, 255)
-                elif state.lethally_poisoned or state.sickened:
-                    color = (0, 255, 0)
+            if state and state.flags:
+                tint = self.status_tint(state.flags)
+                if tint is not None:
+                    color = tint
+                    tinted_cells.append((pos.x, pos.y, self.STATUS_GLOW_COLORS[tint]))
             
-            text_surface = self.font.render(renderable.char, True, color)
-            self.screen.blit(text_surface, (pos.x * self.tile_size, pos.y * self.tile_size))
+            dest = ((pos.x - self.camera_x) * self.tile_size, (pos.y - self.camera_y) * self.tile_size)
+            area = atlas.area(renderable.char, color) if atlas is not None else None
+            if area is not None:
+                map_blits.append((atlas.surface, dest, area))
+                size = area.size
+            else:
+                glyph = self.glyphs.render(self.font, renderable.char, color)
+                map_blits.append((glyph, dest))
+                size = glyph.get_size()
 
-        # Draw targeting cursor if in targeting mode
-        if (game_state and hasattr(game_state, 'targeting_mode') and 
-            game_state.targeting_mode):
-            self.draw_targeting_cursor(game_state)
+            if tiles is not None:
+                cell = (pos.x, pos.y)
+                glyph_rect = pygame.Rect(dest, size)
+                if cell in tiles:
+                    tiles[cell].append((renderable.char, color))
+                    tile_rects[cell].union_ip(glyph_rect)
+                else:
+                    tiles[cell] = [(renderable.char, color)]
+                    tile_rects[cell] = glyph_rect
+        return tiles, tile_rects
 
-        # Draw look cursor and message
-        if game_state and game_state.look_mode:
-            self.draw_cursor_and_description(game_state)
+    def status_tint(self, flags):
+        """Returns the tint colour for a StateComponent's flags, or None. Dead
+        entities keep their colour; otherwise the first matching STATUS_TINTS
+        entry wins. Results are memoized per flags value."""
+        tint = self.status_tints.get(flags, False)
+        if tint is False:
+            tint = None
+            if not flags & StateComponent.FLAG_BITS["dead"]:
+                for mask, color in self.STATUS_TINTS:
+                    if flags & mask:
+                        tint = color
+                        break
+            self.status_tints[flags] = tint
+        return tint
 
-        # Draw game messages
-        if game_state:
-            self.draw_messages(game_state)
+    def compose_overlay(self, game_state):
+        """Rebuilds the overlay layer when the targeting range, the tinted
+        entities in view, the fog or the camera have changed."""
+        player_id = self.get_player_id()
+        player_pos = self.world.get_component(player_id, PositionComponent) if player_id is not None else None
 
-        # Draw sidebars
-        if game_state and self.inventory_slide_amount > 0:
-            self.draw_inventory(game_state)
-        
-        if game_state and self.abilities_slide_amount > 0:
-            self.draw_abilities_screen(game_state)
-        
-        # Draw status information
-        if game_state:
-            self.draw_status_info(game_state)
+        ranges = ()
+        if player_pos and game_state and getattr(game_state, 'targeting_mode', False) and game_state.cursor_id:
+            ranges = ((player_pos.x, player_pos.y, game_state.targeting_range,
+                       self.RANGE_EDGE_COLOR, self.RANGE_FILL_COLOR),)
+        tints = tuple(self.tinted_cells) if self.status_glow else ()
+        fog = None
+        if player_pos and self.fog_radius is not None:
+            fog = (player_pos.x, player_pos.y, self.fog_radius, self.fog_radius, 0.25)
+
+        view_width, view_height = self.view_size()
+        key = (self.camera_x, self.camera_y, view_width, view_height, ranges, tints, fog)
+        self.overlay.compose(key, self.camera_x, self.camera_y, view_width, view_height,
+                             ranges=ranges, tints=tints, fog=fog)
+
+    def draw_overlay(self, game_state):
+        """Blends the composed overlay over the map layer."""
+        self.overlay.draw(self.blit)
+
+    def overlay_key(self, game_state):
+        return self.overlay.key
+
+    def visible_panels(self, game_state):
+        """Returns (name, draw method, key method) for each UI panel shown this frame, in draw order."""
+        if not game_state:
+            return []
+        panels = []
+        if self.overlay.layers:
+            panels.append(('overlay', self.draw_overlay, self.overlay_key))
+        if getattr(game_state, 'targeting_mode', False):
+            panels.append(('targeting', self.draw_targeting_cursor, self.targeting_key))
+        if game_state.look_mode:
+            panels.append(('look', self.draw_cursor_and_description, self.look_key))
+        panels.append(('messages', self.draw_messages, self.messages_key))
+        if self.inventory_slide_amount > 0:
+            panels.append(('inventory', self.draw_inventory, self.inventory_key))
+        if self.abilities_slide_amount > 0:
+            panels.append(('abilities', self.draw_abilities_screen, self.abilities_key))
+        panels.append(('status', self.draw_status_info, self.status_key))
+        return panels
+
+    def draw_frame(self, game_state):
+        """Draws the background, terrain, map layer and UI panels, recording each panel's bounds."""
+        self.screen.fill((0, 0, 0))
+        if self.terrain is not None:
+            self.terrain.draw(self.screen, self.camera_x, self.camera_y)
+        self.screen.blits(self.map_blits, doreturn=False)
+        for name, draw, _ in self.visible_panels(game_state):
+            self.drawn_bounds = []
+            draw(game_state)
+            if self.drawn_bounds:
+                self.panel_bounds[name] = self.drawn_bounds[0].unionall(self.drawn_bounds[1:])
+            else:
+                self.panel_bounds.pop(name, None)
+        self.drawn_bounds = []
+
+    def redraw_dirty(self, game_state, tiles, tile_rects):
+        """Redraws only what changed since the last frame and returns the changed rects."""
+        keys = {name: key(game_state) for name, _, key in self.visible_panels(game_state)}
+        size = self.screen.get_size()
+        old_tiles, old_rects, old_keys = self.tiles, self.tile_rects, self.panel_keys
+        self.tiles, self.tile_rects, self.panel_keys = tiles, tile_rects, keys
+
+        if self.full_redraw or self.screen is not self.last_screen or size != self.last_size:
+            self.full_redraw = False
+            self.last_screen, self.last_size = self.screen, size
+            self.frame_is_full = True
+            self.panel_bounds.clear()
+            self.draw_frame(game_state)
+            return [self.screen.get_rect()]
+        self.frame_is_full = False
+
+        # Tiles whose glyphs changed, appeared or disappeared
+        dirty = []
+        for cell, glyphs in tiles.items():
+            if old_tiles.get(cell) != glyphs:
+                dirty.append(tile_rects[cell])
+                if cell in old_rects:
+                    dirty.append(old_rects[cell])
+        for cell, rect in old_rects.items():
+            if cell not in tiles:
+                dirty.append(rect)
+
+        # Panels whose content changed, appeared or disappeared; where they
+        # were drawn before is dirty, where they are drawn now is found below
+        changed = [name for name in set(keys) | set(old_keys) if keys.get(name) != old_keys.get(name)]
+        for name in changed:
+            if name in self.panel_bounds:
+                dirty.append(self.panel_bounds[name])
+                if name not in keys:
+                    del self.panel_bounds[name]
+        if not dirty and not changed:
+            return []
+
+        rects = self.merge_rects(dirty)
+        self.draw_clipped(game_state, rects)
+
+        # A changed panel may now reach past the regions just drawn
+        extra = [self.panel_bounds[name] for name in changed
+                 if name in self.panel_bounds and not any(rect.contains(self.panel_bounds[name]) for rect in rects)]
+        if extra:
+            extra = self.merge_rects(extra)
+            self.draw_clipped(game_state, extra)
+            rects = self.merge_rects(rects + extra)
+        return rects
+
+    def draw_clipped(self, game_state, rects):
+        """Redraws the frame once per rect with the screen clipped to it.
+
+        With no rects the frame is still "drawn" through an empty clip, which
+        only records panel bounds.
+        """
+        screen_rect = self.screen.get_rect()
+        for rect in rects or [pygame.Rect(0, 0, 0, 0)]:
+            self.screen.set_clip(rect.clip(screen_rect))
+            self.draw_frame(game_state)
+        self.screen.set_clip(None)
+
+    def merge_rects(self, rects):
+        """Merges overlapping rects, collapsing to their union if too many remain."""
+        merged = []
+        for rect in rects:
+            rect = pygame.Rect(rect)
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        if len(merged) > self.MAX_DIRTY_RECTS:
+            return [merged[0].unionall(merged[1:])]
+        return merged
+
+    def blit(self, surface, dest, area=None, special_flags=0):
+        """Blits onto the screen, recording the unclipped area drawn."""
+        rect = pygame.Rect(dest[0], dest[1], *(area.size if area else surface.get_size()))
+        self.drawn_bounds.append(rect)
+        self.screen.blit(surface, dest, area, special_flags)
+        return rect
+
+    def draw_rect(self, color, rect, width=0):
+        self.drawn_bounds.append(pygame.Rect(rect))
+        return pygame.draw.rect(self.screen, color, rect, width)
+
+    def draw_line(self, color, start, end, width=1):
+        rect = pygame.Rect(min(start[0], end[0]), min(start[1], end[1]),
+                           abs(end[0] - start[0]) + 1, abs(end[1] - start[1]) + 1)
+        self.drawn_bounds.append(rect.inflate(width * 2, width * 2))
+        return pygame.draw.line(self.screen, color, start, end, width)
+
+    # Panel content keys: a panel is redrawn when its key differs from last frame's
+
+    def targeting_key(self, game_state):
+        cursor_pos = self.world.get_component(game_state.cursor_id, PositionComponent) if game_state.cursor_id else None
+        player_id = self.get_player_id()
+        player_pos = self.world.get_component(player_id, PositionComponent) if player_id is not None else None
+        return ((cursor_pos.x, cursor_pos.y) if cursor_pos else None,
+                (player_pos.x, player_pos.y) if player_pos else None,
+                game_state.targeting_range, game_state.targeting_ability_id,
+                (pygame.time.get_ticks() // 200) % 2)
+
+    def look_key(self, game_state):
+        if not game_state.cursor_id: return None
+        cursor_pos = self.world.get_component(game_state.cursor_id, PositionComponent)
+        return ((cursor_pos.x, cursor_pos.y), (pygame.time.get_ticks() // 400) % 2,
+                self.describe_position(cursor_pos.x, cursor_pos.y))
+
+    def messages_key(self, game_state):
+        return game_state.message_log.version
+
+    def inventory_key(self, game_state):
+        player_id = self.get_player_id()
+        inventory = self.world.get_component(player_id, InventoryComponent) if player_id is not None else None
+        return (self.inventory_slide_amount, self.inventory_content(inventory) if inventory else None)
+
+    def abilities_key(self, game_state):
+        player_id = self.get_player_id()
+        return (self.abilities_slide_amount, self.abilities_content(player_id) if player_id is not None else None)
+
+    def status_key(self, game_state):
+        player_id = self.get_player_id()
+        if player_id is None: return None
+        combat = self.world.get_component(player_id, CombatComponent)
+        xp_comp = self.world.get_component(player_id, ExperienceComponent)
+        status_effects_comp = self.world.get_component(player_id, StatusEffectsComponent)
+        return ((combat.hp, combat.max_hp) if combat else None,
+                (xp_comp.level, xp_comp.current_xp, xp_comp.xp_to_next_level) if xp_comp else None,
+                tuple((effect.name, effect.type, effect.turns_remaining) for effect in status_effects_comp.effects)
+                if status_effects_comp else None)
 
     def draw_targeting_cursor(self, game_state):
         """Draw the targeting cursor with range indication."""
@@ -93,30 +459,17 @@ class RenderSystem(System):
         if not cursor_id: return
         
         cursor_pos = self.world.get_component(cursor_id, PositionComponent)
-        player_entities = self.world.get_entities_with_components(PlayerControllableComponent)
-        
-        if not player_entities: return
-        player_pos = self.world.get_component(player_entities[0], PositionComponent)
-        
-        # Draw range indicator
-        for x in range(max(0, player_pos.x - game_state.targeting_range), 
-                      player_pos.x + game_state.targeting_range + 1):
-            for y in range(max(0, player_pos.y - game_state.targeting_range), 
-                          player_pos.y + game_state.targeting_range + 1):
-                distance = max(abs(x - player_pos.x), abs(y - player_pos.y))
-                if distance <= game_state.targeting_range:
-                    bg_rect = pygame.Rect(x * self.tile_size, y * self.tile_size, 
-                                        self.tile_size, self.tile_size)
-                    if distance == game_state.targeting_range:
-                        pygame.draw.rect(self.screen, (40, 40, 0), bg_rect)  # Range edge
-                    else:
-                        pygame.draw.rect(self.screen, (20, 20, 0), bg_rect)  # Within range
+        player_id = self.get_player_id()
+        
+        if player_id is None: return
+        player_pos = self.world.get_component(player_id, PositionComponent)
+        
+        # The range indicator is part of the overlay layer (see compose_overlay)
         
         # Draw targeting cursor
         if (pygame.time.get_ticks() // 200) % 2 == 0:  # Faster flash
-            cursor_rect = pygame.Rect(cursor_pos.x * self.tile_size, cursor_pos.y * self.tile_size, 
-                                    self.tile_size, self.tile_size)
-            pygame.draw.rect(self.screen, (255, 255, 0), cursor_rect, 3)
+            cursor_rect = self.tile_rect(cursor_pos.x, cursor_pos.y)
+            self.draw_rect((255, 255, 0), cursor_rect, 3)
         
         # Draw targeting instructions
         instructions = [
@@ -126,72 +479,72 @@ class RenderSystem(System):
         ]
         y_offset = self.screen.get_height() - 80
         for instruction in instructions:
-            inst_surface = self.font.render(instruction, True, (255, 255, 0))
+            inst_surface = self.glyphs.render(self.font, instruction, (255, 255, 0))
             inst_rect = inst_surface.get_rect(centerx=self.screen.get_width() // 2, y=y_offset)
-            self.screen.blit(inst_surface, inst_rect)
+            self.blit(inst_surface, inst_rect)
             y_offset += 20
 
     def draw_abilities_screen(self, game_state):
         """Draw the abilities screen showing player's available abilities."""
         # Get player entity
-        player_entities = self.world.get_entities_with_components(PlayerControllableComponent)
-        if not player_entities: return
-        player_id = player_entities[0]
+        player_id = self.get_player_id()
+        if player_id is None: return
         
-        abilities_comp = self.world.get_component(player_id, AbilitiesComponent)
-        
-        # Position on right side of screen
+        # Position on right side of screen; sliding only moves the cached panel
         abilities_x = self.screen.get_width() - self.abilities_slide_amount
-        abilities_rect = pygame.Rect(abilities_x, 0, self.abilities_width, self.screen.get_height())
-        
-        # Draw background
-        bg_surface = pygame.Surface((self.abilities_width, self.screen.get_height()))
-        bg_surface.set_alpha(240)
-        bg_surface.fill((30, 30, 60))
-        self.screen.blit(bg_surface, (abilities_x, 0))
+        background, foreground = self.get_panel_surfaces('abilities', self.abilities_content(player_id),
+                                                         self.abilities_width, (30, 30, 60), 240,
+                                                         self.layout_abilities_panel)
+        self.blit(background, (abilities_x, 0))
+        self.blit(foreground, (abilities_x, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def abilities_content(self, player_id):
+        """The ability ids the abilities panel lists, as a hashable key."""
+        abilities_comp = self.world.get_component(player_id, AbilitiesComponent)
+        return tuple(abilities_comp.abilities) if abilities_comp else ()
+
+    def layout_abilities_panel(self, panel, abilities):
+        """Draws the abilities panel's border and text onto its cached foreground surface."""
+        width, height = panel.get_size()
         
         # Draw border
-        pygame.draw.rect(self.screen, (100, 100, 150), abilities_rect, 2)
+        pygame.draw.rect(panel, (100, 100, 150), panel.get_rect(), 2)
         
         # Draw title
-        title_surface = self.font.render("ABILITIES", True, (255, 255, 255))
-        title_rect = title_surface.get_rect(centerx=abilities_x + self.abilities_width // 2, y=20)
-        self.screen.blit(title_surface, title_rect)
+        title_surface = self.glyphs.render(self.font, "ABILITIES", (255, 255, 255))
+        self.blit_text(panel, title_surface, title_surface.get_rect(centerx=width // 2, y=20))
         
         # Draw separator line
-        pygame.draw.line(self.screen, (100, 100, 150), 
-                        (abilities_x + 10, 50), 
-                        (abilities_x + self.abilities_width - 10, 50), 2)
+        pygame.draw.line(panel, (100, 100, 150), (10, 50), (width - 10, 50), 2)
         
         # Draw abilities list
         y_offset = 70
-        if not abilities_comp or not abilities_comp.abilities:
-            empty_surface = self.font.render("(no abilities)", True, (150, 150, 150))
-            empty_rect = empty_surface.get_rect(centerx=abilities_x + self.abilities_width // 2, y=y_offset)
-            self.screen.blit(empty_surface, empty_rect)
+        if not abilities:
+            empty_surface = self.glyphs.render(self.font, "(no abilities)", (150, 150, 150))
+            self.blit_text(panel, empty_surface, empty_surface.get_rect(centerx=width // 2, y=y_offset))
         else:
-            for i, ability_id in enumerate(abilities_comp.abilities):
+            for i, ability_id in enumerate(abilities):
                 if ability_id in self.world.abilities:
                     ability_data = self.world.abilities[ability_id]
                     
                     # Number key
-                    num_surface = self.font.render(f"{i+1}.", True, (255, 255, 100))
-                    self.screen.blit(num_surface, (abilities_x + 20, y_offset))
+                    num_surface = self.glyphs.render(self.font, f"{i+1}.", (255, 255, 100))
+                    self.blit_text(panel, num_surface, (20, y_offset))
                     
                     # Ability name
                     name = ability_data.get("name", ability_id.replace('_', ' ').title())
-                    name_surface = self.font.render(name, True, (255, 255, 255))
-                    self.screen.blit(name_surface, (abilities_x + 50, y_offset))
+                    name_surface = self.glyphs.render(self.font, name, (255, 255, 255))
+                    self.blit_text(panel, name_surface, (50, y_offset))
                     
                     y_offset += 25
                     
                     # Ability description
                     description = self.format_ability_description(ability_data)
-                    desc_lines = self.wrap_text(description, self.abilities_width - 60)
+                    desc_lines = self.wrap_text(description, width - 60)
                     
                     for line in desc_lines:
-                        desc_surface = self.font.render(line, True, (200, 200, 200))
-                        self.screen.blit(desc_surface, (abilities_x + 60, y_offset))
+                        desc_surface = self.glyphs.render(self.font, line, (200, 200, 200))
+                        self.blit_text(panel, desc_surface, (60, y_offset))
                         y_offset += 20
                     
                     y_offset += 10  # Extra space between abilities
@@ -201,13 +554,45 @@ class RenderSystem(System):
             "Press number key to use ability",
             "Press 'B' to close"
         ]
-        y_offset = self.screen.get_height() - 60
+        y_offset = height - 60
         for instruction in instructions:
-            inst_surface = self.font.render(instruction, True, (200, 200, 200))
-            inst_rect = inst_surface.get_rect(centerx=abilities_x + self.abilities_width // 2, y=y_offset)
-            self.screen.blit(inst_surface, inst_rect)
+            inst_surface = self.glyphs.render(self.font, instruction, (200, 200, 200))
+            self.blit_text(panel, inst_surface, inst_surface.get_rect(centerx=width // 2, y=y_offset))
             y_offset += 25
 
+    def get_panel_surfaces(self, name, content, width, color, alpha, layout):
+        """Returns the cached (background, foreground) surfaces of a sidebar panel.
+
+        The background is the panel's translucent fill; the foreground holds
+        its border and text on a transparent, premultiplied-alpha surface. Both are rebuilt only
+        when content or the screen height changes, so a sliding or idle
+        panel costs two blits a frame.
+        """
+        height = self.screen.get_height()
+        cached = self.panel_surfaces.get(name)
+        if cached is not None and cached[0] == (content, height):
+            return cached[1], cached[2]
+
+        background = pygame.Surface((width, height))
+        background.set_alpha(alpha)
+        background.fill(color)
+        foreground = pygame.Surface((width, height), pygame.SRCALPHA)
+        layout(foreground, content)
+        self.panel_surfaces[name] = ((content, height), background, foreground)
+        return background, foreground
+
+    def blit_text(self, panel, surface, dest):
+        """Draws text onto a panel's foreground surface.
+
+        The foreground is kept in premultiplied alpha, so compositing it onto
+        the screen gives the same pixels as blitting each text surface there
+        directly, overlaps included.
+        """
+        # Font surfaces don't premultiply reliably; copy into a plain SRCALPHA surface first
+        straight = pygame.Surface(surface.get_size(), pygame.SRCALPHA)
+        straight.blit(surface, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        panel.blit(straight.premul_alpha(), dest, special_flags=pygame.BLEND_PREMULTIPLIED)
+
     def format_ability_description(self, ability_data):
         """Format an ability's data into a readable description."""
         # Use provided description if available
@@ -249,15 +634,20 @@ class RenderSystem(System):
 
     def wrap_text(self, text, max_width):
         """Wrap text to fit within a given pixel width."""
+        key = (text, max_width)
+        lines = self.wrap_cache.get(key)
+        if lines is not None:
+            return lines
+
         words = text.split(' ')
         lines = []
         current_line = []
         
         for word in words:
             test_line = ' '.join(current_line + [word])
-            test_surface = self.font.render(test_line, True, (255, 255, 255))
             
-            if test_surface.get_width() <= max_width:
+            # Measure the candidate line instead of rendering it
+            if self.font.size(test_line)[0] <= max_width:
                 current_line.append(word)
             else:
                 if current_line:
@@ -269,6 +659,9 @@ class RenderSystem(System):
         if current_line:
             lines.append(' '.join(current_line))
         
+        if len(self.wrap_cache) >= 512:
+            self.wrap_cache.clear()
+        self.wrap_cache[key] = lines
         return lines
 
     def draw_cursor_and_description(self, game_state):
@@ -278,50 +671,58 @@ class RenderSystem(System):
 
         # Flashing cursor background
         if (pygame.time.get_ticks() // 400) % 2 == 0:
-            bg_rect = pygame.Rect(cursor_pos.x * self.tile_size, cursor_pos.y * self.tile_size, self.tile_size, self.tile_size)
-            pygame.draw.rect(self.screen, (50, 50, 0), bg_rect)
+            bg_rect = self.tile_rect(cursor_pos.x, cursor_pos.y)
+            self.draw_rect((50, 50, 0), bg_rect)
+
+        # Describe the entity at the cursor position
+        description_text = self.describe_position(cursor_pos.x, cursor_pos.y)
+        if description_text:
+            description_surface = self.glyphs.render(self.font, description_text, (255, 255, 255))
+            description_rect = description_surface.get_rect(centerx=self.screen.get_width() // 2, y=self.screen.get_height() - 40)
+            self.blit(description_surface, description_rect)
 
-        # Get entity at cursor position and draw its description
-        entity_id = self.world.get_entity_at_position(cursor_pos.x, cursor_pos.y)
+    def describe_position(self, x, y):
+        """Returns the look-mode description of the creature or item at (x, y), or None."""
+        entity_id = self.world.get_entity_at_position(x, y)
         if not entity_id:
-            entity_id = self.world.get_item_at_position(cursor_pos.x, cursor_pos.y)
+            entity_id = self.world.get_item_at_position(x, y)
+        if not entity_id: return None
 
-        if entity_id:
-            desc = self.world.get_component(entity_id, DescriptionComponent)
-            material = self.world.get_component(entity_id, MaterialComponent)
-            combat = self.world.get_component(entity_id, CombatComponent)
-            
-            # Add status effect info to description
-            status_info = ""
-            status_effects_comp = self.world.get_component(entity_id, StatusEffectsComponent)
-            if status_effects_comp and status_effects_comp.effects:
-                status_names = [effect["name"] for effect in status_effects_comp.effects]
-                status_info = f" [{', '.join(status_names)}]"
-            
-            # Add HP info for living creatures
-            hp_info = ""
-            if combat and not self.world.get_component(entity_id, DeadComponent):
-                hp_info = f" (HP: {combat.hp}/{combat.max_hp})"
-            
-            if desc:
-                description_text = desc.text.format(material=material.name if material else "unknown") + status_info + hp_info
-                description_surface = self.font.render(description_text, True, (255, 255, 255))
-                description_rect = description_surface.get_rect(centerx=self.screen.get_width() // 2, y=self.screen.get_height() - 40)
-                self.screen.blit(description_surface, description_rect)
+        desc = self.world.get_component(entity_id, DescriptionComponent)
+        if not desc: return None
+        material = self.world.get_component(entity_id, MaterialComponent)
+        combat = self.world.get_component(entity_id, CombatComponent)
+        
+        # Add status effect info to description
+        status_info = ""
+        status_effects_comp = self.world.get_component(entity_id, StatusEffectsComponent)
+        if status_effects_comp and status_effects_comp.effects:
+            status_names = [effect.name for effect in status_effects_comp.effects]
+            status_info = f" [{', '.join(status_names)}]"
+        
+        # Add HP info for living creatures
+        hp_info = ""
+        if combat and not self.world.get_component(entity_id, DeadComponent):
+            hp_info = f" (HP: {combat.hp}/{combat.max_hp})"
+        
+        return desc.text.format(material=material.name if material else "unknown") + status_info + hp_info
 
     def draw_messages(self, game_state):
         y_offset = self.screen.get_height() - 20
-        for message in reversed(game_state.message_log[-5:]):
-            msg_surface = self.font.render(message, True, (255, 255, 255))
+        for entry in reversed(game_state.message_log.recent(5)):
+            # Lines are rendered once and kept on the log entry rather than in
+            # the glyph cache, where one-off messages would push out glyphs
+            msg_surface = entry.surface
+            if msg_surface is None:
+                msg_surface = entry.surface = self.font.render(entry.display_text, True, (255, 255, 255))
             msg_rect = msg_surface.get_rect(centerx=self.screen.get_width() / 2, bottom=y_offset)
-            self.screen.blit(msg_surface, msg_rect)
+            self.blit(msg_surface, msg_rect)
             y_offset -= 20
 
     def draw_status_info(self, game_state):
         """Draw player status information in the top-left corner."""
-        player_entities = self.world.get_entities_with_components(PlayerControllableComponent)
-        if not player_entities: return
-        player_id = player_entities[0]
+        player_id = self.get_player_id()
+        if player_id is None: return
         
         combat = self.world.get_component(player_id, CombatComponent)
         xp_comp = self.world.get_component(player_id, ExperienceComponent)
@@ -332,108 +733,112 @@ class RenderSystem(System):
         # HP
         if combat:
             hp_text = f"HP: {combat.hp}/{combat.max_hp}"
-            hp_surface = self.font.render(hp_text, True, (255, 255, 255))
-            self.screen.blit(hp_surface, (10, y_offset))
+            hp_surface = self.glyphs.render(self.font, hp_text, (255, 255, 255))
+            self.blit(hp_surface, (10, y_offset))
             y_offset += 25
         
         # Level and XP
         if xp_comp:
             level_text = f"Level: {xp_comp.level}"
-            level_surface = self.font.render(level_text, True, (255, 255, 255))
-            self.screen.blit(level_surface, (10, y_offset))
+            level_surface = self.glyphs.render(self.font, level_text, (255, 255, 255))
+            self.blit(level_surface, (10, y_offset))
             y_offset += 20
             
             xp_text = f"XP: {xp_comp.current_xp}/{xp_comp.xp_to_next_level}"
-            xp_surface = self.font.render(xp_text, True, (255, 255, 255))
-            self.screen.blit(xp_surface, (10, y_offset))
+            xp_surface = self.glyphs.render(self.font, xp_text, (255, 255, 255))
+            self.blit(xp_surface, (10, y_offset))
             y_offset += 25
         
         # Active status effects
         if status_effects_comp and status_effects_comp.effects:
             effects_text = "Status:"
-            effects_surface = self.font.render(effects_text, True, (255, 255, 255))
-            self.screen.blit(effects_surface, (10, y_offset))
+            effects_surface = self.glyphs.render(self.font, effects_text, (255, 255, 255))
+            self.blit(effects_surface, (10, y_offset))
             y_offset += 20
             
             for effect in status_effects_comp.effects:
                 duration_text = ""
-                if effect["type"] == "temporary":
-                    duration_text = f" ({effect['turns_remaining']})"
-                effect_text = f"  {effect['name']}{duration_text}"
-                effect_surface = self.font.render(effect_text, True, (255, 255, 0))
-                self.screen.blit(effect_surface, (10, y_offset))
+                if effect.type == "temporary":
+                    duration_text = f" ({effect.turns_remaining})"
+                effect_text = f"  {effect.name}{duration_text}"
+                effect_surface = self.glyphs.render(self.font, effect_text, (255, 255, 0))
+                self.blit(effect_surface, (10, y_offset))
                 y_offset += 20
 
     def draw_inventory(self, game_state):
         # Get player entity
-        player_entities = self.world.get_entities_with_components(PlayerControllableComponent)
-        if not player_entities: return
-        player_id = player_entities[0]
+        player_id = self.get_player_id()
+        if player_id is None: return
         
         inventory = self.world.get_component(player_id, InventoryComponent)
         if not inventory: return
 
-        # Draw semi-transparent background
+        # Position on right side of screen; sliding only moves the cached panel
         inventory_x = self.screen.get_width() - self.inventory_slide_amount
-        inventory_rect = pygame.Rect(inventory_x, 0, self.inventory_width, self.screen.get_height())
-        
-        # Draw background
-        bg_surface = pygame.Surface((self.inventory_width, self.screen.get_height()))
-        bg_surface.set_alpha(230)
-        bg_surface.fill((20, 20, 20))
-        self.screen.blit(bg_surface, (inventory_x, 0))
+        background, foreground = self.get_panel_surfaces('inventory', self.inventory_content(inventory),
+                                                         self.inventory_width, (20, 20, 20), 230,
+                                                         self.layout_inventory_panel)
+        self.blit(background, (inventory_x, 0))
+        self.blit(foreground, (inventory_x, 0), special_flags=pygame.BLEND_PREMULTIPLIED)
+
+    def inventory_content(self, inventory):
+        """The (description, char, color, key id) of each listed item, as a hashable key."""
+        items = []
+        for item_id in inventory.items:
+            if not self.world.is_alive(item_id):
+                continue  # Stale handle to a destroyed item
+            desc = self.world.get_component(item_id, DescriptionComponent)
+            renderable = self.world.get_component(item_id, RenderableComponent)
+            if desc and renderable:
+                key_comp = self.world.get_component(item_id, KeyComponent)
+                items.append((desc.text, renderable.char, tuple(renderable.color),
+                              key_comp.key_id if key_comp else None))
+        return tuple(items)
+
+    def layout_inventory_panel(self, panel, items):
+        """Draws the inventory panel's border and text onto its cached foreground surface."""
+        width, height = panel.get_size()
         
         # Draw border
-        pygame.draw.rect(self.screen, (100, 100, 100), inventory_rect, 2)
+        pygame.draw.rect(panel, (100, 100, 100), panel.get_rect(), 2)
         
         # Draw title
-        title_surface = self.font.render("INVENTORY", True, (255, 255, 255))
-        title_rect = title_surface.get_rect(centerx=inventory_x + self.inventory_width // 2, y=20)
-        self.screen.blit(title_surface, title_rect)
+        title_surface = self.glyphs.render(self.font, "INVENTORY", (255, 255, 255))
+        self.blit_text(panel, title_surface, title_surface.get_rect(centerx=width // 2, y=20))
         
         # Draw separator line
-        pygame.draw.line(self.screen, (100, 100, 100), 
-                        (inventory_x + 10, 50), 
-                        (inventory_x + self.inventory_width - 10, 50), 2)
+        pygame.draw.line(panel, (100, 100, 100), (10, 50), (width - 10, 50), 2)
         
         # Draw inventory items
         y_offset = 70
-        if not inventory.items:
-            empty_surface = self.font.render("(empty)", True, (150, 150, 150))
-            empty_rect = empty_surface.get_rect(centerx=inventory_x + self.inventory_width // 2, y=y_offset)
-            self.screen.blit(empty_surface, empty_rect)
+        if not items:
+            empty_surface = self.glyphs.render(self.font, "(empty)", (150, 150, 150))
+            self.blit_text(panel, empty_surface, empty_surface.get_rect(centerx=width // 2, y=y_offset))
         else:
-            for item_id in inventory.items:
-                desc = self.world.get_component(item_id, DescriptionComponent)
-                renderable = self.world.get_component(item_id, RenderableComponent)
+            for text, char, color, key_id in items:
+                # Draw item character
+                char_surface = self.glyphs.render(self.font, char, color)
+                self.blit_text(panel, char_surface, (20, y_offset))
                 
-                if desc and renderable:
-                    # Draw item character
-                    char_surface = self.font.render(renderable.char, True, renderable.color)
-                    self.screen.blit(char_surface, (inventory_x + 20, y_offset))
-                    
-                    # Draw item description (truncate if too long)
-                    text = desc.text
-                    if len(text) > 25:
-                        text = text[:22] + "..."
-                    text_surface = self.font.render(text, True, (255, 255, 255))
-                    self.screen.blit(text_surface, (inventory_x + 50, y_offset))
-                    
-                    # Check if it's a key and show key_id
-                    key_comp = self.world.get_component(item_id, KeyComponent)
-                    if key_comp and key_comp.key_id:
-                        key_info = f"[Key: {key_comp.key_id[:8]}...]"
-                        key_surface = self.font.render(key_info, True, (150, 150, 150))
-                        self.screen.blit(key_surface, (inventory_x + 50, y_offset + 20))
-                        y_offset += 20
-                    
-                    y_offset += 30
+                # Draw item description (truncate if too long)
+                if len(text) > 25:
+                    text = text[:22] + "..."
+                text_surface = self.glyphs.render(self.font, text, (255, 255, 255))
+                self.blit_text(panel, text_surface, (50, y_offset))
+                
+                # Check if it's a key and show key_id
+                if key_id:
+                    key_info = f"[Key: {key_id[:8]}...]"
+                    key_surface = self.glyphs.render(self.font, key_info, (150, 150, 150))
+                    self.blit_text(panel, key_surface, (50, y_offset + 20))
+                    y_offset += 20
+                
+                y_offset += 30
         
         # Draw instructions at bottom
         instructions = ["Press 'I' to close"]
-        y_offset = self.screen.get_height() - 60
+        y_offset = height - 60
         for instruction in instructions:
-            inst_surface = self.font.render(instruction, True, (200, 200, 200))
-            inst_rect = inst_surface.get_rect(centerx=inventory_x + self.inventory_width // 2, y=y_offset)
-            self.screen.blit(inst_surface, inst_rect)
-            y_offset += 25
\ No newline at end of file
+            inst_surface = self.glyphs.render(self.font, instruction, (200, 200, 200))
+            self.blit_text(panel, inst_surface, inst_surface.get_rect(centerx=width // 2, y=y_offset))
+            y_offset += 25
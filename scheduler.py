@@ -0,0 +1,43 @@
+# scheduler.py
+# Decides which systems run each frame and applies deferred commands between them.
+
+class Scheduler:
+    """Runs a World's systems in order, skipping those with nothing to do.
+
+    A system is run when its run_states include the current game state and
+    its has_work() reports pending input, events or components (see System).
+    Systems with scheduled = False are never run here; the Game calls them
+    itself (the RenderSystem, once per frame). The World's command buffer is
+    flushed after every system that ran.
+    """
+    def __init__(self, world):
+        self.world = world
+        self.runs = {}  # system class name -> frames run
+        self.skips = {}  # system class name -> frames skipped
+
+    def update(self, *args, **kwargs):
+        world = self.world
+        game_state = kwargs.get('game_state')
+        state_name = getattr(game_state, 'game_state', None)
+        events = kwargs.get('events') or ()
+
+        world.flush_commands()
+        for system in world.systems:
+            if not system.scheduled:
+                continue
+            name = type(system).__name__
+            if system.run_states is not None and state_name not in system.run_states:
+                self.skips[name] = self.skips.get(name, 0) + 1
+                continue
+            if not system.has_work(events):
+                self.skips[name] = self.skips.get(name, 0) + 1
+                continue
+            system.update(*args, **kwargs)
+            self.runs[name] = self.runs.get(name, 0) + 1
+            world.flush_commands()  # Sync point: the next system sees this one's changes
+
+    def stats(self):
+        """Returns (system name, frames run, frames skipped) for every scheduled system."""
+        return [(type(system).__name__, self.runs.get(type(system).__name__, 0),
+                 self.skips.get(type(system).__name__, 0))
+                for system in self.world.systems if system.scheduled]
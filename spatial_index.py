@@ -0,0 +1,118 @@
+# spatial_index.py
+# A spatial hash over entity positions, split into layers.
+
+from components import (PositionComponent, CursorComponent, ItemComponent,
+                        CombatComponent, BlocksMovementComponent)
+
+# Layer name -> component type an entity needs to be in that layer.
+# Every indexed entity is also in the "all" layer.
+LAYER_COMPONENTS = {
+    "items": ItemComponent,
+    "creatures": CombatComponent,
+    "blockers": BlocksMovementComponent,
+}
+
+class SpatialIndex:
+    """Maps grid cells to the entities standing on them.
+
+    Entities with a PositionComponent are indexed unless they are the look
+    cursor or off the map (negative coordinates, e.g. carried items). The
+    World keeps the index in sync when components are added or removed and
+    when it is told that a position changed.
+    """
+    # Component types whose presence changes whether/how an entity is indexed
+    TRACKED_TYPES = frozenset((PositionComponent, CursorComponent) + tuple(LAYER_COMPONENTS.values()))
+
+    def __init__(self, world):
+        self.world = world
+        self.layers = {"all": {}}  # layer name -> {(x, y): [entity_id, ...]}
+        for layer in LAYER_COMPONENTS:
+            self.layers[layer] = {}
+        self.entity_cells = {}  # entity_id -> (x, y)
+        self.entity_layers = {}  # entity_id -> tuple of layer names
+
+    def __len__(self):
+        return len(self.entity_cells)
+
+    def _insert(self, entity_id, cell, layers):
+        for layer in layers:
+            self.layers[layer].setdefault(cell, []).append(entity_id)
+
+    def _remove(self, entity_id, cell, layers):
+        for layer in layers:
+            cells = self.layers[layer]
+            occupants = cells[cell]
+            occupants.remove(entity_id)
+            if not occupants:
+                del cells[cell]
+
+    def _layers_for(self, entity_id):
+        layers = ["all"]
+        for layer, component_type in LAYER_COMPONENTS.items():
+            if self.world.get_component(entity_id, component_type) is not None:
+                layers.append(layer)
+        return tuple(layers)
+
+    def refresh(self, entity_id):
+        """Re-reads an entity's position and layer membership from its components."""
+        self.discard(entity_id)
+        pos = self.world.get_component(entity_id, PositionComponent)
+        if pos is None or pos.x < 0 or pos.y < 0:
+            return
+        if self.world.get_component(entity_id, CursorComponent) is not None:
+            return
+        cell = (pos.x, pos.y)
+        layers = self._layers_for(entity_id)
+        self.entity_cells[entity_id] = cell
+        self.entity_layers[entity_id] = layers
+        self._insert(entity_id, cell, layers)
+
+    def update_position(self, entity_id):
+        """Moves an already indexed entity to the cell its PositionComponent now holds."""
+        old_cell = self.entity_cells.get(entity_id)
+        if old_cell is None:
+            self.refresh(entity_id)
+            return
+        pos = self.world.get_component(entity_id, PositionComponent)
+        new_cell = (pos.x, pos.y)
+        if new_cell == old_cell:
+            return
+        if pos.x < 0 or pos.y < 0:
+            self.discard(entity_id)
+            return
+        layers = self.entity_layers[entity_id]
+        self._remove(entity_id, old_cell, layers)
+        self._insert(entity_id, new_cell, layers)
+        self.entity_cells[entity_id] = new_cell
+
+    def discard(self, entity_id):
+        """Drops an entity from the index, if it is indexed."""
+        cell = self.entity_cells.pop(entity_id, None)
+        if cell is not None:
+            self._remove(entity_id, cell, self.entity_layers.pop(entity_id))
+
+    def entities_at(self, x, y, layer="all"):
+        """Returns the entities in a layer at a cell. The list must not be modified."""
+        return self.layers[layer].get((x, y), ())
+
+    def entities_in_rect(self, x0, y0, x1, y1, layer="all"):
+        """Returns the entities in a layer inside an inclusive rectangle of cells."""
+        cells = self.layers[layer]
+        found = []
+        if (x1 - x0 + 1) * (y1 - y0 + 1) <= len(cells):
+            # Small rectangle: probe each cell
+            for x in range(x0, x1 + 1):
+                for y in range(y0, y1 + 1):
+                    occupants = cells.get((x, y))
+                    if occupants:
+                        found.extend(occupants)
+        else:
+            # Few occupied cells: filter them instead
+            for (x, y), occupants in cells.items():
+                if x0 <= x <= x1 and y0 <= y <= y1:
+                    found.extend(occupants)
+        return found
+
+    def entities_in_range(self, x, y, radius, layer="all"):
+        """Returns the entities in a layer within a Chebyshev (square) radius of a cell."""
+        return self.entities_in_rect(x - radius, y - radius, x + radius, y + radius, layer)
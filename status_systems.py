@@ -4,10 +4,13 @@
 import random
 import re
 from components import *
+from event_queues import ApplyStatusEvent
 from core_systems import System
 
 class StatusEffectSystem(System):
     """Handles application and management of status effects."""
+    reads = (WantsToApplyStatusComponent, StatusEffectsComponent)
+    reads_events = (ApplyStatusEvent,)
     
     def update(self, *args, **kwargs):
         game_state = kwargs.get('game_state')
@@ -19,60 +22,66 @@ class StatusEffectSystem(System):
         self.update_existing_status_effects(game_state)
     
     def apply_new_status_effects(self, game_state):
-        """Apply new status effects from WantsToApplyStatusComponent."""
+        """Apply new status effects from ApplyStatusEvents and WantsToApplyStatusComponent."""
+        for event in self.world.events.drain(ApplyStatusEvent):
+            self.apply_status(event.entity_id, event.status_effect_data, game_state)
         for entity_id in self.world.get_entities_with_components(WantsToApplyStatusComponent):
             intent = self.world.get_component(entity_id, WantsToApplyStatusComponent)
-            status_data = intent.status_effect_data
-            
-            # Get or create StatusEffectsComponent
-            status_effects_comp = self.world.get_component(entity_id, StatusEffectsComponent)
-            if not status_effects_comp:
-                status_effects_comp = StatusEffectsComponent()
-                self.world.add_component(entity_id, status_effects_comp)
-            
-            # Get or create StateComponent
-            state_comp = self.world.get_component(entity_id, StateComponent)
-            if not state_comp:
-                state_comp = StateComponent()
-                self.world.add_component(entity_id, state_comp)
-            
-            # Look up the status effect definition
-            effect_id = status_data.get("id")
-            if effect_id not in self.world.status_effects:
-                print(f"Warning: Status effect '{effect_id}' not found in status_effects.json")
-                self.world.remove_component(entity_id, WantsToApplyStatusComponent)
-                continue
-            
-            effect_definition = self.world.status_effects[effect_id]
-            
-            # Create the status effect entry
-            effect_entry = {
-                "id": effect_id,
-                "name": effect_definition.get("name", effect_id),
-                "type": status_data.get("type", "temporary"),
-                "effects_data": effect_definition.get("effects", []),
-                "turns_remaining": self.parse_duration(status_data.get("duration", "1"))
-            }
-            
-            # Add to active effects
-            status_effects_comp.effects.append(effect_entry)
-            
-            # Apply the mechanical effects immediately
-            self.apply_effect_mechanics(entity_id, effect_entry, state_comp)
-            
-            # Show the application message
-            target_name = "You" if self.world.get_component(entity_id, PlayerControllableComponent) else "The creature"
-            message = status_data.get("on_apply_message", f"{target_name} is affected by {effect_entry['name']}!")
-            if self.world.get_component(entity_id, PlayerControllableComponent):
-                message = f"You {message}"
-            else:
-                desc = self.world.get_component(entity_id, DescriptionComponent)
-                creature_name = desc.text if desc else "creature"
-                message = f"The {creature_name} {message}"
-            
-            game_state.add_message(message)
-            
-            self.world.remove_component(entity_id, WantsToApplyStatusComponent)
+            self.apply_status(entity_id, intent.status_effect_data, game_state)
+            self.world.commands.remove_component(entity_id, WantsToApplyStatusComponent)
+
+    def apply_status(self, entity_id, status_data, game_state):
+        """Adds a status effect to an entity and applies its mechanics."""
+        # The target may have been destroyed since the event was sent
+        if not self.world.is_alive(entity_id):
+            return
+
+        # Get or create StatusEffectsComponent
+        status_effects_comp = self.world.get_component(entity_id, StatusEffectsComponent)
+        if not status_effects_comp:
+            status_effects_comp = StatusEffectsComponent()
+            self.world.add_component(entity_id, status_effects_comp)
+        
+        # Get or create StateComponent
+        state_comp = self.world.get_component(entity_id, StateComponent)
+        if not state_comp:
+            state_comp = StateComponent()
+            self.world.add_component(entity_id, state_comp)
+        
+        # Look up the status effect definition
+        effect_id = status_data.get("id")
+        if effect_id not in self.world.status_effects:
+            print(f"Warning: Status effect '{effect_id}' not found in status_effects.json")
+            return
+        
+        effect_definition = self.world.status_effects[effect_id]
+        
+        # Create the status effect entry
+        effect_entry = StatusEffect(
+            id=effect_id,
+            name=effect_definition.get("name", effect_id),
+            type=status_data.get("type", "temporary"),
+            effects_data=effect_definition.get("effects", []),
+            turns_remaining=self.parse_duration(status_data.get("duration", "1"))
+        )
+        
+        # Add to active effects
+        status_effects_comp.effects.append(effect_entry)
+        
+        # Apply the mechanical effects immediately
+        self.apply_effect_mechanics(entity_id, effect_entry, state_comp)
+        
+        # Show the application message
+        target_name = "You" if self.world.get_component(entity_id, PlayerControllableComponent) else "The creature"
+        message = status_data.get("on_apply_message", f"{target_name} is affected by {effect_entry.name}!")
+        if self.world.get_component(entity_id, PlayerControllableComponent):
+            message = f"You {message}"
+        else:
+            desc = self.world.get_component(entity_id, DescriptionComponent)
+            creature_name = desc.text if desc else "creature"
+            message = f"The {creature_name} {message}"
+        
+        game_state.add_message(message)
     
     def parse_duration(self, duration_str):
         """Parse duration strings like '1d6', '2d4', or plain numbers."""
@@ -99,7 +108,7 @@ class StatusEffectSystem(System):
     
     def apply_effect_mechanics(self, entity_id, effect_entry, state_comp):
         """Apply the mechanical changes of a status effect."""
-        effects_data = effect_entry["effects_data"]
+        effects_data = effect_entry.effects_data
         
         for effect in effects_data:
             target = effect.get("target")
@@ -143,8 +152,8 @@ class StatusEffectSystem(System):
             effects_to_remove = []
             
             for i, effect in enumerate(status_effects_comp.effects):
-                if effect["type"] == "temporary":
-                    effect["turns_remaining"] -= 1
+                if effect.type == "temporary":
+                    effect.turns_remaining -= 1
                     
-                    if effect["turns_remaining"] <= 0:
+                    if effect.turns_remaining <= 0:
                         effects_to_remove.append(i)
\ No newline at end of file
@@ -0,0 +1,134 @@
+# terrain.py
+# The overworld biome map, drawn underneath the game's entities.
+
+from collections import OrderedDict
+import pygame
+from world_file import load_world
+
+class TerrainLayer:
+    """A biome map drawn from pre-rendered chunks of tiles.
+
+    The map is held as a grid of palette indices (one byte per tile, indexed
+    [x, y]; the memory-mapped biome plane of a world file) and a palette of
+    (char, color) glyphs. The first
+    time a chunk_size x chunk_size block of tiles comes into view it is
+    rendered into its own surface; the max_chunks most recently used chunk
+    surfaces are kept, so drawing a frame is a few chunk blits however large
+    the map is.
+    """
+    def __init__(self, grid, palette, font, tile_size, atlas=None, glyph_cache=None,
+                 chunk_size=32, max_chunks=16):
+        self.grid = grid
+        self.palette = palette  # index -> (char, color)
+        self.width, self.height = grid.shape
+        self.font = font
+        self.tile_size = tile_size
+        self.atlas = atlas
+        self.glyph_cache = glyph_cache
+        self.chunk_size = chunk_size
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # (chunk x, chunk y) -> Surface
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.chunks)
+
+    def glyph_at(self, x, y):
+        """Returns the (char, color) of the tile at (x, y), or None off the map."""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.palette[self.grid[x, y]]
+        return None
+
+    def chunk_surface(self, chunk_x, chunk_y):
+        """Returns the rendered surface for a chunk, rendering it on a cache miss."""
+        key = (chunk_x, chunk_y)
+        surface = self.chunks.get(key)
+        if surface is not None:
+            self.chunks.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.render_chunk(chunk_x, chunk_y)
+        self.chunks[key] = surface
+        if len(self.chunks) > self.max_chunks:
+            self.chunks.popitem(last=False)
+            self.evictions += 1
+        return surface
+
+    def render_chunk(self, chunk_x, chunk_y):
+        """Draws every tile of a chunk into a new surface."""
+        size = self.chunk_size * self.tile_size
+        surface = pygame.Surface((size, size))
+        x0, y0 = chunk_x * self.chunk_size, chunk_y * self.chunk_size
+        block = self.grid[x0:x0 + self.chunk_size, y0:y0 + self.chunk_size].tolist()
+
+        # One blit source per palette entry, looked up once per chunk
+        sources = []
+        for char, color in self.palette:
+            area = self.atlas.area(char, color) if self.atlas is not None else None
+            if area is not None:
+                sources.append((self.atlas.surface, area))
+            elif self.glyph_cache is not None:
+                sources.append((self.glyph_cache.render(self.font, char, color), None))
+            else:
+                sources.append((self.font.render(char, True, color), None))
+
+        blits = []
+        tile_size = self.tile_size
+        for i, column in enumerate(block):
+            for j, index in enumerate(column):
+                source, area = sources[index]
+                blits.append((source, (i * tile_size, j * tile_size), area) if area else
+                             (source, (i * tile_size, j * tile_size)))
+        surface.blits(blits, doreturn=False)
+        return surface
+
+    def draw(self, screen, camera_x, camera_y):
+        """Blits the chunks covering the screen, with map cell (camera_x, camera_y) at its top-left."""
+        chunk_pixels = self.chunk_size * self.tile_size
+        left = camera_x * self.tile_size
+        top = camera_y * self.tile_size
+        clip = screen.get_clip()
+        first_x = max(0, (left + clip.left) // chunk_pixels)
+        first_y = max(0, (top + clip.top) // chunk_pixels)
+        last_x = min((left + clip.right - 1) // chunk_pixels, (self.width - 1) // self.chunk_size)
+        last_y = min((top + clip.bottom - 1) // chunk_pixels, (self.height - 1) // self.chunk_size)
+
+        blits = []
+        for chunk_x in range(first_x, last_x + 1):
+            for chunk_y in range(first_y, last_y + 1):
+                dest = (chunk_x * chunk_pixels - left, chunk_y * chunk_pixels - top)
+                blits.append((self.chunk_surface(chunk_x, chunk_y), dest))
+        screen.blits(blits, doreturn=False)
+
+    def clear(self):
+        self.chunks.clear()
+
+    def stats(self):
+        """Returns the chunk cache's counters and hit rate as a dict."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self.chunks),
+            "max_chunks": self.max_chunks,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+def load_terrain(filepath, font, tile_size, **kwargs):
+    """Loads a world_generator map file as a TerrainLayer, or returns None if it can't be read."""
+    try:
+        world = load_world(filepath)
+    except FileNotFoundError:
+        print(f"Warning: '{filepath}' not found; playing without terrain. Run 'world_generator.py' to create it.")
+        return None
+    except Exception as e:
+        print(f"Error loading terrain file: {e}")
+        return None
+    return TerrainLayer(world.biomes, world.glyphs(), font, tile_size, **kwargs)
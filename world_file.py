@@ -0,0 +1,336 @@
+# world_file.py
+# The binary world map format, and a converter for older world.dat files.
+#
+# A world file is a fixed prefix, a JSON header and raw arrays:
+#
+#   magic    4 bytes   b'ASCW'
+#   version  uint16    FORMAT_VERSION, little-endian
+#   length   uint32    size of the JSON header in bytes
+#   header   JSON      {"width", "height", "seed", "palette", "planes", ...}
+#   padding            zeros up to a multiple of ALIGNMENT
+#   data               the chunk index and planes, each starting at a
+#                      multiple of ALIGNMENT
+#
+# "palette" lists {"name", "char", "color"} for each biome id; "planes"
+# lists {"name", "dtype", "offset"}, offsets counted from the end of the
+# header padding. The "biome" plane (uint8 ids) is always present; the
+# generator can add "height", "humidity" and "temperature" float32 planes.
+#
+# Version 2 files store each plane in chunk_size x chunk_size chunks
+# ("chunk_size" and "chunks" [across, down] in the header): chunk (cx, cy)
+# of a plane is the (cx * chunks down + cy)th block of chunk_size**2
+# values, each block indexed [x, y] within the chunk, edge chunks padded.
+# Chunk positions are fixed when the file is created, so chunks can be
+# written in any order, by separate processes, without moving anything;
+# the file is created sparse and only takes disk space for written
+# chunks. The index (a uint8 [cx, cy] array at "index_offset") marks the
+# chunks whose biome plane has been written. Version 1 files store each
+# plane as one C-ordered (width, height) array and have no index.
+#
+# Everything is opened with np.memmap, so opening a world reads only its
+# header and a read touches only the chunks it covers.
+
+import json
+import os
+import pickle
+import struct
+import sys
+import numpy as np
+from biomes import BIOMES
+
+MAGIC = b'ASCW'
+FORMAT_VERSION = 2
+PREFIX = struct.Struct('<4sHI')
+ALIGNMENT = 64
+DEFAULT_CHUNK_SIZE = 256
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+def default_palette():
+    """The palette entry of each biome id in biomes.BIOMES."""
+    return [{'name': name, 'char': biome['char'], 'color': list(biome['color'])}
+            for name, biome in BIOMES.items()]
+
+def _bounds(key, size):
+    """Turns an int or step-1 slice into a (start, stop) range clamped to size, like NumPy slicing."""
+    if isinstance(key, slice):
+        if key.step not in (None, 1):
+            raise IndexError("Chunked planes only support slices with step 1")
+        start, stop, _ = key.indices(size)
+        return start, max(start, stop)
+    index = int(key)
+    if index < 0:
+        index += size
+    if not 0 <= index < size:
+        raise IndexError(f"Index {key} is out of bounds for size {size}")
+    return index, index + 1
+
+class ChunkedPlane:
+    """One plane of a chunked world file, indexed [x, y] like a 2D array.
+
+    Reading a tile or a slice copies just the chunks it covers out of the
+    memory-mapped file; plane[x0:x1, y0:y1] returns an ndarray and
+    plane[x, y] a scalar. Writing goes through write_chunk, or
+    plane[x, y] = value for single tiles.
+    """
+    def __init__(self, blocks, width, height):
+        self.blocks = blocks  # (chunks across, chunks down, chunk_size, chunk_size) memmap
+        self.chunk_size = blocks.shape[2]
+        self.shape = (width, height)
+        self.dtype = blocks.dtype
+
+    def __getitem__(self, key):
+        x, y = key
+        if not isinstance(x, slice) and not isinstance(y, slice):
+            x0, _ = _bounds(x, self.shape[0])
+            y0, _ = _bounds(y, self.shape[1])
+            size = self.chunk_size
+            return self.blocks[x0 // size, y0 // size, x0 % size, y0 % size]
+        region = self.read(*_bounds(x, self.shape[0]), *_bounds(y, self.shape[1]))
+        if not isinstance(x, slice):
+            return region[0]
+        if not isinstance(y, slice):
+            return region[:, 0]
+        return region
+
+    def __setitem__(self, key, value):
+        x, y = key
+        x0, _ = _bounds(x, self.shape[0])
+        y0, _ = _bounds(y, self.shape[1])
+        size = self.chunk_size
+        self.blocks[x0 // size, y0 // size, x0 % size, y0 % size] = value
+
+    def __array__(self, dtype=None, copy=None):
+        region = self.read(0, self.shape[0], 0, self.shape[1])
+        return region if dtype is None else region.astype(dtype)
+
+    def read(self, x0, x1, y0, y1):
+        """Returns a copy of tiles [x0:x1, y0:y1]; the range must be inside the plane."""
+        if x0 >= x1 or y0 >= y1:
+            return np.empty((max(0, x1 - x0), max(0, y1 - y0)), dtype=self.dtype)
+        size = self.chunk_size
+        cx0, cx1 = x0 // size, (x1 - 1) // size + 1
+        cy0, cy1 = y0 // size, (y1 - 1) // size + 1
+        blocks = self.blocks[cx0:cx1, cy0:cy1]
+        if blocks.shape[:2] == (1, 1):
+            tiles = blocks[0, 0]
+        else:
+            # (chunk x, x in chunk, chunk y, y in chunk) lines the tiles up as one grid
+            tiles = blocks.transpose(0, 2, 1, 3).reshape((cx1 - cx0) * size, (cy1 - cy0) * size)
+        return np.array(tiles[x0 - cx0 * size:x1 - cx0 * size, y0 - cy0 * size:y1 - cy0 * size])
+
+    def write_chunk(self, chunk_x, chunk_y, array):
+        """Stores array as chunk (chunk_x, chunk_y); edge chunks may be smaller than chunk_size."""
+        width, height = array.shape
+        self.blocks[chunk_x, chunk_y, :width, :height] = array
+
+class WorldFile:
+    """A world map opened from a world file.
+
+    `biomes` is a (width, height) uint8 grid of palette indices and
+    `planes` maps every plane name (including "biome") to its grid. For a
+    file on disk these are ChunkedPlanes (or np.memmaps for version 1
+    files), read lazily through the OS page cache.
+    """
+    def __init__(self, path, version, width, height, seed, palette, planes, chunk_size=None, index=None):
+        self.path = path
+        self.version = version
+        self.width = width
+        self.height = height
+        self.seed = seed
+        self.palette = palette  # id -> {"name", "char", "color"}
+        self.planes = planes  # name -> grid
+        self.biomes = planes['biome']
+        self.chunk_size = chunk_size  # None for a file that isn't chunked
+        self.index = index  # [cx, cy] -> 1 once the chunk's biomes are written
+
+    def glyphs(self):
+        """Returns the (char, color) of each biome id."""
+        return [(entry['char'], tuple(entry['color'])) for entry in self.palette]
+
+    def names(self):
+        """Returns the biome name of each id."""
+        return [entry['name'] for entry in self.palette]
+
+    def chunks(self):
+        """Yields (chunk_x, chunk_y, x0, y0, x1, y1) for every chunk, in file order."""
+        size = self.chunk_size
+        for chunk_x in range(-(-self.width // size)):
+            for chunk_y in range(-(-self.height // size)):
+                x0, y0 = chunk_x * size, chunk_y * size
+                yield chunk_x, chunk_y, x0, y0, min(x0 + size, self.width), min(y0 + size, self.height)
+
+    def write_chunk(self, chunk_x, chunk_y, arrays):
+        """Writes {plane name: array} into a chunk. Writing the biome plane
+        marks the chunk as present in the index."""
+        for name, array in arrays.items():
+            self.planes[name].write_chunk(chunk_x, chunk_y, array)
+        if 'biome' in arrays:
+            self.index[chunk_x, chunk_y] = 1
+
+    def missing_chunks(self):
+        """Returns the (chunk_x, chunk_y) of chunks not written yet."""
+        return [tuple(int(c) for c in chunk) for chunk in np.argwhere(self.index == 0)]
+
+    def flush(self):
+        for plane in self.planes.values():
+            getattr(plane, 'blocks', plane).flush()
+        self.index.flush()
+
+def create_world_file(filepath, width, height, seed=None, palette=None, plane_dtypes=None,
+                      chunk_size=DEFAULT_CHUNK_SIZE):
+    """Creates an empty chunked world file and returns it opened for writing.
+
+    plane_dtypes maps extra plane names to dtypes, e.g. {"height": np.float32}.
+    The file is sized for every chunk up front but written sparsely, so the
+    chunks can then be filled in one at a time, in any order.
+    """
+    chunks = (-(-width // chunk_size), -(-height // chunk_size))
+    dtypes = [('biome', np.dtype(np.uint8))] + [(name, np.dtype(dtype)) for name, dtype in (plane_dtypes or {}).items()]
+
+    offset = _align(chunks[0] * chunks[1])  # The index comes first
+    entries = []
+    for name, dtype in dtypes:
+        entries.append({'name': name, 'dtype': dtype.str, 'offset': offset})
+        offset = _align(offset + chunks[0] * chunks[1] * chunk_size * chunk_size * dtype.itemsize)
+    header = json.dumps({
+        'width': width,
+        'height': height,
+        'seed': seed,
+        'palette': palette if palette is not None else default_palette(),
+        'chunk_size': chunk_size,
+        'chunks': list(chunks),
+        'index_offset': 0,
+        'planes': entries,
+    }).encode('utf-8')
+
+    data_start = _align(PREFIX.size + len(header))
+    with open(filepath, 'wb') as f:
+        f.write(PREFIX.pack(MAGIC, FORMAT_VERSION, len(header)))
+        f.write(header)
+        f.truncate(data_start + offset)
+    return open_world_file(filepath, mode='r+')
+
+def save_world_file(filepath, biomes, seed=None, palette=None, planes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Writes a uint8 biome-id grid, and optionally other (width, height)
+    planes such as {"height": array}, as a chunked world file. The grids
+    can be arrays, memmaps or ChunkedPlanes; they are copied a chunk at a time."""
+    width, height = biomes.shape
+    planes = planes or {}
+    for name, plane in planes.items():
+        if plane.shape != biomes.shape:
+            raise ValueError(f"Plane '{name}' is {plane.shape}, not {biomes.shape}")
+    world = create_world_file(filepath, width, height, seed=seed, palette=palette,
+                              plane_dtypes={name: plane.dtype for name, plane in planes.items()},
+                              chunk_size=chunk_size)
+    for chunk_x, chunk_y, x0, y0, x1, y1 in world.chunks():
+        arrays = {name: plane[x0:x1, y0:y1] for name, plane in planes.items()}
+        arrays['biome'] = biomes[x0:x1, y0:y1]
+        world.write_chunk(chunk_x, chunk_y, arrays)
+    world.flush()
+    return world
+
+def read_header(filepath):
+    """Returns (version, header dict, offset of the data) of a world file,
+    or raises ValueError if it isn't one this code can read."""
+    with open(filepath, 'rb') as f:
+        prefix = f.read(PREFIX.size)
+        if len(prefix) < PREFIX.size:
+            raise ValueError(f"'{filepath}' is not a world file")
+        magic, version, length = PREFIX.unpack(prefix)
+        if magic != MAGIC:
+            raise ValueError(f"'{filepath}' is not a world file")
+        if version > FORMAT_VERSION:
+            raise ValueError(f"'{filepath}' is world format version {version}; "
+                             f"this version reads up to {FORMAT_VERSION}")
+        header = json.loads(f.read(length).decode('utf-8'))
+    return version, header, _align(PREFIX.size + length)
+
+def open_world_file(filepath, mode='r'):
+    """Opens a world file with its planes memory-mapped ('r' read-only, 'r+'
+    writable). Only the header is read."""
+    version, header, data_start = read_header(filepath)
+    width, height = header['width'], header['height']
+    planes = {}
+    if version == 1:
+        for entry in header['planes']:
+            planes[entry['name']] = np.memmap(filepath, dtype=np.dtype(entry['dtype']), mode=mode,
+                                              offset=data_start + entry['offset'], shape=(width, height))
+        return WorldFile(filepath, version, width, height, header.get('seed'), header['palette'], planes)
+
+    chunk_size = header['chunk_size']
+    chunks = tuple(header['chunks'])
+    for entry in header['planes']:
+        blocks = np.memmap(filepath, dtype=np.dtype(entry['dtype']), mode=mode,
+                           offset=data_start + entry['offset'], shape=chunks + (chunk_size, chunk_size))
+        planes[entry['name']] = ChunkedPlane(blocks, width, height)
+    index = np.memmap(filepath, dtype=np.uint8, mode=mode, offset=data_start + header['index_offset'], shape=chunks)
+    return WorldFile(filepath, version, width, height, header.get('seed'), header['palette'], planes,
+                     chunk_size=chunk_size, index=index)
+
+def is_world_file(filepath):
+    with open(filepath, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+def tiles_to_biome_ids(tiles):
+    """Turns an object array of biome dicts (a pickled world.dat) into
+    (uint8 id grid, palette). Tiles equal to a BIOMES entry get its id;
+    any others are added to the end of the palette."""
+    palette = default_palette()
+    known = {}  # (char, color) -> id; the first biome with a glyph wins
+    for index, entry in enumerate(palette):
+        known.setdefault((entry['char'], tuple(entry['color'])), index)
+
+    grid = np.zeros(tiles.shape, dtype=np.uint8)
+    flat = grid.reshape(-1)
+    indices = {}  # id(tile dict) -> biome id; world.dat shares one dict per biome
+    for i, tile in enumerate(tiles.reshape(-1)):
+        index = indices.get(id(tile))
+        if index is None:
+            glyph = (tile.get('char', '?'), tuple(tile.get('color', (255, 255, 255))))
+            index = known.get(glyph)
+            if index is None:
+                index = len(palette)
+                palette.append({'name': None, 'char': glyph[0], 'color': list(glyph[1])})
+                known[glyph] = index
+            indices[id(tile)] = index
+        flat[i] = index
+    return grid, palette
+
+def _load_pickled(filepath):
+    """Reads a pickled world.dat (an array of biome dicts or of biome ids) into an in-memory WorldFile."""
+    with open(filepath, 'rb') as f:
+        tiles = pickle.load(f)
+    if tiles.dtype == object:
+        grid, palette = tiles_to_biome_ids(tiles)
+    else:
+        grid, palette = tiles.astype(np.uint8), default_palette()
+    return WorldFile(filepath, 0, grid.shape[0], grid.shape[1], None, palette, {'biome': grid})
+
+def load_world(filepath):
+    """Opens a world file, or reads a pickled world.dat into memory."""
+    if is_world_file(filepath):
+        return open_world_file(filepath)
+    print(f"Note: '{filepath}' is a pickled world map; run 'python world_file.py {filepath}' "
+          f"to convert it to the world file format.")
+    return _load_pickled(filepath)
+
+def convert_world(src, dst=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Converts a pickled world map or an older world file to the current
+    format; dst defaults to src, which is replaced once the new file is written."""
+    world = open_world_file(src) if is_world_file(src) else _load_pickled(src)
+    target = dst or src
+    temp = target + '.tmp'
+    save_world_file(temp, world.biomes, seed=world.seed, palette=world.palette, chunk_size=chunk_size,
+                    planes={name: plane for name, plane in world.planes.items() if name != 'biome'})
+    os.replace(temp, target)
+    return target
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        print("Usage: python world_file.py WORLD.DAT [OUTPUT]")
+        sys.exit(1)
+    before = os.path.getsize(sys.argv[1])
+    target = convert_world(*sys.argv[1:])
+    print(f"Converted '{sys.argv[1]}' ({before} bytes) to '{target}' ({os.path.getsize(target)} bytes)")
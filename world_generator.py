@@ -1,126 +1,186 @@
 # world_generator.py
 # Generates and saves a world map with large continents.
 
-import noise
+import argparse
+import os
 import numpy as np
 import random
-import pickle
+from concurrent.futures import ProcessPoolExecutor
+from biomes import BIOMES, BIOME_IDS
+from perlin import fbm2
+from world_file import DEFAULT_CHUNK_SIZE, create_world_file, open_world_file, save_world_file
+
+# Elevation bands of the shaped height map and the biome of each band;
+# the lowland band is further split by humidity and temperature. The
+# thresholds are adjusted to be more suitable for the shaped map.
+ELEVATION_THRESHOLDS = (-0.5, 0.0, 0.05, 0.4, 0.7)
+ELEVATION_BIOMES = np.array([BIOME_IDS[name] for name in
+                             ('deep_ocean', 'ocean', 'beach', 'plains', 'forest', 'mountain')], dtype=np.uint8)
+LOWLAND_BAND = 3
 
 class WorldGenerator:
     """
     Generates a world map using Perlin noise, shaped by a radial
     gradient to create large, distinct continents.
     """
+    HEIGHT_MAP_SCALE = 10.0
+    HUMIDITY_MAP_SCALE = 5.0
+    TEMPERATURE_MAP_SCALE = 7.0
+
     def __init__(self, width, height, seed=None):
         self.width = width
         self.height = height
         self.seed = seed if seed is not None else random.randint(0, 100)
 
-        self.biomes = {
-            'deep_ocean': {'char': '≈', 'color': (0, 0, 128)},
-            'ocean': {'char': '~', 'color': (0, 0, 255)},
-            'beach': {'char': '.', 'color': (210, 180, 140)},
-            'plains': {'char': '.', 'color': (0, 128, 0)},
-            'forest': {'char': '♣', 'color': (0, 100, 0)},
-            'mountain': {'char': '^', 'color': (128, 128, 128)},
-            'desert': {'char': '.', 'color': (210, 180, 140)},
-            'swamp': {'char': ';', 'color': (128, 0, 128)},
-            'river': {'char': '~', 'color': (0, 0, 255)}
-        }
+        self.biomes = BIOMES
+        self.planes = {}  # Noise maps of the last generate_world, for save_world
 
     def generate_world(self):
-        """Generates the full world map with shaped continents."""
-        height_map_scale = 10.0
-        humidity_map_scale = 5.0
-        temperature_map_scale = 7.0
-
-        # Generate the base noise maps
-        base_height_map = self._generate_noise_map(scale=height_map_scale, octaves=8, persistence=0.5, lacunarity=2.0)
-        humidity_map = self._generate_noise_map(scale=humidity_map_scale, octaves=4, persistence=0.6, lacunarity=2.0, offset=1000)
-        temperature_map = self._generate_noise_map(scale=temperature_map_scale, octaves=6, persistence=0.4, lacunarity=2.0, offset=2000)
-
-        # --- Continent Shaping Logic ---
-        # Create a radial gradient to form continents
-        center_x, center_y = self.width / 2, self.height / 2
-        radial_grad = np.zeros_like(base_height_map)
-        for x in range(self.width):
-            for y in range(self.height):
-                # Calculate distance from center, normalized to a 0-1 range
-                dist_x = abs(x - center_x)
-                dist_y = abs(y - center_y)
-                dist = np.sqrt(dist_x**2 + dist_y**2)
-                
-                # Invert distance and clamp to create an "island" mask
-                # The 'clamping' creates a falloff effect towards the edges.
-                radial_grad[x, y] = 1.0 - (dist / (self.width / 2))
-                radial_grad[x, y] = max(0, radial_grad[x, y])
-
-        # Combine the base height map with the radial gradient
-        # This pushes down the edges to create oceans and raises the center for land
-        height_map = base_height_map * radial_grad
+        """Generates the full world map with shaped continents, as a uint8
+        array of biome ids (see biomes.BIOME_IDS)."""
+        region = (0, 0, self.width, self.height)
+        height_map = self._shaped_height(*region)
 
         # Re-normalize the map to ensure values are roughly between -1 and 1
-        height_map = (height_map - np.min(height_map)) / (np.max(height_map) - np.min(height_map)) * 2 - 1
-
+        height_map = self._normalize_height(height_map, np.min(height_map), np.max(height_map))
 
         # Create biomes from the final shaped height map
+        humidity_map, temperature_map = self._climate_maps(*region)
         world_map = self._create_biomes(height_map, humidity_map, temperature_map)
         world_map = self._add_rivers(world_map, height_map)
 
+        self.planes = {'height': height_map, 'humidity': humidity_map, 'temperature': temperature_map}
+
         return world_map
 
-    def _generate_noise_map(self, scale, octaves, persistence, lacunarity, offset=0):
-        """Generates a 2D Perlin noise map."""
-        world = np.zeros((self.width, self.height))
-        for i in range(self.width):
-            for j in range(self.height):
-                nx = i / self.width * scale
-                ny = j / self.height * scale
-                world[i][j] = noise.pnoise2(nx, ny,
-                                             octaves=octaves,
-                                             persistence=persistence,
-                                             lacunarity=lacunarity,
-                                             repeatx=self.width,
-                                             repeaty=self.height,
-                                             base=self.seed + offset)
+    def generate_to_file(self, filepath, chunk_size=DEFAULT_CHUNK_SIZE, planes=False, workers=1):
+        """Generates the same map as generate_world straight into a chunked
+        world file, one chunk at a time, so memory use stays at a few chunks
+        whatever the map size. The height plane is always written (it is
+        needed for normalizing and for rivers); planes=True also keeps the
+        humidity and temperature maps. Returns the WorldFile, open for writing.
+
+        With workers > 1 the chunks are generated in a ProcessPoolExecutor,
+        each worker writing its chunks into the file through its own memory
+        map. Noise depends only on map coordinates, so the result is the
+        same for any number of workers.
+        """
+        plane_dtypes = {'height': np.float32}
+        if planes:
+            plane_dtypes.update(humidity=np.float32, temperature=np.float32)
+        world = create_world_file(filepath, self.width, self.height, seed=self.seed,
+                                  plane_dtypes=plane_dtypes, chunk_size=chunk_size)
+        chunks = list(world.chunks())
+
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_open_worker,
+                                     initargs=(filepath, self.width, self.height, self.seed)) as executor:
+                batch = max(1, len(chunks) // (workers * 4))
+                ranges = list(executor.map(_worker_height_chunk, chunks, chunksize=batch))
+                low, high = min(r[0] for r in ranges), max(r[1] for r in ranges)
+                list(executor.map(_worker_biome_chunk, chunks, [low] * len(chunks), [high] * len(chunks),
+                                  [planes] * len(chunks), chunksize=batch))
+        else:
+            ranges = [self._write_height_chunk(world, chunk) for chunk in chunks]
+            low, high = min(r[0] for r in ranges), max(r[1] for r in ranges)
+            for chunk in chunks:
+                self._write_biome_chunk(world, chunk, low, high, planes)
+
+        self._add_rivers(world.biomes, world.planes['height'])
+        world.flush()
         return world
 
+    def _write_height_chunk(self, world, chunk):
+        """First pass over a chunk: writes its shaped heights and returns the (min, max) they span."""
+        chunk_x, chunk_y, x0, y0, x1, y1 = chunk
+        height_map = self._shaped_height(x0, y0, x1, y1)
+        world.write_chunk(chunk_x, chunk_y, {'height': height_map})
+        return height_map.min(), height_map.max()
+
+    def _write_biome_chunk(self, world, chunk, low, high, planes):
+        """Second pass over a chunk: normalizes its heights by the whole map's
+        low..high and writes them with its biomes (and climate, if planes)."""
+        chunk_x, chunk_y, x0, y0, x1, y1 = chunk
+        height_map = self._normalize_height(world.planes['height'][x0:x1, y0:y1], low, high)
+        humidity_map, temperature_map = self._climate_maps(x0, y0, x1, y1)
+        arrays = {'height': height_map,
+                  'biome': self._create_biomes(height_map, humidity_map, temperature_map)}
+        if planes:
+            arrays.update(humidity=humidity_map, temperature=temperature_map)
+        world.write_chunk(chunk_x, chunk_y, arrays)
+
+    def _shaped_height(self, x0, y0, x1, y1):
+        """Height noise for map cells [x0:x1, y0:y1], shaped into continents."""
+        base_height_map = self._generate_noise_map(scale=self.HEIGHT_MAP_SCALE, octaves=8, persistence=0.5,
+                                                   lacunarity=2.0, region=(x0, y0, x1, y1))
+
+        # --- Continent Shaping Logic ---
+        # Combine the base height map with a radial gradient to form continents.
+        # This pushes down the edges to create oceans and raises the center for land
+        return base_height_map * self._radial_gradient(region=(x0, y0, x1, y1))
+
+    def _normalize_height(self, height_map, low, high):
+        """Rescales shaped heights spanning low..high to -1..1."""
+        return (height_map - low) / (high - low) * 2 - 1
+
+    def _climate_maps(self, x0, y0, x1, y1):
+        """Humidity and temperature noise for map cells [x0:x1, y0:y1]."""
+        region = (x0, y0, x1, y1)
+        humidity_map = self._generate_noise_map(scale=self.HUMIDITY_MAP_SCALE, octaves=4, persistence=0.6,
+                                                lacunarity=2.0, offset=1000, region=region)
+        temperature_map = self._generate_noise_map(scale=self.TEMPERATURE_MAP_SCALE, octaves=6, persistence=0.4,
+                                                   lacunarity=2.0, offset=2000, region=region)
+        return humidity_map, temperature_map
+
+    def _radial_gradient(self, region=None):
+        """Returns the continent mask for map cells [x0:x1, y0:y1] of region
+        (default the whole map): 1 at the center of the map, falling off
+        linearly with distance to 0 at half the map width and beyond."""
+        x0, y0, x1, y1 = region or (0, 0, self.width, self.height)
+        center_x, center_y = self.width / 2, self.height / 2
+        xs, ys = np.meshgrid(np.arange(x0, x1, dtype=np.float32), np.arange(y0, y1, dtype=np.float32),
+                             indexing='ij', sparse=True)
+        # Invert the normalized distance and clamp it to create an "island"
+        # mask. The clamping creates a falloff effect towards the edges.
+        dist = np.hypot(xs - center_x, ys - center_y)
+        return np.maximum(0, 1.0 - dist / (self.width / 2))
+
+    def _generate_noise_map(self, scale, octaves, persistence, lacunarity, offset=0, region=None):
+        """Generates a 2D Perlin noise map as a float32 array, the whole grid
+        at once, for map cells [x0:x1, y0:y1] of region (default the whole map)."""
+        x0, y0, x1, y1 = region or (0, 0, self.width, self.height)
+        xs = np.arange(x0, x1) / self.width * scale
+        ys = np.arange(y0, y1) / self.height * scale
+        return fbm2(xs, ys,
+                    octaves=octaves,
+                    persistence=persistence,
+                    lacunarity=lacunarity,
+                    repeatx=self.width,
+                    repeaty=self.height,
+                    base=self.seed + offset)
+
     def _create_biomes(self, height_map, humidity_map, temperature_map):
-        """Assigns a biome to each map tile based on its properties."""
-        world_map = np.empty((self.width, self.height), dtype=object)
-        for i in range(self.width):
-            for j in range(self.height):
-                elevation = height_map[i][j]
-                humidity = humidity_map[i][j]
-                temperature = temperature_map[i][j]
-
-                # Adjust thresholds to be more suitable for the shaped map
-                if elevation < -0.5:
-                    world_map[i][j] = self.biomes['deep_ocean']
-                elif elevation < 0.0:
-                    world_map[i][j] = self.biomes['ocean']
-                elif elevation < 0.05:
-                    world_map[i][j] = self.biomes['beach']
-                elif elevation < 0.4:
-                    if humidity < -0.3 and temperature > 0.3:
-                        world_map[i][j] = self.biomes['desert']
-                    elif humidity > 0.3:
-                        world_map[i][j] = self.biomes['swamp']
-                    else:
-                        world_map[i][j] = self.biomes['plains']
-                elif elevation < 0.7:
-                    world_map[i][j] = self.biomes['forest']
-                else:
-                    world_map[i][j] = self.biomes['mountain']
-        return world_map
+        """Assigns a biome id to each map tile based on its properties."""
+        # Elevation band of each tile: how many thresholds it is at or above
+        band = np.zeros(height_map.shape, dtype=np.uint8)
+        for threshold in ELEVATION_THRESHOLDS:
+            band += height_map >= threshold
+        lowland = band == LOWLAND_BAND
+        return np.select(
+            [lowland & (humidity_map < -0.3) & (temperature_map > 0.3),
+             lowland & (humidity_map > 0.3)],
+            [np.uint8(BIOME_IDS['desert']), np.uint8(BIOME_IDS['swamp'])],
+            default=ELEVATION_BIOMES[band])
 
     def _add_rivers(self, world_map, height_map, num_rivers=25):
         """Carves river paths from high-elevation points down to the sea."""
+        mountain, river = BIOME_IDS['mountain'], BIOME_IDS['river']
+        seas = (BIOME_IDS['ocean'], BIOME_IDS['deep_ocean'])
         for _ in range(num_rivers):
             start_x, start_y = -1, -1
             for _ in range(100):
                 x, y = random.randint(0, self.width - 1), random.randint(0, self.height - 1)
-                if world_map[x, y] == self.biomes['mountain']:
+                if world_map[x, y] == mountain:
                     start_x, start_y = x, y
                     break
             if start_x == -1: continue
@@ -129,7 +189,7 @@ class WorldGenerator:
             path = []
             for _ in range(250):
                 path.append((px, py))
-                if world_map[px, py] in [self.biomes['ocean'], self.biomes['deep_ocean'], self.biomes['river']]:
+                if world_map[px, py] in seas or world_map[px, py] == river:
                     break
 
                 neighbors = []
@@ -142,21 +202,49 @@ class WorldGenerator:
                 px, py = min(neighbors, key=lambda n: height_map[n[0], n[1]])
 
             for pos_x, pos_y in path:
-                if world_map[pos_x, pos_y] not in [self.biomes['ocean'], self.biomes['deep_ocean']]:
-                    world_map[pos_x, pos_y] = self.biomes['river']
+                if world_map[pos_x, pos_y] not in seas:
+                    world_map[pos_x, pos_y] = river
         return world_map
 
-def save_world(world_map, filepath):
-    """Saves the generated world map to a file."""
+# State of a generate_to_file worker process: (WorldGenerator, WorldFile)
+_worker = None
+
+def _open_worker(filepath, width, height, seed):
+    """ProcessPoolExecutor initializer: opens the world file being generated once per worker."""
+    global _worker
+    _worker = (WorldGenerator(width, height, seed), open_world_file(filepath, mode='r+'))
+
+def _worker_height_chunk(chunk):
+    generator, world = _worker
+    return generator._write_height_chunk(world, chunk)
+
+def _worker_biome_chunk(chunk, low, high, planes):
+    generator, world = _worker
+    generator._write_biome_chunk(world, chunk, low, high, planes)
+
+def save_world(world_map, filepath, seed=None, planes=None):
+    """Saves the generated world map, an array of biome ids, as a world file
+    (see world_file.py), with any extra planes such as generator.planes."""
     try:
-        with open(filepath, 'wb') as f:
-            pickle.dump(world_map, f)
+        save_world_file(filepath, world_map, seed=seed, planes=planes)
         print(f"World map successfully saved to '{filepath}'")
     except Exception as e:
         print(f"Error: Could not save world map. {e}")
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generate a continental world map.")
+    parser.add_argument("--size", type=int, default=1000, help="width and height in tiles")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--planes", action="store_true", help="also save the humidity and temperature maps")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="processes generating chunks")
+    parser.add_argument("--output", default="world.dat")
+    args = parser.parse_args()
+
     print("Generating continental world map...")
-    generator = WorldGenerator(1000, 1000)
-    new_world = generator.generate_world()
-    save_world(new_world, 'world.dat')
\ No newline at end of file
+    generator = WorldGenerator(args.size, args.size, seed=args.seed)
+    try:
+        generator.generate_to_file(args.output, chunk_size=args.chunk_size, planes=args.planes, workers=args.workers)
+        print(f"World map successfully saved to '{args.output}'")
+    except Exception as e:
+        print(f"Error: Could not save world map. {e}")
@@ -3,9 +3,10 @@
 
 import pygame
 import sys
-import pickle
 import os
-from collections import Counter
+import numpy as np
+from glyph_cache import GlyphCache
+from world_file import load_world
 
 class WorldViewer:
     """
@@ -24,22 +25,14 @@ class WorldViewer:
         pygame.display.set_caption("World Viewer")
         self.clock = pygame.time.Clock()
         self.font = self.load_font()
+        self.glyphs = GlyphCache()
 
-        self.biomes = {
-            'deep_ocean': {'char': '≈', 'color': (0, 0, 128)},
-            'ocean': {'char': '~', 'color': (0, 0, 255)},
-            'beach': {'char': '.', 'color': (210, 180, 140)},
-            'plains': {'char': '.', 'color': (0, 128, 0)},
-            'forest': {'char': 'T', 'color': (0, 100, 0)},
-            'mountain': {'char': '^', 'color': (128, 128, 128)},
-            'desert': {'char': '.', 'color': (210, 180, 140)},
-            'swamp': {'char': ';', 'color': (128, 0, 128)},
-            'river': {'char': '~', 'color': (0, 0, 255)}
-        }
-
-        self.world_map = self.load_world(world_file)
-        if self.world_map is None:
+        self.world = self.load_world(world_file)
+        if self.world is None:
             sys.exit()
+        self.world_map = self.world.biomes  # (width, height) biome ids, read lazily from the file
+        self.glyphs_by_id = self.world.glyphs()
+        self.biome_names = self.world.names()
 
         self.view_x = 0
         self.view_y = 0
@@ -56,8 +49,7 @@ class WorldViewer:
 
     def load_world(self, filepath):
         try:
-            with open(filepath, 'rb') as f:
-                return pickle.load(f)
+            return load_world(filepath)
         except FileNotFoundError:
             print(f"Error: 'world.dat' not found. Please run 'world_generator.py' first.")
             return None
@@ -105,42 +97,54 @@ class WorldViewer:
         return True
 
     def _get_condensed_tile(self, start_x, start_y):
-        """Analyzes a block of world tiles and returns the most representative one."""
+        """Analyzes a block of world tiles and returns the id of the most representative one."""
+        width, height = self.world_map.shape
         if self.zoom_level == 1:
-            if 0 <= start_x < self.world_map.shape[0] and 0 <= start_y < self.world_map.shape[1]:
-                return self.world_map[start_x, start_y]
+            if 0 <= start_x < width and 0 <= start_y < height:
+                return int(self.world_map[start_x, start_y])
             return None
 
-        tiles_in_block = []
-        for i in range(self.zoom_level):
-            for j in range(self.zoom_level):
-                x, y = start_x + i, start_y + j
-                if 0 <= x < self.world_map.shape[0] and 0 <= y < self.world_map.shape[1]:
-                    tile = self.world_map[x, y]
-                    if isinstance(tile, dict):
-                        tiles_in_block.append(tuple(sorted(tile.items())))
-
-        if not tiles_in_block: return None
-        most_common_tile_tuple = Counter(tiles_in_block).most_common(1)[0][0]
-        return dict(most_common_tile_tuple)
+        block = self.world_map[max(0, start_x):max(0, start_x + self.zoom_level),
+                               max(0, start_y):max(0, start_y + self.zoom_level)]
+        if not block.size: return None
+        return int(np.bincount(block.ravel()).argmax())
+
+    def _condensed_view(self, tiles_x, tiles_y):
+        """Returns the id of the most representative tile of each zoom_level
+        block on screen, as a (tiles_x, tiles_y) array with -1 off the map.
+        Only the part of the map in view is read from the world file."""
+        zoom = self.zoom_level
+        width, height = self.world_map.shape
+        x0, y0 = self.view_x, self.view_y
+        view = np.full((tiles_x, tiles_y), -1, dtype=np.int16)
+        left, top = max(0, x0), max(0, y0)
+        right, bottom = min(width, x0 + tiles_x * zoom), min(height, y0 + tiles_y * zoom)
+        if left >= right or top >= bottom:
+            return view
+
+        # The visible cells on a grid of whole blocks, with off-map cells set to an id no tile has
+        no_tile = len(self.glyphs_by_id)
+        cells = np.full((tiles_x * zoom, tiles_y * zoom), no_tile, dtype=np.int16)
+        cells[left - x0:right - x0, top - y0:bottom - y0] = self.world_map[left:right, top:bottom]
+        blocks = cells.reshape(tiles_x, zoom, tiles_y, zoom).transpose(0, 2, 1, 3).reshape(tiles_x, tiles_y, -1)
+
+        counts = np.stack([np.count_nonzero(blocks == biome_id, axis=2) for biome_id in range(no_tile)])
+        view[:] = counts.argmax(axis=0)
+        view[counts.max(axis=0) == 0] = -1
+        return view
 
     def draw(self):
         """Draws the world map, cursor, and informational text."""
         self.screen.fill((0, 0, 0))
-        if self.world_map is None: return
 
         screen_tiles_x = self.screen.get_width() // self.TILE_SIZE
         screen_tiles_y = self.screen.get_height() // self.TILE_SIZE
-        for i in range(screen_tiles_x + 1):
-            for j in range(screen_tiles_y + 1):
-                world_x = self.view_x + (i * self.zoom_level)
-                world_y = self.view_y + (j * self.zoom_level)
-                condensed_tile = self._get_condensed_tile(world_x, world_y)
-
-                if condensed_tile and isinstance(condensed_tile, dict):
-                    char = condensed_tile.get('char', '?')
-                    color = condensed_tile.get('color', self.COLORS["WHITE"])
-                    self.screen.blit(self.font.render(char, True, color), (i * self.TILE_SIZE, j * self.TILE_SIZE))
+        view = self._condensed_view(screen_tiles_x + 1, screen_tiles_y + 1).tolist()
+        for i, column in enumerate(view):
+            for j, condensed_tile in enumerate(column):
+                if condensed_tile >= 0:
+                    char, color = self.glyphs_by_id[condensed_tile]
+                    self.screen.blit(self.glyphs.render(self.font, char, color), (i * self.TILE_SIZE, j * self.TILE_SIZE))
 
         cursor_screen_tile_x = (self.screen.get_width() // 2) // self.TILE_SIZE
         cursor_screen_tile_y = (self.screen.get_height() // 2) // self.TILE_SIZE
@@ -157,14 +161,12 @@ class WorldViewer:
         biome_name = "Out of Bounds"
 
         tile_data = self._get_condensed_tile(cursor_world_x, cursor_world_y)
-        if tile_data:
-            for name, data in self.biomes.items():
-                if data == tile_data:
-                    biome_name = name.replace('_', ' ').title()
-                    break
+        if tile_data is not None:
+            name = self.biome_names[tile_data]
+            biome_name = name.replace('_', ' ').title() if name else "Unknown"
         tile_info_text += f" | Biome: {biome_name}"
 
-        info_surface = self.font.render(tile_info_text, True, self.COLORS["WHITE"])
+        info_surface = self.glyphs.render(self.font, tile_info_text, self.COLORS["WHITE"])
         info_rect = info_surface.get_rect(centerx=self.screen.get_width() // 2, y=self.screen.get_height() - 80)
         self.screen.blit(info_surface, info_rect)
         
@@ -174,7 +176,7 @@ class WorldViewer:
         ]
         y_offset = self.screen.get_height() - 60
         for instruction in instructions:
-            inst_surface = self.font.render(instruction, True, self.COLORS["YELLOW"])
+            inst_surface = self.glyphs.render(self.font, instruction, self.COLORS["YELLOW"])
             inst_rect = inst_surface.get_rect(centerx=self.screen.get_width() // 2, y=y_offset)
             self.screen.blit(inst_surface, inst_rect)
             y_offset += 20